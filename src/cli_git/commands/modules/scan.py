@@ -1,12 +1,38 @@
 """Mirror repository scanning functionality."""
 
-import base64
 import json
 import subprocess
 from typing import Dict, List, Optional
 
 import typer
 
+# Lists an owner's repositories together with their mirror-sync.yml, so one
+# paginated request replaces a repository listing plus a probe per repository
+_REPOSITORIES_QUERY = """
+query($owner: String!, $endCursor: String) {
+  repositoryOwner(login: $owner) {
+    repositories(first: 100, after: $endCursor, ownerAffiliations: OWNER) {
+      nodes {
+        nameWithOwner
+        url
+        description
+        isPrivate
+        updatedAt
+        object(expression: "HEAD:.github/workflows/mirror-sync.yml") {
+          ... on Blob {
+            text
+          }
+        }
+      }
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+    }
+  }
+}
+"""
+
 
 def scan_for_mirrors(
     username: str, org: Optional[str] = None, prefix: Optional[str] = None
@@ -34,12 +60,13 @@ def scan_for_mirrors(
         if not repos:
             continue
 
-        # Check each repository
+        # Mirrors are the repositories that have mirror-sync.yml
         found = 0
         for repo in repos:
-            if _is_mirror_repo(repo.get("fullName", repo.get("nameWithOwner", ""))):
+            workflow = (repo.get("object") or {}).get("text")
+            if workflow is not None:
                 found += 1
-                mirror_info = _extract_mirror_info(repo)
+                mirror_info = _extract_mirror_info(repo, workflow)
                 mirrors.append(mirror_info)
 
         typer.echo(f"    ✓ Found {found} mirrors out of {len(repos)} repositories")
@@ -50,127 +77,85 @@ def scan_for_mirrors(
 def _get_repositories(owner: str, prefix: Optional[str] = None) -> List[Dict]:
     """Get repositories for an owner, optionally filtered by prefix.
 
+    Each repository includes an ``object`` field holding its mirror-sync.yml
+    text, or None if the file does not exist.
+
     Args:
         owner: Repository owner
-        prefix: Optional prefix filter
+        prefix: Optional prefix filter (matched anywhere in the repository name)
 
     Returns:
         List of repository data
     """
-    if prefix:
-        # Use search with prefix
-        cmd = [
-            "gh",
-            "search",
-            "repos",
-            f"{prefix} in:name",
-            "--owner",
-            owner,
-            "--limit",
-            "100",
-            "--json",
-            "fullName,url,description,isPrivate,updatedAt",
-        ]
-    else:
-        # List all repos
-        cmd = [
+    result = subprocess.run(
+        [
             "gh",
-            "repo",
-            "list",
-            owner,
-            "--limit",
-            "1000",
-            "--json",
-            "fullName,url,description,isPrivate,updatedAt",
-        ]
-
-    result = subprocess.run(cmd, capture_output=True, text=True)
+            "api",
+            "graphql",
+            "--paginate",
+            "-f",
+            f"query={_REPOSITORIES_QUERY}",
+            "-f",
+            f"owner={owner}",
+            "--jq",
+            ".data.repositoryOwner.repositories.nodes[]?",
+        ],
+        capture_output=True,
+        text=True,
+    )
 
     if result.returncode != 0:
         typer.echo(f"    ⚠️  Failed to list {owner}'s repositories")
         return []
 
     try:
-        return json.loads(result.stdout)
+        repos = [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
     except json.JSONDecodeError:
         typer.echo("    ⚠️  Failed to parse repository data")
         return []
 
+    if prefix:
+        repos = [
+            repo for repo in repos if prefix.lower() in repo["nameWithOwner"].split("/")[-1].lower()
+        ]
 
-def _is_mirror_repo(repo_name: str) -> bool:
-    """Check if a repository is a mirror by looking for mirror-sync.yml.
+    return repos
 
-    Args:
-        repo_name: Full repository name (owner/repo)
 
-    Returns:
-        True if repository has mirror-sync.yml
-    """
-    result = subprocess.run(
-        ["gh", "api", f"repos/{repo_name}/contents/.github/workflows/mirror-sync.yml"],
-        capture_output=True,
-    )
-    return result.returncode == 0
-
-
-def _extract_mirror_info(repo_data: Dict) -> Dict[str, str]:
+def _extract_mirror_info(repo_data: Dict, workflow_content: str) -> Dict[str, str]:
     """Extract mirror information from repository data.
 
     Args:
         repo_data: Repository data from GitHub API
+        workflow_content: Content of the repository's mirror-sync.yml
 
     Returns:
         Mirror information dictionary
     """
-    repo_name = repo_data.get("fullName", repo_data.get("nameWithOwner", ""))
-
-    # Try to get upstream URL from workflow
-    upstream = _get_upstream_from_workflow(repo_name)
-
     return {
-        "name": repo_name,
+        "name": repo_data["nameWithOwner"],
         "mirror": repo_data["url"],
-        "upstream": upstream,
-        "description": repo_data.get("description", ""),
+        "upstream": _get_upstream_from_workflow(workflow_content),
+        "description": repo_data.get("description") or "",
         "is_private": repo_data.get("isPrivate", False),
         "updated_at": repo_data.get("updatedAt", ""),
     }
 
 
-def _get_upstream_from_workflow(repo_name: str) -> str:
-    """Try to extract upstream URL from workflow file.
+def _get_upstream_from_workflow(content: str) -> str:
+    """Try to extract upstream URL from workflow content.
 
     Args:
-        repo_name: Full repository name (owner/repo)
+        content: Workflow file content
 
     Returns:
         Upstream URL or empty string
     """
-    result = subprocess.run(
-        [
-            "gh",
-            "api",
-            f"repos/{repo_name}/contents/.github/workflows/mirror-sync.yml",
-            "-q",
-            ".content",
-        ],
-        capture_output=True,
-        text=True,
-    )
-
-    if result.returncode != 0:
-        return ""
-
-    try:
-        content = base64.b64decode(result.stdout.strip()).decode()
-
-        # Look for upstream URL in comments
-        for line in content.split("\n"):
-            if "UPSTREAM_URL:" in line and "#" in line:
-                comment_part = line.split("#", 1)[1].strip()
-                if "UPSTREAM_URL:" in comment_part:
-                    return comment_part.split("UPSTREAM_URL:", 1)[1].strip()
-    except Exception:
-        pass
+    # Look for upstream URL in comments
+    for line in content.split("\n"):
+        if "UPSTREAM_URL:" in line and "#" in line:
+            comment_part = line.split("#", 1)[1].strip()
+            if "UPSTREAM_URL:" in comment_part:
+                return comment_part.split("UPSTREAM_URL:", 1)[1].strip()
 
     return ""
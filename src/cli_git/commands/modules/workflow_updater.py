@@ -1,10 +1,65 @@
 """Workflow update functionality for mirror repositories."""
 
-import subprocess
-from typing import Optional
+import base64
+import json
+from typing import Optional, Tuple
 
 from cli_git.core.mirrorkeep import create_default_mirrorkeep
-from cli_git.utils.gh import GitHubError
+from cli_git.utils.gh import GitHubError, run_gh
+
+_WORKFLOW_PATH = ".github/workflows/mirror-sync.yml"
+
+
+def _get_file(repo: str, path: str) -> Tuple[Optional[str], Optional[str]]:
+    """Read a file through the GitHub contents API.
+
+    Args:
+        repo: Repository name (owner/repo)
+        path: File path relative to the repository root
+
+    Returns:
+        Tuple of (content, blob SHA), or (None, None) if the file does not exist
+
+    Raises:
+        GitHubError: If the file cannot be read
+    """
+    result = run_gh(["api", f"repos/{repo}/contents/{path}"], capture_output=True, text=True)
+
+    if result.returncode != 0:
+        if "HTTP 404" in result.stderr:
+            return None, None
+        raise GitHubError(f"Failed to read {path}: {result.stderr}")
+
+    data = json.loads(result.stdout)
+    return base64.b64decode(data["content"]).decode(), data["sha"]
+
+
+def _put_file(repo: str, path: str, content: str, message: str, sha: Optional[str] = None) -> None:
+    """Create or update a file with a single commit through the GitHub contents API.
+
+    Args:
+        repo: Repository name (owner/repo)
+        path: File path relative to the repository root
+        content: New file content
+        message: Commit message
+        sha: Blob SHA of the file being replaced (None to create it)
+
+    Raises:
+        GitHubError: If the file cannot be written
+    """
+    body = {"message": message, "content": base64.b64encode(content.encode()).decode()}
+    if sha:
+        body["sha"] = sha
+
+    result = run_gh(
+        ["api", "-X", "PUT", f"repos/{repo}/contents/{path}", "--input", "-"],
+        input=json.dumps(body),
+        capture_output=True,
+        text=True,
+    )
+
+    if result.returncode != 0:
+        raise GitHubError(f"Failed to update {path}: {result.stderr}")
 
 
 def update_workflow_file(repo: str, content: str) -> bool:
@@ -20,71 +75,23 @@ def update_workflow_file(repo: str, content: str) -> bool:
     Raises:
         GitHubError: If update fails
     """
-    # Use git commands instead of API for better reliability
+    # Use the contents API instead of cloning the whole repository
     try:
-        # Clone repository in a temporary directory
-        import os
-        import tempfile
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Clone the repo
-            clone_result = subprocess.run(
-                ["git", "clone", f"https://github.com/{repo}.git", tmpdir],
-                capture_output=True,
-                text=True,
-            )
-
-            if clone_result.returncode != 0:
-                # Try with gh auth
-                clone_result = subprocess.run(
-                    ["gh", "repo", "clone", repo, tmpdir], capture_output=True, text=True
-                )
-
-                if clone_result.returncode != 0:
-                    raise GitHubError(f"Failed to clone repository: {clone_result.stderr}")
-
-            # Check if workflow file exists and compare content
-            workflow_path = os.path.join(tmpdir, ".github", "workflows", "mirror-sync.yml")
-            existing_content = ""
-            if os.path.exists(workflow_path):
-                with open(workflow_path, "r") as f:
-                    existing_content = f.read()
-
-            # Only update if content is different
-            if existing_content == content:
-                # No changes needed
-                return False
-
-            # Update workflow file
-            os.makedirs(os.path.dirname(workflow_path), exist_ok=True)
-
-            with open(workflow_path, "w") as f:
-                f.write(content)
-
-            # Save current directory before changing
-            # IMPORTANT: Always restore the original directory to avoid side effects
-            original_cwd = os.getcwd()
-
-            try:
-                # Commit and push
-                os.chdir(tmpdir)
-
-                subprocess.run(["git", "add", ".github/workflows/mirror-sync.yml"], check=True)
-                subprocess.run(
-                    ["git", "commit", "-m", "Update mirror sync workflow to latest version"],
-                    check=True,
-                )
-                subprocess.run(["git", "push"], check=True)
-
-                return True
-            finally:
-                # Always restore the original directory
-                os.chdir(original_cwd)
-
-    except subprocess.CalledProcessError as e:
-        raise GitHubError(f"Failed to update workflow: {e}")
+        existing_content, sha = _get_file(repo, _WORKFLOW_PATH)
+
+        # Only update if content is different
+        if existing_content == content:
+            return False
+
+        _put_file(
+            repo, _WORKFLOW_PATH, content, "Update mirror sync workflow to latest version", sha
+        )
+        return True
+
+    except GitHubError:
+        raise
     except Exception as e:
-        raise GitHubError(f"Unexpected error updating workflow: {e}")
+        raise GitHubError(f"Unexpected error updating workflow: {e}") from e
 
 
 def get_repo_secret_value(repo: str, secret_name: str) -> Optional[str]:
@@ -106,9 +113,8 @@ def get_repo_secret_value(repo: str, secret_name: str) -> Optional[str]:
 
     # Try to get workflow file and look for upstream URL comments
     try:
-        result = subprocess.run(
+        result = run_gh(
             [
-                "gh",
                 "api",
                 f"repos/{repo}/contents/.github/workflows/mirror-sync.yml",
                 "-q",
@@ -120,8 +126,6 @@ def get_repo_secret_value(repo: str, secret_name: str) -> Optional[str]:
         )
 
         # Decode base64 content
-        import base64
-
         content = base64.b64decode(result.stdout.strip()).decode()
 
         # Look for upstream URL in comments
@@ -155,8 +159,8 @@ def create_mirrorkeep_if_missing(repo: str) -> bool:
     """
     try:
         # Check if .mirrorkeep already exists
-        check_result = subprocess.run(
-            ["gh", "api", f"repos/{repo}/contents/.mirrorkeep"],
+        check_result = run_gh(
+            ["api", f"repos/{repo}/contents/.mirrorkeep"],
             capture_output=True,
             text=True,
         )
@@ -166,46 +170,15 @@ def create_mirrorkeep_if_missing(repo: str) -> bool:
             return False
 
         # File doesn't exist, create it
-        import os
-        import tempfile
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Clone the repo
-            clone_result = subprocess.run(
-                ["gh", "repo", "clone", repo, tmpdir], capture_output=True, text=True
-            )
-
-            if clone_result.returncode != 0:
-                raise GitHubError(f"Failed to clone repository: {clone_result.stderr}")
-
-            # Create .mirrorkeep file
-            mirrorkeep_path = os.path.join(tmpdir, ".mirrorkeep")
-            mirrorkeep_content = create_default_mirrorkeep()
-
-            with open(mirrorkeep_path, "w") as f:
-                f.write(mirrorkeep_content)
-
-            # Save current directory before changing
-            # IMPORTANT: Always restore the original directory to avoid side effects
-            original_cwd = os.getcwd()
-
-            try:
-                # Commit and push
-                os.chdir(tmpdir)
-
-                subprocess.run(["git", "add", ".mirrorkeep"], check=True)
-                subprocess.run(
-                    ["git", "commit", "-m", "Add .mirrorkeep file for preserving custom files"],
-                    check=True,
-                )
-                subprocess.run(["git", "push"], check=True)
-
-                return True
-            finally:
-                # Always restore the original directory
-                os.chdir(original_cwd)
-
-    except subprocess.CalledProcessError as e:
-        raise GitHubError(f"Failed to create .mirrorkeep: {e}")
+        _put_file(
+            repo,
+            ".mirrorkeep",
+            create_default_mirrorkeep(),
+            "Add .mirrorkeep file for preserving custom files",
+        )
+        return True
+
+    except GitHubError as e:
+        raise GitHubError(f"Failed to create .mirrorkeep: {e}") from e
     except Exception as e:
-        raise GitHubError(f"Unexpected error creating .mirrorkeep: {e}")
+        raise GitHubError(f"Unexpected error creating .mirrorkeep: {e}") from e
@@ -1,8 +1,9 @@
 """Create a private mirror of a public repository."""
 
 import os
+import shlex
 import shutil
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -15,13 +16,12 @@ from cli_git.core.workflow import generate_sync_workflow
 from cli_git.utils.config import ConfigManager
 from cli_git.utils.gh import (
     GitHubError,
-    add_repo_secret,
-    check_gh_auth,
+    add_repo_secrets,
     create_private_repo,
-    get_current_username,
+    get_auth_user,
     get_upstream_default_branch,
 )
-from cli_git.utils.git import extract_repo_info, get_default_branch, run_git_command
+from cli_git.utils.git import extract_repo_info, run_git_command, update_repo_cache
 from cli_git.utils.schedule import describe_schedule, generate_random_biweekly_schedule
 from cli_git.utils.validators import (
     ValidationError,
@@ -87,6 +87,7 @@ def private_mirror_operation(
     org: Optional[str] = None,
     schedule: str = "0 0 * * *",
     no_sync: bool = False,
+    no_cache: bool = False,
     slack_webhook_url: Optional[str] = None,
     github_token: Optional[str] = None,
 ) -> str:
@@ -99,17 +100,31 @@ def private_mirror_operation(
         org: Organization name (optional)
         schedule: Cron schedule for synchronization
         no_sync: Skip automatic synchronization setup
+        no_cache: Clone directly instead of through the shared repository cache
         slack_webhook_url: Slack webhook URL for notifications (optional)
         github_token: GitHub Personal Access Token for tag sync (optional)
 
     Returns:
         URL of the created mirror repository
     """
-    with TemporaryDirectory() as temp_dir:
-        # Clone the repository
+    with TemporaryDirectory() as temp_dir, ThreadPoolExecutor(max_workers=1) as executor:
+        # The upstream default branch is a read-only lookup, so fetch it while cloning
+        default_branch_future = (
+            None if no_sync else executor.submit(get_upstream_default_branch, upstream_url)
+        )
+
+        # Clone the repository (remote named "upstream" so no rename is needed later).
+        # Objects already in the shared cache are copied locally instead of downloaded.
         repo_path = Path(temp_dir) / target_name
         typer.echo("  ✓ Cloning repository")
-        run_git_command(f"clone {upstream_url} {repo_path}")
+        reference = None if no_cache else update_repo_cache(upstream_url)
+        reference_args = (
+            f"--reference-if-able {shlex.quote(str(reference))} --dissociate " if reference else ""
+        )
+        run_git_command(
+            f"clone {reference_args}--origin upstream "
+            f"{shlex.quote(upstream_url)} {shlex.quote(str(repo_path))}"
+        )
 
         # Change to repo directory
         os.chdir(repo_path)
@@ -136,19 +151,13 @@ def private_mirror_operation(
         typer.echo(f"  ✓ Creating private repository: {org or username}/{target_name}")
         mirror_url = create_private_repo(target_name, org=org)
 
-        # Update remotes
-        run_git_command("remote rename origin upstream")
+        # Add mirror remote
         run_git_command(f"remote add origin {mirror_url}")
 
-        # Push all branches and tags
-        typer.echo("  ✓ Pushing branches and tags")
-        run_git_command("push origin --all")
-        run_git_command("push origin --tags")
-
         if not no_sync:
             # Get upstream default branch
             typer.echo("  ✓ Getting upstream default branch")
-            upstream_default_branch = get_upstream_default_branch(upstream_url)
+            upstream_default_branch = default_branch_future.result()
 
             # Create workflow file
             typer.echo(f"  ✓ Setting up automatic sync ({schedule})")
@@ -161,46 +170,43 @@ def private_mirror_operation(
             workflow_file = workflow_dir / "mirror-sync.yml"
             workflow_file.write_text(workflow_content)
 
-            # Commit and push workflow
+            # Commit the workflow on the checked-out (upstream default) branch
+            # so it goes out with the initial push
             run_git_command("add .github/workflows/mirror-sync.yml")
             # Commit message for sync workflow
             commit_msg = "Add automatic mirror sync workflow"
             run_git_command(f'commit -m "{commit_msg}"')
 
-            # Get the default branch and push to it
-            try:
-                default_branch = get_default_branch(repo_path)
-                run_git_command(f"push origin {default_branch}")
-            except subprocess.CalledProcessError:
-                # Fallback to common branch names if detection fails
-                for branch in ["main", "master"]:
-                    try:
-                        run_git_command(f"push origin {branch}")
-                        break
-                    except subprocess.CalledProcessError:
-                        continue
-                else:
-                    # If all fails, just push current branch
-                    run_git_command("push origin HEAD")
+        # Push all branches and tags in a single push
+        typer.echo("  ✓ Pushing branches and tags")
+        run_git_command("push origin refs/heads/*:refs/heads/* refs/tags/*:refs/tags/*")
 
+        if not no_sync:
             # Add secrets
             repo_full_name = f"{org or username}/{target_name}"
-            add_repo_secret(repo_full_name, "UPSTREAM_URL", upstream_url)
-            add_repo_secret(repo_full_name, "UPSTREAM_DEFAULT_BRANCH", upstream_default_branch)
+            secrets = {
+                "UPSTREAM_URL": upstream_url,
+                "UPSTREAM_DEFAULT_BRANCH": upstream_default_branch,
+            }
 
             # Add GitHub token if available
             if github_token:
-                add_repo_secret(repo_full_name, "GH_TOKEN", github_token)
+                secrets["GH_TOKEN"] = github_token
+
+            # Add Slack webhook secret if provided
+            if slack_webhook_url:
+                secrets["SLACK_WEBHOOK_URL"] = slack_webhook_url
+
+            # Set all secrets with a single gh call
+            add_repo_secrets(repo_full_name, secrets)
+
+            if github_token:
                 typer.echo("  ✓ GitHub token added for tag synchronization")
             else:
                 typer.echo(
                     "  ⚠️  No GitHub token provided. Tag sync may fail if tags contain workflow files."
                 )
 
-            # Add Slack webhook secret if provided
-            if slack_webhook_url:
-                add_repo_secret(repo_full_name, "SLACK_WEBHOOK_URL", slack_webhook_url)
-
     return mirror_url
 
 
@@ -228,10 +234,17 @@ def private_mirror_command(
     no_sync: Annotated[
         bool, typer.Option("--no-sync", help="Disable automatic synchronization")
     ] = False,
+    no_cache: Annotated[
+        bool,
+        typer.Option(
+            "--no-cache", help="Clone without the shared repository cache in ~/.cli-git/cache/repos"
+        ),
+    ] = False,
 ) -> None:
     """Create a private mirror of a public repository with auto-sync."""
-    # Check prerequisites
-    if not check_gh_auth():
+    # Check prerequisites (authentication and username in one call)
+    username = get_auth_user()
+    if username is None:
         typer.echo("❌ GitHub CLI is not authenticated")
         typer.echo("   Please run: gh auth login")
         raise typer.Exit(1)
@@ -304,13 +317,6 @@ def private_mirror_command(
     # Get GitHub token from config
     github_token = config["github"].get("github_token", "")
 
-    # Get current username
-    try:
-        username = get_current_username()
-    except GitHubError as e:
-        typer.echo(f"❌ {e}")
-        raise typer.Exit(1)
-
     typer.echo("\n🔄 Creating private mirror...")
 
     try:
@@ -322,6 +328,7 @@ def private_mirror_command(
             org=org,
             schedule=schedule,
             no_sync=no_sync,
+            no_cache=no_cache,
             slack_webhook_url=slack_webhook_url,
             github_token=github_token,
         )
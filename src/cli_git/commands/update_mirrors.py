@@ -1,6 +1,8 @@
 """Update existing mirror repositories with current settings."""
 
-import subprocess
+import contextlib
+import json
+import sys
 from typing import Annotated, Optional
 
 import typer
@@ -16,10 +18,12 @@ from cli_git.core.workflow import generate_sync_workflow
 from cli_git.utils.config import ConfigManager
 from cli_git.utils.gh import (
     GitHubError,
-    add_repo_secret,
-    check_gh_auth,
-    get_current_username,
+    add_repo_secrets,
+    get_auth_user,
+    get_repo_list_etag,
+    get_repos_with_file,
     get_upstream_default_branch,
+    is_repo_list_unchanged,
 )
 from cli_git.utils.git import extract_repo_info
 from cli_git.utils.schedule import generate_random_biweekly_schedule
@@ -44,6 +48,12 @@ def update_mirrors_command(
     verbose: Annotated[
         bool, typer.Option("--verbose", "-v", help="Show detailed information when scanning")
     ] = False,
+    json_output: Annotated[
+        bool,
+        typer.Option(
+            "--json", "-j", help="Print a JSON summary to stdout (progress goes to stderr)"
+        ),
+    ] = False,
 ) -> None:
     """Update mirror repositories with current settings.
 
@@ -56,9 +66,43 @@ def update_mirrors_command(
 
         # Update all mirrors using xargs
         cli-git update-mirrors --scan | xargs -I {} cli-git update-mirrors --repo {}
+
+        # Machine-readable summary
+        cli-git update-mirrors --repo testuser/mirror-repo --json
     """
-    # Check prerequisites
-    if not check_gh_auth():
+    summary: dict = {}
+    if not json_output:
+        _run_update_mirrors(repo, scan, verbose, summary)
+        return
+
+    # Progress goes to stderr so stdout carries only the JSON summary
+    exit_code = 0
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            _run_update_mirrors(repo, scan, verbose, summary)
+    except typer.Exit as e:
+        exit_code = e.exit_code
+    except GitHubError as e:
+        summary.clear()
+        summary.update(status="error", message=str(e))
+        typer.echo(f"❌ {e}", err=True)
+        exit_code = 1
+
+    # Exits that did not record an outcome (e.g. a cancelled selection) still report one
+    if "status" not in summary:
+        summary["status"] = "error" if exit_code else "cancelled"
+
+    typer.echo(json.dumps(summary))
+    if exit_code:
+        raise typer.Exit(exit_code)
+
+
+def _run_update_mirrors(repo: Optional[str], scan: bool, verbose: bool, summary: dict) -> None:
+    """Run update-mirrors, recording the outcome in ``summary``."""
+    # Check prerequisites (authentication and username in one call)
+    username = get_auth_user()
+    if username is None:
+        summary["status"] = "unauthenticated"
         typer.echo("❌ GitHub CLI is not authenticated")
         typer.echo("   Please run: gh auth login")
         raise typer.Exit(1)
@@ -75,27 +119,20 @@ def update_mirrors_command(
         typer.echo("   Run 'cli-git init' to add a GitHub token")
         typer.echo("   Continuing without GH_TOKEN (tag sync may fail)...")
 
-    # Get current username
-    try:
-        username = get_current_username()
-    except GitHubError as e:
-        typer.echo(f"❌ {e}")
-        raise typer.Exit(1)
-
     # Handle scan option
     if scan:
-        _handle_scan_option(config_manager, config, username, verbose)
+        _handle_scan_option(config_manager, config, username, verbose, summary)
         return
 
     # Find mirrors to update
-    mirrors = _find_mirrors_to_update(repo, config_manager, config, username)
+    mirrors = _find_mirrors_to_update(repo, config_manager, config, username, summary)
 
     # Update each mirror
-    _update_mirrors(mirrors, github_token, slack_webhook_url)
+    _update_mirrors(mirrors, github_token, slack_webhook_url, summary)
 
 
 def _handle_scan_option(
-    config_manager: ConfigManager, config: dict, username: str, verbose: bool
+    config_manager: ConfigManager, config: dict, username: str, verbose: bool, summary: dict
 ) -> None:
     """Handle the --scan option to display mirrors without updating."""
     if verbose:
@@ -104,15 +141,19 @@ def _handle_scan_option(
     org = config["github"].get("default_org")
 
     # Check cache first
-    cached_mirrors = config_manager.get_scanned_mirrors()
+    cached_mirrors = config_manager.get_scanned_mirrors(is_unchanged=is_repo_list_unchanged)
     if cached_mirrors is not None:
         if verbose:
-            typer.echo("  Using cached scan results (less than 30 minutes old)")
+            typer.echo("  Using cached scan results")
         mirrors = cached_mirrors
     else:
+        etag = get_repo_list_etag()
         mirrors = scan_for_mirrors(username, org)
         # Save to cache
-        config_manager.save_scanned_mirrors(mirrors)
+        config_manager.save_scanned_mirrors(mirrors, etag=etag)
+
+    summary["status"] = "scanned"
+    summary["mirrors"] = [mirror.get("name", "") for mirror in mirrors]
 
     if not mirrors:
         if verbose:
@@ -179,6 +220,7 @@ def _find_mirrors_to_update(
     config_manager: ConfigManager,
     config: dict,
     username: str,
+    summary: dict,
 ) -> list:
     """Find mirrors to update based on options."""
     typer.echo("\n🔍 Finding mirrors to update...")
@@ -188,7 +230,7 @@ def _find_mirrors_to_update(
         return [{"mirror": f"https://github.com/{repo}", "upstream": "", "name": repo}]
 
     # Check scanned mirrors cache first
-    mirrors = config_manager.get_scanned_mirrors()
+    mirrors = config_manager.get_scanned_mirrors(is_unchanged=is_repo_list_unchanged)
 
     if mirrors is None:
         # Fall back to recent mirrors if no scanned cache
@@ -198,11 +240,13 @@ def _find_mirrors_to_update(
             # Need to scan
             org = config["github"].get("default_org")
             typer.echo("  Scanning for mirrors...")
+            etag = get_repo_list_etag()
             mirrors = scan_for_mirrors(username, org)
             # Save to cache
-            config_manager.save_scanned_mirrors(mirrors)
+            config_manager.save_scanned_mirrors(mirrors, etag=etag)
 
     if not mirrors:
+        summary["status"] = "no_mirrors"
         typer.echo("\n❌ No mirror repositories found")
         typer.echo("\n💡 Run 'cli-git update-mirrors --scan' to find mirrors")
         raise typer.Exit(0)
@@ -213,36 +257,63 @@ def _find_mirrors_to_update(
     return mirrors
 
 
-def _update_mirrors(mirrors: list, github_token: str, slack_webhook_url: str) -> None:
+def _get_repo_name(mirror: dict) -> Optional[str]:
+    """Get "owner/repo" name of a mirror, falling back to its URL."""
+    repo_name = mirror.get("name")
+    if repo_name:
+        return repo_name
+
+    try:
+        _, repo_part = extract_repo_info(mirror["mirror"])
+        owner = mirror["mirror"].split("/")[-2]
+        return f"{owner}/{repo_part}"
+    except Exception:
+        return None
+
+
+def _update_mirrors(
+    mirrors: list, github_token: str, slack_webhook_url: str, summary: dict
+) -> None:
     """Update the selected mirrors."""
-    success_count = 0
+    updated = []
+    skipped = []
+    failed = []
+
+    repo_names = [_get_repo_name(mirror) for mirror in mirrors]
+    workflow_path = ".github/workflows/mirror-sync.yml"
 
-    for mirror in mirrors:
-        repo_name = mirror.get("name")
+    # Check all mirrors for mirror-sync.yml in one request
+    repos_with_workflow: Optional[set] = None
+    try:
+        repos_with_workflow = get_repos_with_file(
+            [name for name in repo_names if name], workflow_path
+        )
+    except GitHubError as e:
+        typer.echo(f"\n⚠️  Could not check mirror workflows together: {e}")
+        typer.echo("   Checking each mirror separately")
+
+    for mirror, repo_name in zip(mirrors, repo_names, strict=True):
         if not repo_name:
-            # Extract from URL
-            try:
-                _, repo_part = extract_repo_info(mirror["mirror"])
-                owner = mirror["mirror"].split("/")[-2]
-                repo_name = f"{owner}/{repo_part}"
-            except Exception:
-                typer.echo(f"\n❌ Invalid repository URL: {mirror['mirror']}")
-                continue
+            typer.echo(f"\n❌ Invalid repository URL: {mirror['mirror']}")
+            failed.append(mirror["mirror"])
+            continue
 
         typer.echo(f"\n🔄 Updating {repo_name}...")
 
         try:
-            # Check if mirror-sync.yml exists
-            check = subprocess.run(
-                ["gh", "api", f"repos/{repo_name}/contents/.github/workflows/mirror-sync.yml"],
-                capture_output=True,
-            )
-            if check.returncode != 0:
+            # Fall back to a per-mirror lookup so one failed batch only affects this mirror
+            if repos_with_workflow is None:
+                has_workflow = bool(get_repos_with_file([repo_name], workflow_path))
+            else:
+                has_workflow = repo_name in repos_with_workflow
+            if not has_workflow:
                 typer.echo(f"  ⚠️  Skipping {repo_name}: No mirror-sync.yml found")
+                skipped.append(repo_name)
                 continue
 
             # Get upstream URL
             upstream_url = mirror.get("upstream")
+            secrets = {}
 
             if not upstream_url:
                 typer.echo("  ✓ Existing mirror detected")
@@ -253,16 +324,21 @@ def _update_mirrors(mirrors: list, github_token: str, slack_webhook_url: str) ->
                 upstream_branch = get_upstream_default_branch(upstream_url)
 
                 typer.echo("  Updating repository secrets...")
-                add_repo_secret(repo_name, "UPSTREAM_URL", upstream_url)
-                add_repo_secret(repo_name, "UPSTREAM_DEFAULT_BRANCH", upstream_branch)
+                secrets["UPSTREAM_URL"] = upstream_url
+                secrets["UPSTREAM_DEFAULT_BRANCH"] = upstream_branch
 
             # Update additional secrets
             if github_token:
-                add_repo_secret(repo_name, "GH_TOKEN", github_token)
-                typer.echo("    ✓ GitHub token added")
+                secrets["GH_TOKEN"] = github_token
+            if slack_webhook_url:
+                secrets["SLACK_WEBHOOK_URL"] = slack_webhook_url
 
+            if secrets:
+                add_repo_secrets(repo_name, secrets)
+
+            if github_token:
+                typer.echo("    ✓ GitHub token added")
             if slack_webhook_url:
-                add_repo_secret(repo_name, "SLACK_WEBHOOK_URL", slack_webhook_url)
                 typer.echo("    ✓ Slack webhook added")
 
             # Check and create .mirrorkeep if missing
@@ -296,17 +372,21 @@ def _update_mirrors(mirrors: list, github_token: str, slack_webhook_url: str) ->
                 typer.echo("    ✓ Workflow file already up to date")
 
             typer.echo(f"  ✅ Successfully updated {repo_name}")
-            success_count += 1
+            updated.append(repo_name)
 
         except GitHubError as e:
             typer.echo(f"  ❌ Failed to update {repo_name}: {e}")
+            failed.append(repo_name)
         except Exception as e:
             typer.echo(f"  ❌ Unexpected error updating {repo_name}: {e}")
+            failed.append(repo_name)
+
+    summary.update(status="completed", updated=updated, skipped=skipped, failed=failed)
 
     # Summary
-    typer.echo(f"\n📊 Update complete: {success_count}/{len(mirrors)} mirrors updated successfully")
+    typer.echo(f"\n📊 Update complete: {len(updated)}/{len(mirrors)} mirrors updated successfully")
 
-    if success_count < len(mirrors):
+    if len(updated) < len(mirrors):
         typer.echo("\n💡 For failed updates, you may need to:")
         typer.echo("   - Check repository permissions")
         typer.echo("   - Verify the repository exists")
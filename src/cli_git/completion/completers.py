@@ -5,7 +5,13 @@ import subprocess
 from typing import List, Tuple, Union
 
 from cli_git.utils.config import ConfigManager
-from cli_git.utils.gh import GitHubError, get_current_username, get_user_organizations
+from cli_git.utils.gh import (
+    GitHubError,
+    get_current_username,
+    get_repos_with_file,
+    get_user_organizations,
+)
+from cli_git.utils.git import extract_repo_name_from_url
 
 
 def _get_mirror_description(upstream: str) -> str:
@@ -18,16 +24,7 @@ def _get_mirror_description(upstream: str) -> str:
         Formatted description string
     """
     if upstream:
-        # Extract upstream name
-        if "github.com/" in upstream:
-            upstream_parts = upstream.split("github.com/")[-1].split("/")
-            if len(upstream_parts) >= 2:
-                upstream_name = f"{upstream_parts[0]}/{upstream_parts[1]}"
-            else:
-                upstream_name = upstream
-        else:
-            upstream_name = upstream
-        return f"🔄 Mirror of {upstream_name}"
+        return f"🔄 Mirror of {extract_repo_name_from_url(upstream) or upstream}"
     else:
         return "🔄 Mirror repository"
 
@@ -206,26 +203,19 @@ def _fetch_repositories_from_api(
                     check=True,
                 )
 
-                repos = json.loads(result.stdout)
+                repos = [
+                    repo for repo in json.loads(result.stdout) if not repo.get("isArchived", False)
+                ]
+
+                # Check all repos for the mirror workflow in one request
+                mirror_names = get_repos_with_file(
+                    [repo["nameWithOwner"] for repo in repos], ".github/workflows/mirror-sync.yml"
+                )
 
                 # Process all repos and save to cache data
                 for repo in repos:
-                    if repo.get("isArchived", False):
-                        continue
-
                     repo_name = repo["nameWithOwner"]
-
-                    # Check if it's a mirror by looking for workflow
-                    check = subprocess.run(
-                        [
-                            "gh",
-                            "api",
-                            f"repos/{repo_name}/contents/.github/workflows/mirror-sync.yml",
-                        ],
-                        capture_output=True,
-                    )
-
-                    is_mirror = check.returncode == 0
+                    is_mirror = repo_name in mirror_names
 
                     # Add to cache data
                     repo_data = {
@@ -243,7 +233,7 @@ def _fetch_repositories_from_api(
                             description = "Mirror repository"
                         completions.append((repo_name, f"🔄 {description}"))
 
-            except (subprocess.CalledProcessError, json.JSONDecodeError):
+            except (subprocess.CalledProcessError, json.JSONDecodeError, GitHubError):
                 # Continue with next owner if this one fails
                 continue
 
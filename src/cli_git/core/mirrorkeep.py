@@ -1,8 +1,13 @@
 """Mirrorkeep file parsing and pattern matching functionality."""
 
 import fnmatch
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import List, NamedTuple, Pattern, Sequence, Set, Tuple, Union
+
+# A line whose first non-blank character starts a pattern rather than a comment
+_PATTERN_LINE = re.compile(r"^[^\S\n]*([^#\s](?:[^\n]*\S)?)[^\S\n]*$", re.MULTILINE)
 
 
 def parse_mirrorkeep(content: str) -> List[str]:
@@ -14,59 +19,83 @@ def parse_mirrorkeep(content: str) -> List[str]:
     Returns:
         List of patterns (including exclusions with ! prefix)
     """
-    patterns = []
+    # Each match is one stripped line that is neither empty nor a comment
+    return _PATTERN_LINE.findall(content)
 
-    for line in content.strip().split("\n"):
-        # Remove leading/trailing whitespace
-        line = line.strip()
 
-        # Skip empty lines and comments
-        if not line or line.startswith("#"):
-            continue
+class CompiledMirrorkeep(NamedTuple):
+    """Mirrorkeep patterns prepared for repeated matching.
+
+    Attributes:
+        patterns: (is_exclusion, regex) pairs, in order
+    """
+
+    patterns: Tuple[Tuple[bool, Pattern[str]], ...]
+
 
-        patterns.append(line)
+def compile_patterns(patterns: Sequence[str]) -> CompiledMirrorkeep:
+    """Compile .mirrorkeep patterns for repeated matching.
 
-    return patterns
+    Args:
+        patterns: List of patterns (may include exclusions with !)
+
+    Returns:
+        Compiled patterns, shared between calls with the same pattern list
+    """
+    return _compile_mirrorkeep(tuple(patterns))
 
 
-def match_pattern(file_path: str, patterns: List[str]) -> bool:
+def match_pattern(file_path: str, patterns: Union[Sequence[str], CompiledMirrorkeep]) -> bool:
     """Check if a file path matches the given patterns.
 
     Args:
         file_path: Path to check (relative)
-        patterns: List of patterns (may include exclusions with !)
+        patterns: List of patterns (may include exclusions with !), or the
+            result of compile_patterns
 
     Returns:
         True if file matches and is not excluded
     """
-    # Normalize path separators
-    file_path = file_path.replace("\\", "/")
+    if not isinstance(patterns, CompiledMirrorkeep):
+        patterns = compile_patterns(patterns)
+    return _match_compiled(file_path, patterns)
 
-    # Separate inclusion and exclusion patterns
-    includes = []
-    excludes = []
+
+@lru_cache(maxsize=128)
+def _compile_mirrorkeep(patterns: Tuple[str, ...]) -> CompiledMirrorkeep:
+    """Compile a pattern list into (is_exclusion, regex) pairs."""
+    compiled = []
 
     for pattern in patterns:
         if pattern.startswith("!"):
-            excludes.append(pattern[1:])
+            compiled.append((True, _compile_pattern(pattern[1:])))
         else:
-            includes.append(pattern)
+            compiled.append((False, _compile_pattern(pattern)))
+
+    return CompiledMirrorkeep(tuple(compiled))
+
+
+def _match_compiled(file_path: str, compiled: CompiledMirrorkeep) -> bool:
+    """Check a file path against patterns prepared by compile_patterns."""
+    # Normalize path separators
+    file_path = file_path.replace("\\", "/")
 
     # Check exclusions first (they take priority)
-    for exclude in excludes:
-        if _match_single_pattern(file_path, exclude):
+    for is_exclusion, regex in compiled.patterns:
+        if is_exclusion and regex.match(file_path):
             return False
 
     # Check inclusions
-    for include in includes:
-        if _match_single_pattern(file_path, include):
+    for is_exclusion, regex in compiled.patterns:
+        if not is_exclusion and regex.match(file_path):
             return True
 
     return False
 
 
-def _match_single_pattern(file_path: str, pattern: str) -> bool:
-    """Match a single pattern against a file path.
+@lru_cache(maxsize=None)
+def _compile_pattern(pattern: str) -> Pattern[str]:
+    """Compile a single pattern into a regex matching whole relative paths.
 
     Handles:
     - Directory patterns (ending with /)
@@ -76,37 +105,36 @@ def _match_single_pattern(file_path: str, pattern: str) -> bool:
     # Normalize pattern
     pattern = pattern.replace("\\", "/")
 
-    # Directory pattern - matches any file under that directory
+    # Directory pattern - matches the directory itself or any file under it
     if pattern.endswith("/"):
-        return file_path.startswith(pattern) or file_path + "/" == pattern
+        return re.compile(re.escape(pattern[:-1]) + r"(?:/.*)?\Z", re.DOTALL)
 
     # Handle ** glob pattern
     if "**" in pattern:
-        # Convert ** to match any number of directories
+        # ** matches any number of directories, * and ? stay within one segment
         # e.g., "docs/**/*.md" matches "docs/api/reference.md"
-        import re
-
-        # First replace ** with a placeholder to avoid conflicts
-        regex_pattern = pattern.replace("**", "\x00")
-        # Replace single * with [^/]* (matches anything except /)
-        regex_pattern = regex_pattern.replace("*", "[^/]*")
-        # Replace placeholder with .* (matches anything including /)
-        regex_pattern = regex_pattern.replace("\x00", ".*")
-        regex_pattern = "^" + regex_pattern + "$"
-        return bool(re.match(regex_pattern, file_path))
-
-    # For patterns without **, check if pattern contains /
+        parts = []
+        for token in re.split(r"(\*\*|\*|\?)", pattern):
+            if token == "**":
+                parts.append(".*")
+            elif token == "*":
+                parts.append("[^/]*")
+            elif token == "?":
+                parts.append("[^/]")
+            else:
+                parts.append(re.escape(token))
+        return re.compile("".join(parts) + r"\Z", re.DOTALL)
+
+    # For patterns without /, only files in the root directory match
+    # e.g., "*.md" should not match "docs/guide.md"
     if "/" not in pattern:
-        # Pattern is for files in root directory only
-        # e.g., "*.md" should not match "docs/guide.md"
-        if "/" in file_path:
-            return False
+        return re.compile(r"(?!.*/)" + fnmatch.translate(pattern), re.DOTALL)
 
     # Standard fnmatch for other patterns
-    return fnmatch.fnmatch(file_path, pattern)
+    return re.compile(fnmatch.translate(pattern))
 
 
-def get_files_to_preserve(root: Path, patterns: List[str]) -> List[Path]:
+def get_files_to_preserve(root: Path, patterns: List[str]) -> Set[Path]:
     """Get list of files that match the preservation patterns.
 
     Args:
@@ -114,9 +142,10 @@ def get_files_to_preserve(root: Path, patterns: List[str]) -> List[Path]:
         patterns: List of patterns from .mirrorkeep
 
     Returns:
-        List of absolute paths to preserve
+        Set of absolute paths to preserve
     """
-    files_to_preserve = []
+    files_to_preserve = set()
+    compiled = compile_patterns(patterns)
 
     # Walk through all files in the directory
     for path in root.rglob("*"):
@@ -130,13 +159,13 @@ def get_files_to_preserve(root: Path, patterns: List[str]) -> List[Path]:
             relative_str = str(relative_path).replace("\\", "/")
 
             # Check if file matches patterns
-            if match_pattern(relative_str, patterns):
-                files_to_preserve.append(path)
+            if _match_compiled(relative_str, compiled):
+                files_to_preserve.add(path)
         except ValueError:
             # Path is not relative to root, skip it
             continue
 
-    return sorted(files_to_preserve)
+    return files_to_preserve
 
 
 def create_default_mirrorkeep() -> str:
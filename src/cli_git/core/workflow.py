@@ -1,13 +1,17 @@
 """GitHub Actions workflow generation for mirror synchronization."""
 
+from functools import lru_cache
 from pathlib import Path
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
 
 
+@lru_cache(maxsize=32)
 def generate_sync_workflow(upstream_url: str, schedule: str, upstream_default_branch: str) -> str:
     """Generate GitHub Actions workflow for mirror synchronization.
 
+    Results are cached per argument triple since rendering is deterministic.
+
     Args:
         upstream_url: URL of the upstream repository
         schedule: Cron schedule for synchronization
@@ -16,6 +20,19 @@ def generate_sync_workflow(upstream_url: str, schedule: str, upstream_default_br
     Returns:
         YAML content for the workflow file
     """
+    # Render the template with variables
+    workflow_yaml = _load_template().render(
+        schedule=schedule,
+        upstream_url=upstream_url,
+        upstream_default_branch=upstream_default_branch,
+    )
+
+    return workflow_yaml
+
+
+@lru_cache(maxsize=None)
+def _load_template() -> Template:
+    """Load and compile the mirror-sync workflow template once per process."""
     # Get the template directory path
     template_dir = Path(__file__).parent.parent / "templates"
 
@@ -27,13 +44,4 @@ def generate_sync_workflow(upstream_url: str, schedule: str, upstream_default_br
     )
 
     # Load the template
-    template = env.get_template("mirror-sync.yml.j2")
-
-    # Render the template with variables
-    workflow_yaml = template.render(
-        schedule=schedule,
-        upstream_url=upstream_url,
-        upstream_default_branch=upstream_default_branch,
-    )
-
-    return workflow_yaml
+    return env.get_template("mirror-sync.yml.j2")
@@ -3,10 +3,27 @@
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import tomlkit
-from tomlkit import comment, document, nl, table
+from tomlkit import table
+
+DEFAULT_CONFIG_TEMPLATE = """# cli-git configuration file
+# Generated automatically - feel free to edit
+
+[github]
+# GitHub account information
+username = ""
+default_org = ""
+slack_webhook_url = ""
+github_token = ""
+
+[preferences]
+# User preferences
+default_schedule = "0 0 * * *"
+default_prefix = "mirror-"
+analysis_template = "backend"
+"""
 
 
 class ConfigManager:
@@ -25,6 +42,7 @@ class ConfigManager:
         self.mirrors_cache = self.cache_dir / "recent_mirrors.json"
         self.scanned_mirrors_cache = self.cache_dir / "scanned_mirrors.json"
         self.repo_completion_cache = self.cache_dir / "repo_completion.json"
+        self._permissions_set = False
 
         # Ensure directories exist
         self.config_dir.mkdir(exist_ok=True)
@@ -36,34 +54,22 @@ class ConfigManager:
 
     def _create_default_config(self) -> None:
         """Create default configuration file."""
-        doc = document()
-
-        # Add header comment
-        doc.add(comment("cli-git configuration file"))
-        doc.add(comment("Generated automatically - feel free to edit"))
-        doc.add(nl())
-
-        # GitHub section
-        github = table()
-        github.add(comment("GitHub account information"))
-        github["username"] = ""
-        github["default_org"] = ""
-        github["slack_webhook_url"] = ""
-        github["github_token"] = ""
-        doc["github"] = github
-        doc.add(nl())
-
-        # Preferences section
-        prefs = table()
-        prefs.add(comment("User preferences"))
-        prefs["default_schedule"] = "0 0 * * *"
-        prefs["default_prefix"] = "mirror-"
-        prefs["analysis_template"] = "backend"
-        doc["preferences"] = prefs
-
         # Write with restricted permissions
-        self.config_file.write_text(tomlkit.dumps(doc))
-        os.chmod(self.config_file, 0o600)
+        self.config_file.write_text(DEFAULT_CONFIG_TEMPLATE)
+        self._restrict_permissions()
+
+    def _restrict_permissions(self) -> None:
+        """Restrict config file to owner read/write (0o600).
+
+        Rewriting an existing file keeps its mode, so the check only runs once
+        per instance and chmod is skipped when the mode is already correct.
+        """
+        if self._permissions_set:
+            return
+
+        if self.config_file.stat().st_mode & 0o777 != 0o600:
+            os.chmod(self.config_file, 0o600)
+        self._permissions_set = True
 
     def get_config(self) -> Dict[str, Any]:
         """Get current configuration."""
@@ -89,7 +95,7 @@ class ConfigManager:
 
         # Write back with preserved permissions
         self.config_file.write_text(tomlkit.dumps(doc))
-        os.chmod(self.config_file, 0o600)
+        self._restrict_permissions()
 
     def add_recent_mirror(self, mirror_info: Dict[str, str]) -> None:
         """Add a mirror to recent mirrors cache.
@@ -108,45 +114,58 @@ class ConfigManager:
 
     def get_recent_mirrors(self) -> List[Dict[str, str]]:
         """Get list of recently created mirrors."""
-        if not self.mirrors_cache.exists():
+        try:
+            content = self.mirrors_cache.read_text()
+        except FileNotFoundError:
             return []
 
         try:
-            content = self.mirrors_cache.read_text()
             return json.loads(content)
-        except (json.JSONDecodeError, FileNotFoundError):
+        except json.JSONDecodeError:
             return []
 
     def save_scanned_mirrors(
-        self, mirrors: List[Dict[str, str]], prefix: Optional[str] = None
+        self,
+        mirrors: List[Dict[str, str]],
+        prefix: Optional[str] = None,
+        etag: Optional[str] = None,
     ) -> None:
         """Save scanned mirrors to cache with metadata.
 
         Args:
             mirrors: List of mirror dictionaries
             prefix: Prefix used for scanning (optional, deprecated)
+            etag: ETag of the repository list the scan was based on (optional)
         """
         import time
 
         cache_data = {"timestamp": time.time(), "mirrors": mirrors}
+        if etag:
+            cache_data["etag"] = etag
 
         self.scanned_mirrors_cache.write_text(json.dumps(cache_data, indent=2))
 
     def get_scanned_mirrors(
-        self, prefix: Optional[str] = None, max_age: int = 1800
+        self,
+        prefix: Optional[str] = None,
+        max_age: int = 1800,
+        is_unchanged: Optional[Callable[[str], bool]] = None,
     ) -> Optional[List[Dict[str, str]]]:
-        """Get cached scanned mirrors if they're fresh enough.
+        """Get cached scanned mirrors if they're still valid.
+
+        The cache must be younger than ``max_age``. When it also has a stored
+        ETag and ``is_unchanged`` is given, ``is_unchanged(etag)`` must hold too;
+        the ETag only covers the first page of the repository list, so it can
+        invalidate the cache early but never extend it.
 
         Args:
             prefix: Prefix to match (optional)
             max_age: Maximum age in seconds (default: 30 minutes)
+            is_unchanged: Callback that checks whether a stored ETag is still current
 
         Returns:
             List of mirrors if cache is valid, None otherwise
         """
-        if not self.scanned_mirrors_cache.exists():
-            return None
-
         try:
             import time
 
@@ -158,6 +177,11 @@ class ConfigManager:
             if age > max_age:
                 return None
 
+            # A changed repository list invalidates the cache before it expires
+            etag = cache_data.get("etag")
+            if etag and is_unchanged is not None and not is_unchanged(etag):
+                return None
+
             return cache_data.get("mirrors", [])
 
         except (json.JSONDecodeError, FileNotFoundError, KeyError):
@@ -184,9 +208,6 @@ class ConfigManager:
         Returns:
             List of repository data if cache is valid, None otherwise
         """
-        if not self.repo_completion_cache.exists():
-            return None
-
         try:
             import time
 
@@ -1,10 +1,70 @@
 """GitHub CLI (gh) utility functions."""
 
+import hashlib
+import json
+import os
+import re
 import subprocess
-from typing import Optional
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Set
 
 from cli_git.utils.git import extract_repo_info
 
+# Most recently pushed repositories first, so new or re-synced mirrors change the ETag
+_REPO_LIST_ENDPOINT = "user/repos?sort=pushed&per_page=100"
+
+# Repositories looked up per GraphQL request (keeps queries well under API limits)
+_GRAPHQL_BATCH_SIZE = 100
+
+# Values that cannot be written as a single-quoted dotenv line for `gh secret set --env-file`
+# (a trailing backslash would escape the closing quote)
+_DOTENV_UNSAFE = re.compile(r"['\r\n]|\\$")
+
+# gh repo create stderr when the repository name is taken
+_ALREADY_EXISTS = re.compile(r"Validation Failed|already exists")
+
+# Seconds before a gh call is abandoned, so a stalled connection cannot hang the CLI
+_DEFAULT_GH_TIMEOUT = 30.0
+
+# Token validation results for the process lifetime, keyed by token digest
+_token_validation_cache: Dict[str, bool] = {}
+
+# Upstream default branches for the process lifetime, keyed by lowercase owner/repo
+_default_branch_cache: Dict[str, str] = {}
+
+
+def _parse_gh_timeout(value: Optional[str]) -> Optional[float]:
+    """Parse a CLI_GIT_GH_TIMEOUT value.
+
+    Args:
+        value: Raw environment value
+
+    Returns:
+        Timeout in seconds, or None if the value is unset or not a positive number
+    """
+    try:
+        timeout = float(value or "")
+    except ValueError:
+        return None
+    return timeout if 0 < timeout < float("inf") else None
+
+
+_GH_TIMEOUT_ENV = os.environ.get("CLI_GIT_GH_TIMEOUT")
+GH_TIMEOUT = _parse_gh_timeout(_GH_TIMEOUT_ENV) or _DEFAULT_GH_TIMEOUT
+
+
+@lru_cache(maxsize=1)
+def _warn_invalid_gh_timeout() -> None:
+    """Warn once, on the first gh call rather than at import, about an ignored timeout."""
+    if _GH_TIMEOUT_ENV and _parse_gh_timeout(_GH_TIMEOUT_ENV) is None:
+        print(
+            f"Warning: Ignoring invalid CLI_GIT_GH_TIMEOUT={_GH_TIMEOUT_ENV!r}, "
+            f"using {_DEFAULT_GH_TIMEOUT:g}s",
+            file=sys.stderr,
+        )
+
 
 class GitHubError(Exception):
     """Custom exception for GitHub-related errors."""
@@ -12,16 +72,71 @@ class GitHubError(Exception):
     pass
 
 
+def _run(cmd: List[str], **kwargs) -> subprocess.CompletedProcess:
+    """Run a gh command; every gh invocation in this module goes through here.
+
+    Args:
+        cmd: Command and arguments
+        **kwargs: Passed through to subprocess.run
+
+    Returns:
+        Completed process
+    """
+    _warn_invalid_gh_timeout()
+    return subprocess.run(cmd, **kwargs)
+
+
+def run_gh(args: List[str], **kwargs) -> subprocess.CompletedProcess:
+    """Run a gh command with the shared timeout, for callers outside this module.
+
+    Args:
+        args: gh arguments, without the leading "gh"
+        **kwargs: Passed through to subprocess.run; timeout defaults to GH_TIMEOUT
+
+    Returns:
+        Completed process
+
+    Raises:
+        GitHubError: If gh is not installed or the call times out
+    """
+    kwargs.setdefault("timeout", GH_TIMEOUT)
+    try:
+        return _run(["gh", *args], **kwargs)
+    except FileNotFoundError:
+        raise GitHubError("gh CLI not found. Please install GitHub CLI.") from None
+    except subprocess.TimeoutExpired:
+        raise _timeout_error() from None
+
+
+def _timeout_error() -> GitHubError:
+    """Build the error raised when a gh call exceeds GH_TIMEOUT."""
+    return GitHubError(f"gh timed out after {GH_TIMEOUT:g}s (set CLI_GIT_GH_TIMEOUT to change)")
+
+
+@lru_cache(maxsize=1)
 def check_gh_auth() -> bool:
     """Check if gh CLI is authenticated.
 
+    A github.com token stored in gh's hosts file is taken as proof of login
+    without running gh. The result is cached for the process lifetime; a successful
+    run_gh_auth_login() clears it.
+
     Returns:
         True if authenticated, False otherwise
     """
+    if _get_hosts_file_value("oauth_token"):
+        return True
+
     try:
-        result = subprocess.run(["gh", "auth", "status"], capture_output=True, text=True)
+        # Only the exit status matters, so discard both output streams
+        result = _run(
+            ["gh", "auth", "status"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=GH_TIMEOUT,
+        )
         return result.returncode == 0
-    except FileNotFoundError:
+    except (FileNotFoundError, subprocess.TimeoutExpired):
         return False
 
 
@@ -32,30 +147,132 @@ def run_gh_auth_login() -> bool:
         True if login succeeded, False otherwise
     """
     try:
-        result = subprocess.run(["gh", "auth", "login"], check=False)
-        return result.returncode == 0
+        result = _run(["gh", "auth", "login"], check=False)
     except FileNotFoundError:
         return False
 
+    if result.returncode != 0:
+        return False
+    # A new login may change the cached authentication status and username
+    check_gh_auth.cache_clear()
+    get_current_username.cache_clear()
+    return True
+
 
+@lru_cache(maxsize=1)
 def get_current_username() -> str:
     """Get current GitHub username using gh CLI.
 
+    The username is read from gh's hosts file when possible and cached for
+    the process lifetime; failures are not cached.
+
     Returns:
         GitHub username
 
     Raises:
         GitHubError: If unable to get username
     """
+    # gh records the logged-in user in its hosts file, which saves an API round trip
+    username = _get_hosts_file_user()
+    if username:
+        return username
+
     try:
-        result = subprocess.run(
-            ["gh", "api", "user", "-q", ".login"], capture_output=True, text=True, check=True
+        result = _run(
+            ["gh", "api", "user", "-q", ".login"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=GH_TIMEOUT,
         )
-        return result.stdout.strip()
     except subprocess.CalledProcessError as e:
-        raise GitHubError(f"Failed to get current user: {e.stderr}")
+        raise GitHubError(f"Failed to get current user: {e.stderr}") from e
     except FileNotFoundError:
-        raise GitHubError("gh CLI not found. Please install GitHub CLI.")
+        raise GitHubError("gh CLI not found. Please install GitHub CLI.") from None
+    except subprocess.TimeoutExpired:
+        raise _timeout_error() from None
+
+    username = result.stdout.strip()
+    if not username:
+        raise GitHubError("Failed to get current user: gh returned no login")
+    return username
+
+
+def _get_gh_hosts_file() -> Path:
+    """Get the path of gh's hosts.yml, resolved the same way gh resolves it."""
+    config_dir = os.environ.get("GH_CONFIG_DIR")
+    if not config_dir:
+        if os.environ.get("XDG_CONFIG_HOME"):
+            config_dir = Path(os.environ["XDG_CONFIG_HOME"]) / "gh"
+        elif os.name == "nt" and os.environ.get("APPDATA"):
+            config_dir = Path(os.environ["APPDATA"]) / "GitHub CLI"
+        else:
+            config_dir = Path.home() / ".config" / "gh"
+    return Path(config_dir) / "hosts.yml"
+
+
+def _get_hosts_file_user() -> Optional[str]:
+    """Get the github.com user recorded in gh's hosts.yml.
+
+    Returns:
+        Username, or None if a token in the environment overrides the stored
+        login or the hosts file has no github.com user
+    """
+    return _get_hosts_file_value("user")
+
+
+def _get_hosts_file_value(key: str) -> Optional[str]:
+    """Get a value stored directly under github.com in gh's hosts.yml.
+
+    Args:
+        key: Key of the active account's entry, e.g. "user" or "oauth_token"
+
+    Returns:
+        Value, or None if a token in the environment overrides the stored
+        login or the hosts file has no such github.com value
+    """
+    # gh prefers these over the stored login, and they may belong to another account
+    if os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN"):
+        return None
+
+    try:
+        content = _get_gh_hosts_file().read_text()
+    except OSError:
+        return None
+
+    # Find the key directly under the top-level "github.com:" entry
+    prefix = f"{key}:"
+    in_host = False
+    child_indent = None
+    for line in content.splitlines():
+        stripped = line.lstrip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(line) - len(stripped)
+        if indent == 0:
+            in_host = stripped.rstrip() == "github.com:"
+            child_indent = None
+        elif in_host:
+            child_indent = child_indent or indent
+            if indent == child_indent and stripped.startswith(prefix):
+                return stripped[len(prefix) :].strip().strip("\"'") or None
+
+    return None
+
+
+def get_auth_user() -> Optional[str]:
+    """Get the authenticated GitHub username, or None if gh is not logged in.
+
+    Shares get_current_username()'s hosts-file fast path and process-lifetime
+    cache, so a command can check authentication and learn the username at once.
+
+    Returns:
+        GitHub username, or None if gh is not authenticated or not installed
+    """
+    try:
+        return get_current_username()
+    except GitHubError:
+        return None
 
 
 def create_private_repo(
@@ -83,12 +300,15 @@ def create_private_repo(
         cmd.extend(["--description", description])
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return result.stdout.strip()
+        result = _run(cmd, capture_output=True, text=True, check=True, timeout=GH_TIMEOUT)
     except subprocess.CalledProcessError as e:
-        if "Validation Failed" in e.stderr or "already exists" in e.stderr:
-            raise GitHubError(f"Repository '{repo_name}' already exists")
-        raise GitHubError(f"Failed to create repository: {e.stderr}")
+        if _ALREADY_EXISTS.search(e.stderr or ""):
+            raise GitHubError(f"Repository '{repo_name}' already exists") from e
+        raise GitHubError(f"Failed to create repository: {e.stderr}") from e
+    except subprocess.TimeoutExpired:
+        raise _timeout_error() from None
+
+    return result.stdout.strip()
 
 
 def add_repo_secret(repo: str, name: str, value: str) -> None:
@@ -105,9 +325,65 @@ def add_repo_secret(repo: str, name: str, value: str) -> None:
     cmd = ["gh", "secret", "set", name, "--repo", repo]
 
     try:
-        subprocess.run(cmd, input=value, capture_output=True, text=True, check=True)
+        _run(
+            cmd,
+            input=value,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True,
+            timeout=GH_TIMEOUT,
+        )
     except subprocess.CalledProcessError as e:
-        raise GitHubError(f"Failed to set secret '{name}': {e.stderr}")
+        raise GitHubError(f"Failed to set secret '{name}': {e.stderr}") from e
+    except subprocess.TimeoutExpired:
+        raise _timeout_error() from None
+
+
+def add_repo_secrets(repo: str, secrets: Dict[str, str]) -> None:
+    """Add several secrets to a GitHub repository with a single gh call.
+
+    Secrets are passed to ``gh secret set --env-file -`` as single-quoted
+    dotenv lines. Values that cannot be quoted that way are set one at a time
+    with add_repo_secret instead, each costing its own gh call: values
+    containing a single quote, a carriage return or newline, or ending in a
+    backslash (which would escape the closing quote and make gh reject the
+    whole batch).
+
+    Args:
+        repo: Repository name (owner/repo)
+        secrets: Secret values keyed by secret name
+
+    Raises:
+        GitHubError: If adding any secret fails
+    """
+    batch = {}
+    for name, value in secrets.items():
+        if _DOTENV_UNSAFE.search(value):
+            add_repo_secret(repo, name, value)
+        else:
+            batch[name] = value
+
+    if not batch:
+        return
+
+    env_file = "".join(f"{name}='{value}'\n" for name, value in batch.items())
+    cmd = ["gh", "secret", "set", "--env-file", "-", "--repo", repo]
+
+    try:
+        _run(
+            cmd,
+            input=env_file,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True,
+            timeout=GH_TIMEOUT,
+        )
+    except subprocess.CalledProcessError as e:
+        raise GitHubError(f"Failed to set secrets {', '.join(batch)}: {e.stderr}") from e
+    except subprocess.TimeoutExpired:
+        raise _timeout_error() from None
 
 
 def get_user_organizations() -> list[str]:
@@ -120,19 +396,22 @@ def get_user_organizations() -> list[str]:
         GitHubError: If unable to fetch organizations
     """
     try:
-        result = subprocess.run(
+        result = _run(
             ["gh", "api", "user/orgs", "-q", ".[].login"],
             capture_output=True,
             text=True,
             check=True,
+            timeout=GH_TIMEOUT,
         )
         # Split by newlines and filter empty strings
         orgs = [org.strip() for org in result.stdout.strip().split("\n") if org.strip()]
         return orgs
     except subprocess.CalledProcessError as e:
-        raise GitHubError(f"Failed to get organizations: {e.stderr}")
+        raise GitHubError(f"Failed to get organizations: {e.stderr}") from e
     except FileNotFoundError:
-        raise GitHubError("gh CLI not found. Please install GitHub CLI.")
+        raise GitHubError("gh CLI not found. Please install GitHub CLI.") from None
+    except subprocess.TimeoutExpired:
+        raise _timeout_error() from None
 
 
 def get_upstream_default_branch(upstream_url: str) -> str:
@@ -149,19 +428,158 @@ def get_upstream_default_branch(upstream_url: str) -> str:
     """
     try:
         owner, repo = extract_repo_info(upstream_url)
-        result = subprocess.run(
+        # GitHub owner and repository names are case-insensitive
+        cache_key = f"{owner}/{repo}".lower()
+        if cache_key in _default_branch_cache:
+            return _default_branch_cache[cache_key]
+
+        result = _run(
             ["gh", "api", f"repos/{owner}/{repo}", "-q", ".default_branch"],
             capture_output=True,
             text=True,
             check=True,
+            timeout=GH_TIMEOUT,
         )
-        return result.stdout.strip()
+        _default_branch_cache[cache_key] = result.stdout.strip()
+        return _default_branch_cache[cache_key]
     except subprocess.CalledProcessError as e:
-        raise GitHubError(f"Failed to get default branch: {e.stderr}")
+        raise GitHubError(f"Failed to get default branch: {e.stderr}") from e
     except ValueError as e:
-        raise GitHubError(f"Invalid repository URL: {e}")
+        raise GitHubError(f"Invalid repository URL: {e}") from e
     except FileNotFoundError:
-        raise GitHubError("gh CLI not found. Please install GitHub CLI.")
+        raise GitHubError("gh CLI not found. Please install GitHub CLI.") from None
+    except subprocess.TimeoutExpired:
+        raise _timeout_error() from None
+
+
+def _extract_header(response: str, name: str) -> Optional[str]:
+    """Extract a header value from `gh api --include` output.
+
+    Args:
+        response: Raw output starting with the status line and headers
+        name: Header name (case-insensitive)
+
+    Returns:
+        Header value if present, None otherwise
+    """
+    for line in response.splitlines()[1:]:
+        if not line.strip():
+            break
+        key, _, value = line.partition(":")
+        if key.strip().lower() == name.lower():
+            return value.strip()
+    return None
+
+
+def get_repo_list_etag() -> Optional[str]:
+    """Get the ETag of the authenticated user's repository list.
+
+    Returns:
+        ETag header value, or None if it could not be retrieved
+    """
+    try:
+        result = _run(
+            ["gh", "api", "--include", _REPO_LIST_ENDPOINT],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=GH_TIMEOUT,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+
+    if result.returncode != 0:
+        return None
+
+    return _extract_header(result.stdout, "etag")
+
+
+def is_repo_list_unchanged(etag: str) -> bool:
+    """Check whether the repository list still matches a previously seen ETag.
+
+    Sends a conditional request. GitHub answers 304 Not Modified when nothing
+    has changed, and such responses do not count against the rate limit.
+
+    Args:
+        etag: ETag returned by a previous repository list request
+
+    Returns:
+        True if the repository list is unchanged, False otherwise
+    """
+    try:
+        result = _run(
+            ["gh", "api", "--include", _REPO_LIST_ENDPOINT, "-H", f"If-None-Match: {etag}"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=GH_TIMEOUT,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return False
+
+    # gh exits non-zero on 304, so inspect the status line instead of the return code
+    status_line = result.stdout.split("\n", 1)[0].split()
+    return len(status_line) > 1 and status_line[1] == "304"
+
+
+def get_repos_with_file(repos: List[str], path: str) -> Set[str]:
+    """Find which repositories contain a file on their default branch.
+
+    All repositories are looked up with aliased fields in a single GraphQL
+    request (per batch of 100) instead of one REST call per repository.
+
+    Args:
+        repos: Repository names (owner/repo)
+        path: File path relative to the repository root
+
+    Returns:
+        Set of repository names that contain the file
+
+    Raises:
+        GitHubError: If the request fails
+    """
+    found = set()
+    expression = json.dumps(f"HEAD:{path}")
+
+    for start in range(0, len(repos), _GRAPHQL_BATCH_SIZE):
+        batch = repos[start : start + _GRAPHQL_BATCH_SIZE]
+        fields = []
+        for i, repo in enumerate(batch):
+            owner, _, name = repo.partition("/")
+            fields.append(
+                f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+                f"{{ object(expression: {expression}) {{ id }} }}"
+            )
+        query = "query { " + " ".join(fields) + " }"
+
+        try:
+            result = _run(
+                ["gh", "api", "graphql", "-f", f"query={query}"],
+                capture_output=True,
+                text=True,
+                timeout=GH_TIMEOUT,
+            )
+        except FileNotFoundError:
+            raise GitHubError("gh CLI not found. Please install GitHub CLI.") from None
+        except subprocess.TimeoutExpired:
+            raise _timeout_error() from None
+
+        # Missing repositories are reported as errors alongside partial data,
+        # so parse stdout even when gh exits non-zero
+        try:
+            data = json.loads(result.stdout).get("data") or {}
+        except (json.JSONDecodeError, AttributeError):
+            raise GitHubError(f"Failed to query repositories: {result.stderr}") from None
+
+        # Without data the whole query failed (rate limit, missing scope, ...)
+        if result.returncode != 0 and not data:
+            raise GitHubError(f"Failed to query repositories: {result.stderr or result.stdout}")
+
+        for i, repo in enumerate(batch):
+            if (data.get(f"r{i}") or {}).get("object"):
+                found.add(repo)
+
+    return found
 
 
 def validate_github_token(token: str) -> bool:
@@ -176,17 +594,24 @@ def validate_github_token(token: str) -> bool:
     if not token:
         return False
 
+    token_hash = hashlib.blake2b(token.encode(), digest_size=8).hexdigest()
+    if token_hash in _token_validation_cache:
+        return _token_validation_cache[token_hash]
+
     try:
         # Use the token to make a simple API call
-        result = subprocess.run(
+        result = _run(
             ["gh", "api", "user", "-H", f"Authorization: token {token}"],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=GH_TIMEOUT,
         )
-        return result.returncode == 0
     except Exception:
         return False
 
+    _token_validation_cache[token_hash] = result.returncode == 0
+    return _token_validation_cache[token_hash]
+
 
 def mask_token(token: str) -> str:
     """Mask a GitHub token for display.
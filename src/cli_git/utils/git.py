@@ -1,30 +1,46 @@
 """Git command utilities."""
 
+import os
 import re
 import shlex
+import shutil
 import subprocess
+import time
 from pathlib import Path
 from typing import Optional, Tuple
 
+_GITHUB_REPO_NAME_PATTERN = re.compile(r"github\.com/([^/]+)/([^/]+)")
+# HTTPS (https://host/owner/repo) or SSH (git@host:owner/repo) URL, without .git
+_REPO_URL_PATTERN = re.compile(r"(?:https?://[^/]+/|git@[^:]+:)([^/]+)/([^/]+)/?$")
+# Host part of an HTTPS or SSH repository URL, without credentials or port
+_REPO_HOST_PATTERN = re.compile(r"^(?:https?://(?:[^@/]+@)?|[^@/]+@)([^/:]+)")
 
-def run_git_command(cmd: str, cwd: Optional[Path] = None) -> str:
+# Shared bare clones of upstream repositories, used as clone references
+REPO_CACHE_DIR = Path.home() / ".cli-git" / "cache" / "repos"
+REPO_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+
+
+def run_git_command(cmd: str, cwd: Optional[Path] = None, check: bool = True) -> Optional[str]:
     """Execute a git command and return output.
 
     Args:
         cmd: Git command to execute (without 'git' prefix)
         cwd: Working directory for the command
+        check: Raise on failure; if False, return None instead
 
     Returns:
-        Command output (stdout)
+        Command output (stdout), or None if the command failed and check is False
 
     Raises:
-        subprocess.CalledProcessError: If command fails
+        subprocess.CalledProcessError: If command fails and check is True
     """
     full_cmd = ["git"] + shlex.split(cmd)
 
     result = subprocess.run(full_cmd, capture_output=True, text=True, cwd=cwd)
 
     if result.returncode != 0:
+        if not check:
+            return None
         error = subprocess.CalledProcessError(
             result.returncode, full_cmd, output=result.stdout, stderr=result.stderr
         )
@@ -33,79 +49,111 @@ def run_git_command(cmd: str, cwd: Optional[Path] = None) -> str:
     return result.stdout.strip()
 
 
-def get_default_branch(cwd: Optional[Path] = None) -> str:
-    """Get the default branch of the current repository.
+def extract_repo_info(url: str) -> Tuple[str, str]:
+    """Extract owner and repository name from a git URL.
 
     Args:
-        cwd: Working directory for the command
+        url: Repository URL (HTTPS or SSH format)
 
     Returns:
-        Name of the default branch
+        Tuple of (owner, repo_name)
 
     Raises:
-        subprocess.CalledProcessError: If unable to determine default branch
+        ValueError: If URL format is invalid
     """
-    try:
-        # Try to get the default branch from upstream HEAD
-        result = run_git_command("symbolic-ref refs/remotes/upstream/HEAD", cwd=cwd)
-        # Extract branch name from refs/remotes/upstream/branch_name
-        return result.split("/")[-1]
-    except subprocess.CalledProcessError:
-        pass
+    # Remove trailing .git if present
+    if url.endswith(".git"):
+        url = url[:-4]
 
-    try:
-        # Fallback: get the first remote branch (usually the default)
-        result = run_git_command("branch -r", cwd=cwd)
-        lines = result.strip().split("\n")
-        for line in lines:
-            line = line.strip()
-            if line.startswith("upstream/") and "HEAD" not in line:
-                return line.split("/", 1)[1]
-        # If no upstream branches, try origin
-        for line in lines:
-            line = line.strip()
-            if line.startswith("origin/") and "HEAD" not in line:
-                return line.split("/", 1)[1]
-    except subprocess.CalledProcessError:
-        pass
-
-    # Final fallback to common default branch names
-    for branch in ["main", "master", "develop"]:
+    match = _REPO_URL_PATTERN.match(url)
+    if match:
+        return match.group(1), match.group(2)
+
+    raise ValueError(f"Invalid repository URL: {url}")
+
+
+def extract_repo_name_from_url(url: str) -> Optional[str]:
+    """Extract "owner/repo" display name from a GitHub URL.
+
+    Args:
+        url: Repository URL
+
+    Returns:
+        "owner/repo" string, or None if the URL is not a GitHub repository URL
+    """
+    match = _GITHUB_REPO_NAME_PATTERN.search(url)
+    if not match:
+        return None
+    return f"{match.group(1)}/{match.group(2)}"
+
+
+def prune_repo_cache(cache_dir: Path, max_age: int = REPO_CACHE_MAX_AGE) -> None:
+    """Remove cached repositories that have not been used recently.
+
+    Args:
+        cache_dir: Root of the repository cache
+        max_age: Maximum age in seconds since a cached repository was last updated
+    """
+    cutoff = time.time() - max_age
+    # host/owner/repo.git, plus owner/repo.git entries left by earlier versions
+    cache_paths = [*cache_dir.glob("*/*/*.git"), *cache_dir.glob("*/*.git")]
+    for cache_path in cache_paths:
         try:
-            run_git_command(f"show-ref --verify --quiet refs/heads/{branch}", cwd=cwd)
-            return branch
-        except subprocess.CalledProcessError:
+            if cache_path.stat().st_mtime < cutoff:
+                shutil.rmtree(cache_path)
+        except OSError:
             continue
 
-    raise subprocess.CalledProcessError(1, "git", "Unable to determine default branch")
 
+def update_repo_cache(url: str, cache_dir: Optional[Path] = None) -> Optional[Path]:
+    """Create or refresh a shared bare clone of a repository.
 
-def extract_repo_info(url: str) -> Tuple[str, str]:
-    """Extract owner and repository name from a git URL.
+    The bare clone is meant to be passed to ``git clone --reference`` so that
+    repeated clones of the same upstream only download new objects.
 
     Args:
-        url: Repository URL (HTTPS or SSH format)
+        url: Repository URL
+        cache_dir: Root of the repository cache (defaults to REPO_CACHE_DIR)
 
     Returns:
-        Tuple of (owner, repo_name)
-
-    Raises:
-        ValueError: If URL format is invalid
+        Path to the cached bare repository, or None if it could not be updated
     """
-    # Remove trailing .git if present
-    if url.endswith(".git"):
-        url = url[:-4]
+    cache_dir = cache_dir or REPO_CACHE_DIR
 
-    # Try HTTPS pattern
-    https_pattern = r"https?://[^/]+/([^/]+)/([^/]+)/?$"
-    match = re.match(https_pattern, url)
-    if match:
-        return match.group(1), match.group(2)
+    try:
+        owner, repo = extract_repo_info(url)
+    except ValueError:
+        return None
+    host_match = _REPO_HOST_PATTERN.match(url)
+    if not host_match:
+        return None
 
-    # Try SSH pattern
-    ssh_pattern = r"git@[^:]+:([^/]+)/([^/]+)/?$"
-    match = re.match(ssh_pattern, url)
-    if match:
-        return match.group(1), match.group(2)
+    prune_repo_cache(cache_dir)
+    cache_path = cache_dir / host_match.group(1).lower() / owner.lower() / f"{repo.lower()}.git"
 
-    raise ValueError(f"Invalid repository URL: {url}")
+    try:
+        # Never fetch into a clone made from another remote
+        if (cache_path / "HEAD").exists():
+            origin = run_git_command("config --get remote.origin.url", cwd=cache_path, check=False)
+            if origin is None or _strip_git_suffix(origin) != _strip_git_suffix(url):
+                shutil.rmtree(cache_path)
+
+        if (cache_path / "HEAD").exists():
+            run_git_command(
+                "fetch --prune --tags origin +refs/heads/*:refs/heads/*", cwd=cache_path
+            )
+        else:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            run_git_command(f"clone --bare {shlex.quote(url)} {shlex.quote(str(cache_path))}")
+        # Mark as recently used for pruning
+        os.utime(cache_path)
+    except (subprocess.CalledProcessError, OSError):
+        return None
+
+    return cache_path
+
+
+def _strip_git_suffix(url: str) -> str:
+    """Normalize a repository URL for comparison by dropping a trailing slash and .git."""
+    url = url.rstrip("/")
+    return url[:-4] if url.endswith(".git") else url
@@ -0,0 +1,81 @@
+"""Shared fixtures for command tests."""
+
+from collections import namedtuple
+from unittest.mock import DEFAULT, MagicMock, patch
+
+import pytest
+
+from cli_git.utils.config import ConfigManager
+
+UpdateMirrorsEnv = namedtuple(
+    "UpdateMirrorsEnv",
+    ["get_auth_user", "get_repos_with_file", "config_manager", "manager"],
+)
+
+MirrorUpdateOps = namedtuple(
+    "MirrorUpdateOps",
+    [
+        "get_upstream_default_branch",
+        "add_repo_secrets",
+        "create_mirrorkeep_if_missing",
+        "update_workflow_file",
+    ],
+)
+
+
+@pytest.fixture(autouse=True)
+def no_repo_cache():
+    """Keep private-mirror tests from touching the shared repository cache.
+
+    Yields:
+        The patched update_repo_cache mock, returning None (no cache)
+    """
+    with patch("cli_git.commands.private_mirror.update_repo_cache", return_value=None) as mock:
+        yield mock
+
+
+@pytest.fixture
+def update_mirrors_env():
+    """Patch update-mirrors prerequisites with an authenticated user.
+
+    Every repository is reported as having mirror-sync.yml by default.
+
+    Yields:
+        UpdateMirrorsEnv with the patched functions and the ConfigManager instance mock
+    """
+    with patch.multiple(
+        "cli_git.commands.update_mirrors",
+        ConfigManager=DEFAULT,
+        get_auth_user=DEFAULT,
+        get_repos_with_file=DEFAULT,
+    ) as mocks:
+        mocks["ConfigManager"].return_value = MagicMock(spec_set=ConfigManager)
+        mocks["get_auth_user"].return_value = "testuser"
+        mocks["get_repos_with_file"].side_effect = lambda repos, path: set(repos)
+        yield UpdateMirrorsEnv(
+            get_auth_user=mocks["get_auth_user"],
+            get_repos_with_file=mocks["get_repos_with_file"],
+            config_manager=mocks["ConfigManager"],
+            manager=mocks["ConfigManager"].return_value,
+        )
+
+
+@pytest.fixture
+def mirror_update_ops():
+    """Patch the per-mirror GitHub operations performed by update-mirrors.
+
+    The upstream default branch is "main" and .mirrorkeep already exists by default.
+
+    Yields:
+        MirrorUpdateOps with the patched functions
+    """
+    with patch.multiple(
+        "cli_git.commands.update_mirrors",
+        get_upstream_default_branch=DEFAULT,
+        add_repo_secrets=DEFAULT,
+        create_mirrorkeep_if_missing=DEFAULT,
+        update_workflow_file=DEFAULT,
+    ) as mocks:
+        mocks["get_upstream_default_branch"].return_value = "main"
+        mocks["create_mirrorkeep_if_missing"].return_value = False
+        yield MirrorUpdateOps(**mocks)
@@ -1,5 +1,7 @@
 """Tests for private-mirror command."""
 
+import threading
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -25,8 +27,7 @@ class TestPrivateMirrorCommand:
         return CliRunner()
 
     @patch("cli_git.commands.private_mirror.ConfigManager")
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
-    @patch("cli_git.commands.private_mirror.get_current_username")
+    @patch("cli_git.commands.private_mirror.get_auth_user")
     @patch("cli_git.commands.private_mirror.private_mirror_operation")
     @patch("cli_git.commands.private_mirror.generate_random_biweekly_schedule")
     def test_private_mirror_success(
@@ -34,13 +35,11 @@ class TestPrivateMirrorCommand:
         mock_generate_schedule,
         mock_mirror_operation,
         mock_get_username,
-        mock_check_auth,
         mock_config_manager,
         runner,
     ):
         """Test successful private mirror creation."""
         # Setup mocks
-        mock_check_auth.return_value = True
         mock_get_username.return_value = "testuser"
         mock_mirror_operation.return_value = "https://github.com/testuser/repo-mirror"
         mock_generate_schedule.return_value = "30 14 7,21 * *"  # Mock random schedule
@@ -73,6 +72,7 @@ class TestPrivateMirrorCommand:
             org=None,
             schedule="30 14 7,21 * *",  # Random schedule
             no_sync=False,
+            no_cache=False,
             slack_webhook_url="",
             github_token="",
         )
@@ -80,21 +80,21 @@ class TestPrivateMirrorCommand:
         # Verify mirror was added to recent mirrors
         mock_manager.add_recent_mirror.assert_called_once()
 
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
-    def test_private_mirror_not_authenticated(self, mock_check_auth, runner):
+    @patch("cli_git.commands.private_mirror.get_auth_user")
+    def test_private_mirror_not_authenticated(self, mock_get_auth_user, runner):
         """Test private mirror when not authenticated."""
-        mock_check_auth.return_value = False
+        mock_get_auth_user.return_value = None
 
         result = runner.invoke(app, ["private-mirror", "https://github.com/owner/repo"])
 
         assert result.exit_code == 1
         assert "❌ GitHub CLI is not authenticated" in result.stdout
 
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
+    @patch("cli_git.commands.private_mirror.get_auth_user")
     @patch("cli_git.commands.private_mirror.ConfigManager")
-    def test_private_mirror_not_initialized(self, mock_config_manager, mock_check_auth, runner):
+    def test_private_mirror_not_initialized(self, mock_config_manager, mock_get_auth_user, runner):
         """Test private mirror when not initialized."""
-        mock_check_auth.return_value = True
+        mock_get_auth_user.return_value = "testuser"
         mock_manager = MagicMock()
         mock_config_manager.return_value = mock_manager
         mock_manager.get_config.return_value = {"github": {"username": "", "default_org": ""}}
@@ -105,11 +105,11 @@ class TestPrivateMirrorCommand:
         assert "❌ Configuration not initialized" in result.stdout
         assert "Run 'cli-git init' first" in result.stdout
 
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
+    @patch("cli_git.commands.private_mirror.get_auth_user")
     @patch("cli_git.commands.private_mirror.ConfigManager")
-    def test_private_mirror_invalid_url(self, mock_config_manager, mock_check_auth, runner):
+    def test_private_mirror_invalid_url(self, mock_config_manager, mock_get_auth_user, runner):
         """Test private mirror with invalid URL."""
-        mock_check_auth.return_value = True
+        mock_get_auth_user.return_value = "testuser"
         mock_manager = MagicMock()
         mock_config_manager.return_value = mock_manager
         mock_manager.get_config.return_value = {
@@ -122,16 +122,14 @@ class TestPrivateMirrorCommand:
         assert result.exit_code == 1
         assert "❌ Invalid GitHub repository URL" in result.stdout
 
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
-    @patch("cli_git.commands.private_mirror.get_current_username")
+    @patch("cli_git.commands.private_mirror.get_auth_user")
     @patch("cli_git.commands.private_mirror.ConfigManager")
     @patch("cli_git.commands.private_mirror.private_mirror_operation")
     def test_private_mirror_with_custom_name(
-        self, mock_mirror_operation, mock_config_manager, mock_get_username, mock_check_auth, runner
+        self, mock_mirror_operation, mock_config_manager, mock_get_username, runner
     ):
         """Test private mirror with custom repository name."""
         # Setup mocks
-        mock_check_auth.return_value = True
         mock_get_username.return_value = "testuser"
         mock_manager = MagicMock()
         mock_config_manager.return_value = mock_manager
@@ -160,12 +158,12 @@ class TestPrivateMirrorCommand:
                 org=None,
                 schedule="30 14 7,21 * *",  # Random schedule since not explicitly provided
                 no_sync=False,
+                no_cache=False,
                 slack_webhook_url="",
                 github_token="",
             )
 
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
-    @patch("cli_git.commands.private_mirror.get_current_username")
+    @patch("cli_git.commands.private_mirror.get_auth_user")
     @patch("cli_git.commands.private_mirror.ConfigManager")
     @patch("cli_git.commands.private_mirror.private_mirror_operation")
     @patch("cli_git.commands.private_mirror.generate_random_biweekly_schedule")
@@ -175,12 +173,10 @@ class TestPrivateMirrorCommand:
         mock_mirror_operation,
         mock_config_manager,
         mock_get_username,
-        mock_check_auth,
         runner,
     ):
         """Test private mirror with organization."""
         # Setup mocks
-        mock_check_auth.return_value = True
         mock_get_username.return_value = "testuser"
         mock_generate_schedule.return_value = "15 10 5,19 * *"  # Mock random schedule
         mock_manager = MagicMock()
@@ -201,12 +197,12 @@ class TestPrivateMirrorCommand:
             org="myorg",
             schedule="15 10 5,19 * *",  # Random schedule
             no_sync=False,
+            no_cache=False,
             slack_webhook_url="",
             github_token="",
         )
 
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
-    @patch("cli_git.commands.private_mirror.get_current_username")
+    @patch("cli_git.commands.private_mirror.get_auth_user")
     @patch("cli_git.commands.private_mirror.ConfigManager")
     @patch("cli_git.commands.private_mirror.generate_sync_workflow")
     def test_private_mirror_no_sync_option(
@@ -214,12 +210,10 @@ class TestPrivateMirrorCommand:
         mock_generate_workflow,
         mock_config_manager,
         mock_get_username,
-        mock_check_auth,
         runner,
     ):
         """Test private mirror with --no-sync option."""
         # Setup mocks
-        mock_check_auth.return_value = True
         mock_get_username.return_value = "testuser"
         mock_manager = MagicMock()
         mock_config_manager.return_value = mock_manager
@@ -234,47 +228,36 @@ class TestPrivateMirrorCommand:
             # Verify workflow generation was not called
             mock_generate_workflow.assert_not_called()
 
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
-    @patch("cli_git.commands.private_mirror.get_current_username")
+    @patch("cli_git.commands.private_mirror.get_auth_user")
     @patch("cli_git.commands.private_mirror.ConfigManager")
-    @patch("cli_git.commands.private_mirror.get_default_branch")
     @patch("cli_git.commands.private_mirror.run_git_command")
     @patch("cli_git.commands.private_mirror.create_private_repo")
     @patch("cli_git.commands.private_mirror.get_upstream_default_branch")
-    @patch("cli_git.commands.private_mirror.add_repo_secret")
+    @patch("cli_git.commands.private_mirror.add_repo_secrets")
     @patch("cli_git.commands.private_mirror.generate_sync_workflow")
     @patch("cli_git.commands.private_mirror.clean_github_directory")
     @patch("os.chdir")
-    @patch("tempfile.TemporaryDirectory")
-    def test_private_mirror_with_master_branch(
+    def test_private_mirror_pushes_workflow_once(
         self,
-        mock_temp_dir,
         mock_chdir,
         mock_clean_github,
         mock_generate_workflow,
-        mock_add_secret,
+        mock_add_secrets,
         mock_get_upstream_default_branch,
         mock_create_repo,
         mock_run_git,
-        mock_get_default_branch,
         mock_config_manager,
         mock_get_username,
-        mock_check_auth,
         runner,
     ):
-        """Test private mirror operation with master branch."""
+        """Test that the sync workflow goes out with the initial push."""
         # Setup mocks
-        mock_check_auth.return_value = True
         mock_get_username.return_value = "testuser"
-        mock_get_default_branch.return_value = "master"
         mock_create_repo.return_value = "https://github.com/testuser/mirror-repo"
         mock_clean_github.return_value = True
         mock_generate_workflow.return_value = "workflow content"
         mock_get_upstream_default_branch.return_value = "master"
 
-        # Mock temp directory
-        mock_temp_dir.return_value.__enter__.return_value = "/tmp/test"
-
         mock_manager = MagicMock()
         mock_config_manager.return_value = mock_manager
         mock_manager.get_config.return_value = {
@@ -287,84 +270,160 @@ class TestPrivateMirrorCommand:
         # Verify success
         assert result.exit_code == 0
 
-        # Verify that git push was called with master branch
-        push_calls = [
-            call for call in mock_run_git.call_args_list if "push origin master" in str(call)
-        ]
-        assert (
-            len(push_calls) > 0
-        ), f"Expected 'push origin master' call, got: {mock_run_git.call_args_list}"
+        # The workflow is committed before the single push of branches and tags
+        commands = [call.args[0] for call in mock_run_git.call_args_list]
+        push_calls = [cmd for cmd in commands if cmd.startswith("push")]
+        assert push_calls == ["push origin refs/heads/*:refs/heads/* refs/tags/*:refs/tags/*"]
+        assert commands.index('commit -m "Add automatic mirror sync workflow"') < commands.index(
+            push_calls[0]
+        )
 
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
-    @patch("cli_git.commands.private_mirror.get_current_username")
-    @patch("cli_git.commands.private_mirror.ConfigManager")
-    @patch("cli_git.commands.private_mirror.get_default_branch")
-    @patch("cli_git.commands.private_mirror.run_git_command")
+
+class TestPrivateMirrorOperation:
+    """Test git commands issued by private_mirror_operation."""
+
+    @patch("cli_git.commands.private_mirror.create_mirrorkeep_file")
+    @patch("cli_git.commands.private_mirror.clean_github_directory")
     @patch("cli_git.commands.private_mirror.create_private_repo")
-    @patch("cli_git.commands.private_mirror.get_upstream_default_branch")
-    @patch("cli_git.commands.private_mirror.add_repo_secret")
-    @patch("cli_git.commands.private_mirror.generate_sync_workflow")
+    @patch("cli_git.commands.private_mirror.run_git_command")
+    @patch("os.chdir")
+    def test_remote_setup_and_push(
+        self, mock_chdir, mock_run_git, mock_create_repo, mock_clean_github, mock_create_keep
+    ):
+        """Test remote setup and the initial push of branches and tags."""
+        from cli_git.commands.private_mirror import private_mirror_operation
+
+        mock_create_repo.return_value = "https://github.com/testuser/mirror-repo"
+        mock_clean_github.return_value = False
+
+        private_mirror_operation(
+            upstream_url="https://github.com/owner/repo",
+            target_name="mirror-repo",
+            username="testuser",
+            no_sync=True,
+        )
+
+        commands = [c.args[0] for c in mock_run_git.call_args_list]
+        assert commands[0].startswith("clone --origin upstream https://github.com/owner/repo ")
+        assert "remote add origin https://github.com/testuser/mirror-repo" in commands
+        assert not any(cmd.startswith("remote rename") for cmd in commands)
+
+        # Branches and tags go out in one push
+        push_commands = [cmd for cmd in commands if cmd.startswith("push")]
+        assert push_commands == ["push origin refs/heads/*:refs/heads/* refs/tags/*:refs/tags/*"]
+
+    @patch("cli_git.commands.private_mirror.create_mirrorkeep_file")
     @patch("cli_git.commands.private_mirror.clean_github_directory")
+    @patch("cli_git.commands.private_mirror.create_private_repo")
+    @patch("cli_git.commands.private_mirror.run_git_command")
     @patch("os.chdir")
-    @patch("tempfile.TemporaryDirectory")
-    def test_private_mirror_fallback_push_strategy(
+    def test_clone_uses_repo_cache(
         self,
-        mock_temp_dir,
         mock_chdir,
-        mock_clean_github,
-        mock_generate_workflow,
-        mock_add_secret,
-        mock_get_upstream_default_branch,
-        mock_create_repo,
         mock_run_git,
-        mock_get_default_branch,
-        mock_config_manager,
-        mock_get_username,
-        mock_check_auth,
-        runner,
+        mock_create_repo,
+        mock_clean_github,
+        mock_create_keep,
+        no_repo_cache,
     ):
-        """Test private mirror fallback push strategy when get_default_branch fails."""
-        # Setup mocks
-        mock_check_auth.return_value = True
-        mock_get_username.return_value = "testuser"
+        """Test that the clone borrows objects from the shared repository cache."""
+        from cli_git.commands.private_mirror import private_mirror_operation
+
+        no_repo_cache.return_value = Path("/cache/owner/repo.git")
         mock_create_repo.return_value = "https://github.com/testuser/mirror-repo"
-        mock_clean_github.return_value = True
-        mock_generate_workflow.return_value = "workflow content"
-        mock_get_upstream_default_branch.return_value = "main"
+        mock_clean_github.return_value = False
 
-        # Mock temp directory
-        mock_temp_dir.return_value.__enter__.return_value = "/tmp/test"
+        private_mirror_operation(
+            upstream_url="https://github.com/owner/repo",
+            target_name="mirror-repo",
+            username="testuser",
+            no_sync=True,
+        )
 
-        # Mock get_default_branch to fail, then git commands
-        import subprocess
+        no_repo_cache.assert_called_once_with("https://github.com/owner/repo")
+        assert (
+            mock_run_git.call_args_list[0]
+            .args[0]
+            .startswith(
+                "clone --reference-if-able /cache/owner/repo.git --dissociate "
+                "--origin upstream https://github.com/owner/repo "
+            )
+        )
 
-        mock_get_default_branch.side_effect = subprocess.CalledProcessError(1, "git")
+    @patch("cli_git.commands.private_mirror.create_mirrorkeep_file")
+    @patch("cli_git.commands.private_mirror.clean_github_directory", return_value=False)
+    @patch("cli_git.commands.private_mirror.create_private_repo")
+    @patch("cli_git.commands.private_mirror.run_git_command")
+    @patch("os.chdir")
+    def test_clone_without_repo_cache(
+        self,
+        mock_chdir,
+        mock_run_git,
+        mock_create_repo,
+        mock_clean_github,
+        mock_create_keep,
+        no_repo_cache,
+    ):
+        """Test that --no-cache clones directly and quotes paths containing spaces."""
+        from cli_git.commands.private_mirror import private_mirror_operation
 
-        # Mock git commands - first push main succeeds
-        def git_side_effect(cmd, cwd=None):
-            if "push origin main" in cmd:
-                return "pushed to main"
-            return "git output"
+        mock_create_repo.return_value = "https://github.com/testuser/mirror-repo"
 
-        mock_run_git.side_effect = git_side_effect
+        private_mirror_operation(
+            upstream_url="https://github.com/owner/repo",
+            target_name="mirror repo",
+            username="testuser",
+            no_sync=True,
+            no_cache=True,
+        )
 
-        mock_manager = MagicMock()
-        mock_config_manager.return_value = mock_manager
-        mock_manager.get_config.return_value = {
-            "github": {"username": "testuser", "default_org": "", "slack_webhook_url": ""},
-            "preferences": {"default_prefix": "mirror-"},
-        }
+        no_repo_cache.assert_not_called()
+        clone = mock_run_git.call_args_list[0].args[0]
+        assert clone.startswith("clone --origin upstream https://github.com/owner/repo ")
+        assert clone.endswith("/mirror repo'")
 
-        result = runner.invoke(app, ["private-mirror", "https://github.com/owner/repo"])
+    @patch("cli_git.commands.private_mirror.add_repo_secrets")
+    @patch("cli_git.commands.private_mirror.generate_sync_workflow", return_value="workflow")
+    @patch("cli_git.commands.private_mirror.get_upstream_default_branch")
+    @patch("cli_git.commands.private_mirror.create_mirrorkeep_file")
+    @patch("cli_git.commands.private_mirror.clean_github_directory", return_value=False)
+    @patch("cli_git.commands.private_mirror.create_private_repo")
+    @patch("cli_git.commands.private_mirror.run_git_command")
+    @patch("os.chdir")
+    def test_default_branch_lookup_overlaps_clone(
+        self,
+        mock_chdir,
+        mock_run_git,
+        mock_create_repo,
+        mock_clean_github,
+        mock_create_keep,
+        mock_default_branch,
+        mock_generate_workflow,
+        mock_add_secrets,
+    ):
+        """Test that the upstream default branch is looked up while cloning."""
+        from cli_git.commands.private_mirror import private_mirror_operation
+
+        looked_up = threading.Event()
+        mock_default_branch.side_effect = lambda url: looked_up.set() or "develop"
+        # Record whether the lookup ran while the clone was still in progress
+        during_clone = []
+        mock_run_git.side_effect = lambda cmd, **kwargs: (
+            during_clone.append(looked_up.wait(timeout=5)) if cmd.startswith("clone") else None
+        )
+        mock_create_repo.return_value = "https://github.com/testuser/mirror-repo"
 
-        # Verify success
-        assert result.exit_code == 0
+        private_mirror_operation(
+            upstream_url="https://github.com/owner/repo",
+            target_name="mirror-repo",
+            username="testuser",
+        )
 
-        # Verify fallback push to main was attempted
-        push_calls = [
-            call for call in mock_run_git.call_args_list if "push origin main" in str(call)
-        ]
-        assert len(push_calls) > 0, "Expected fallback 'push origin main' call"
+        assert during_clone == [True]
+        mock_default_branch.assert_called_once_with("https://github.com/owner/repo")
+        mock_generate_workflow.assert_called_once_with(
+            "https://github.com/owner/repo", "0 0 * * *", "develop"
+        )
 
 
 class TestMirrorkeepIntegration:
@@ -379,7 +438,7 @@ class TestMirrorkeepIntegration:
         # Mock dependencies
         with patch("cli_git.commands.private_mirror.run_git_command"):
             with patch("cli_git.commands.private_mirror.create_private_repo"):
-                with patch("cli_git.commands.private_mirror.add_repo_secret"):
+                with patch("cli_git.commands.private_mirror.add_repo_secrets"):
                     with patch("cli_git.commands.private_mirror.generate_sync_workflow"):
                         with patch("os.chdir"):
                             # Call the function (simplified test)
@@ -25,8 +25,7 @@ class TestPrefixFeature:
         return CliRunner()
 
     @patch("cli_git.commands.private_mirror.ConfigManager")
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
-    @patch("cli_git.commands.private_mirror.get_current_username")
+    @patch("cli_git.commands.private_mirror.get_auth_user")
     @patch("cli_git.commands.private_mirror.private_mirror_operation")
     @patch("cli_git.commands.private_mirror.generate_random_biweekly_schedule")
     def test_default_prefix_from_config(
@@ -34,13 +33,11 @@ class TestPrefixFeature:
         mock_generate_schedule,
         mock_mirror_operation,
         mock_get_username,
-        mock_check_auth,
         mock_config_manager,
         runner,
     ):
         """Test using default prefix from config."""
         # Setup mocks
-        mock_check_auth.return_value = True
         mock_get_username.return_value = "testuser"
         mock_mirror_operation.return_value = "https://github.com/testuser/custom-react"
         mock_generate_schedule.return_value = "30 14 7,21 * *"  # Mock random schedule
@@ -65,13 +62,13 @@ class TestPrefixFeature:
             org=None,
             schedule="30 14 7,21 * *",  # Random schedule
             no_sync=False,
+            no_cache=False,
             slack_webhook_url="",
             github_token="",
         )
 
     @patch("cli_git.commands.private_mirror.ConfigManager")
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
-    @patch("cli_git.commands.private_mirror.get_current_username")
+    @patch("cli_git.commands.private_mirror.get_auth_user")
     @patch("cli_git.commands.private_mirror.private_mirror_operation")
     @patch("cli_git.commands.private_mirror.generate_random_biweekly_schedule")
     def test_custom_prefix_option(
@@ -79,13 +76,11 @@ class TestPrefixFeature:
         mock_generate_schedule,
         mock_mirror_operation,
         mock_get_username,
-        mock_check_auth,
         mock_config_manager,
         runner,
     ):
         """Test using custom prefix via option."""
         # Setup mocks
-        mock_check_auth.return_value = True
         mock_get_username.return_value = "testuser"
         mock_mirror_operation.return_value = "https://github.com/testuser/fork-react"
         mock_generate_schedule.return_value = "30 14 7,21 * *"  # Mock random schedule
@@ -112,13 +107,13 @@ class TestPrefixFeature:
             org=None,
             schedule="30 14 7,21 * *",  # Random schedule
             no_sync=False,
+            no_cache=False,
             slack_webhook_url="",
             github_token="",
         )
 
     @patch("cli_git.commands.private_mirror.ConfigManager")
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
-    @patch("cli_git.commands.private_mirror.get_current_username")
+    @patch("cli_git.commands.private_mirror.get_auth_user")
     @patch("cli_git.commands.private_mirror.private_mirror_operation")
     @patch("cli_git.commands.private_mirror.generate_random_biweekly_schedule")
     def test_no_prefix_option(
@@ -126,13 +121,11 @@ class TestPrefixFeature:
         mock_generate_schedule,
         mock_mirror_operation,
         mock_get_username,
-        mock_check_auth,
         mock_config_manager,
         runner,
     ):
         """Test using no prefix."""
         # Setup mocks
-        mock_check_auth.return_value = True
         mock_get_username.return_value = "testuser"
         mock_mirror_operation.return_value = "https://github.com/testuser/react"
         mock_generate_schedule.return_value = "30 14 7,21 * *"  # Mock random schedule
@@ -159,13 +152,13 @@ class TestPrefixFeature:
             org=None,
             schedule="30 14 7,21 * *",  # Random schedule
             no_sync=False,
+            no_cache=False,
             slack_webhook_url="",
             github_token="",
         )
 
     @patch("cli_git.commands.private_mirror.ConfigManager")
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
-    @patch("cli_git.commands.private_mirror.get_current_username")
+    @patch("cli_git.commands.private_mirror.get_auth_user")
     @patch("cli_git.commands.private_mirror.private_mirror_operation")
     @patch("cli_git.commands.private_mirror.generate_random_biweekly_schedule")
     def test_custom_repo_name_overrides_prefix(
@@ -173,13 +166,11 @@ class TestPrefixFeature:
         mock_generate_schedule,
         mock_mirror_operation,
         mock_get_username,
-        mock_check_auth,
         mock_config_manager,
         runner,
     ):
         """Test that custom repo name overrides prefix."""
         # Setup mocks
-        mock_check_auth.return_value = True
         mock_get_username.return_value = "testuser"
         mock_mirror_operation.return_value = "https://github.com/testuser/my-custom-name"
         mock_generate_schedule.return_value = "30 14 7,21 * *"  # Mock random schedule
@@ -214,6 +205,7 @@ class TestPrefixFeature:
             org=None,
             schedule="30 14 7,21 * *",  # Random schedule
             no_sync=False,
+            no_cache=False,
             slack_webhook_url="",
             github_token="",
         )
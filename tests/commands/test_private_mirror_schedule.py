@@ -25,20 +25,17 @@ class TestPrivateMirrorSchedule:
         return CliRunner()
 
     @patch("cli_git.commands.private_mirror.ConfigManager")
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
-    @patch("cli_git.commands.private_mirror.get_current_username")
+    @patch("cli_git.commands.private_mirror.get_auth_user")
     @patch("cli_git.commands.private_mirror.private_mirror_operation")
     def test_private_mirror_with_explicit_schedule(
         self,
         mock_mirror_operation,
         mock_get_username,
-        mock_check_auth,
         mock_config_manager,
         runner,
     ):
         """Test private mirror with explicitly provided schedule."""
         # Setup mocks
-        mock_check_auth.return_value = True
         mock_get_username.return_value = "testuser"
         mock_mirror_operation.return_value = "https://github.com/testuser/repo-mirror"
 
@@ -72,13 +69,13 @@ class TestPrivateMirrorSchedule:
             org=None,
             schedule="0 12 * * 1",  # Explicit schedule
             no_sync=False,
+            no_cache=False,
             slack_webhook_url="",
             github_token="",
         )
 
     @patch("cli_git.commands.private_mirror.ConfigManager")
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
-    @patch("cli_git.commands.private_mirror.get_current_username")
+    @patch("cli_git.commands.private_mirror.get_auth_user")
     @patch("cli_git.commands.private_mirror.private_mirror_operation")
     @patch("cli_git.commands.private_mirror.generate_random_biweekly_schedule")
     def test_private_mirror_validates_random_schedule(
@@ -86,13 +83,11 @@ class TestPrivateMirrorSchedule:
         mock_generate_schedule,
         mock_mirror_operation,
         mock_get_username,
-        mock_check_auth,
         mock_config_manager,
         runner,
     ):
         """Test that generated random schedule is used correctly."""
         # Setup mocks
-        mock_check_auth.return_value = True
         mock_get_username.return_value = "testuser"
         mock_mirror_operation.return_value = "https://github.com/testuser/repo-mirror"
         # Return a specific random schedule
@@ -117,16 +112,16 @@ class TestPrivateMirrorSchedule:
         assert "(매월 8일, 22일 15:42 UTC)" in result.stdout
 
     @patch("cli_git.commands.private_mirror.ConfigManager")
-    @patch("cli_git.commands.private_mirror.check_gh_auth")
+    @patch("cli_git.commands.private_mirror.get_auth_user")
     def test_private_mirror_invalid_schedule(
         self,
-        mock_check_auth,
+        mock_get_auth_user,
         mock_config_manager,
         runner,
     ):
         """Test private mirror with invalid cron schedule."""
         # Setup mocks
-        mock_check_auth.return_value = True
+        mock_get_auth_user.return_value = "testuser"
         mock_manager = MagicMock()
         mock_config_manager.return_value = mock_manager
         mock_manager.get_config.return_value = {
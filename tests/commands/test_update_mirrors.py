@@ -1,122 +1,182 @@
 """Tests for update-mirrors command."""
 
+import base64
 import json
-from unittest.mock import MagicMock, mock_open, patch
+import subprocess
+from types import MappingProxyType
+from unittest.mock import Mock
 
 import pytest
-from typer.testing import CliRunner
+import typer
 
 from cli_git.cli import app
+from cli_git.commands import update_mirrors
+from cli_git.commands.modules import scan
+from cli_git.commands.modules.workflow_updater import (
+    create_mirrorkeep_if_missing,
+    get_repo_secret_value,
+    update_workflow_file,
+)
+from cli_git.utils.gh import GH_TIMEOUT, GitHubError
+
+_BASE_CONFIG = MappingProxyType(
+    {
+        "github": MappingProxyType({"username": "testuser", "github_token": "test_token"}),
+        "preferences": MappingProxyType({}),
+    }
+)
+
+
+def _cp(returncode=0, stdout="", stderr=""):
+    """Build a spec'd CompletedProcess mock for patched subprocess.run calls."""
+    return Mock(
+        spec=subprocess.CompletedProcess, returncode=returncode, stdout=stdout, stderr=stderr
+    )
+
+
+def _jsonl(records):
+    """Serialize records as newline-delimited JSON, as emitted by gh --jq."""
+    return "\n".join(json.dumps(record) for record in records) + "\n"
+
+
+@pytest.fixture
+def mock_run(monkeypatch):
+    """Replace subprocess.run with a Mock for the gh calls under test."""
+    mock = Mock()
+    monkeypatch.setattr(subprocess, "run", mock)
+    return mock
+
+
+def _config_with(**github):
+    """Return the base config with extra or overridden github settings."""
+    return {**_BASE_CONFIG, "github": {**_BASE_CONFIG["github"], **github}}
+
+
+_SCANNED_MIRRORS = (
+    MappingProxyType(
+        {
+            "name": "testuser/mirror-project1",
+            "mirror": "https://github.com/testuser/mirror-project1",
+            "upstream": "https://github.com/upstream/project1",
+            "description": "Mirror of project1",
+            "is_private": False,
+            "updated_at": "2025-01-01T12:00:00Z",
+        }
+    ),
+    MappingProxyType(
+        {
+            "name": "testuser/mirror-project2",
+            "mirror": "https://github.com/testuser/mirror-project2",
+            "upstream": "",
+            "description": "",
+            "is_private": True,
+            "updated_at": "2025-01-02T12:00:00Z",
+        }
+    ),
+)
+
+
+class _StubConfigManager:
+    """ConfigManager stand-in with no cached mirrors."""
+
+    def __init__(self, config=_BASE_CONFIG):
+        self._config = config
+
+    def get_config(self):
+        return self._config
+
+    def get_recent_mirrors(self):
+        return []
+
+    def get_scanned_mirrors(self, is_unchanged=None):
+        return []
+
+
+def _stub_prerequisites(monkeypatch, user="testuser", config=_BASE_CONFIG):
+    """Swap the update-mirrors auth and config lookups for plain stubs."""
+    monkeypatch.setattr(update_mirrors, "get_auth_user", lambda: user)
+    monkeypatch.setattr(update_mirrors, "ConfigManager", lambda: _StubConfigManager(config))
 
 
 class TestUpdateMirrorsCommand:
     """Test cases for update-mirrors command."""
 
-    @pytest.fixture
-    def runner(self):
-        """Create CLI test runner."""
-        return CliRunner()
-
-    @patch("cli_git.commands.update_mirrors.check_gh_auth")
-    def test_update_mirrors_not_authenticated(self, mock_check_auth, runner):
+    def test_update_mirrors_not_authenticated(self, monkeypatch, runner):
         """Test update-mirrors when not authenticated."""
-        mock_check_auth.return_value = False
+        _stub_prerequisites(monkeypatch, user=None)
 
-        result = runner.invoke(app, ["update-mirrors"])
+        result = runner.invoke(app, ["update-mirrors", "--json"])
 
         assert result.exit_code == 1
-        assert "❌ GitHub CLI is not authenticated" in result.stdout
-
-    @patch("cli_git.commands.update_mirrors.check_gh_auth")
-    @patch("cli_git.commands.update_mirrors.ConfigManager")
-    @patch("cli_git.commands.update_mirrors.get_current_username")
-    def test_update_mirrors_no_token_warning(
-        self, mock_get_username, mock_config_manager, mock_check_auth, runner
+        assert json.loads(result.stdout) == {"status": "unauthenticated"}
+        assert "❌ GitHub CLI is not authenticated" in result.stderr
+
+    @pytest.mark.parametrize(
+        "error, exit_code, expected",
+        [
+            (
+                GitHubError("API rate limit exceeded"),
+                1,
+                {"status": "error", "message": "API rate limit exceeded"},
+            ),
+            (typer.Exit(0), 0, {"status": "cancelled"}),
+        ],
+        ids=["github_error", "cancelled_selection"],
+    )
+    def test_update_mirrors_json_always_reports_status(
+        self, monkeypatch, runner, error, exit_code, expected
     ):
+        """Test that failures and cancellations still print a JSON summary."""
+        _stub_prerequisites(monkeypatch)
+
+        def find_mirrors(*args):
+            raise error
+
+        monkeypatch.setattr(update_mirrors, "_find_mirrors_to_update", find_mirrors)
+
+        result = runner.invoke(app, ["update-mirrors", "--json"])
+
+        assert result.exit_code == exit_code
+        assert json.loads(result.stdout) == expected
+
+    def test_update_mirrors_no_token_warning(self, monkeypatch, runner):
         """Test warning when no GitHub token is configured."""
-        mock_check_auth.return_value = True
-        mock_get_username.return_value = "testuser"
-
-        # Mock ConfigManager
-        mock_manager = MagicMock()
-        mock_config_manager.return_value = mock_manager
-        mock_manager.get_config.return_value = {
-            "github": {"username": "testuser", "github_token": ""},
-            "preferences": {},
-        }
-        mock_manager.get_recent_mirrors.return_value = []
+        _stub_prerequisites(monkeypatch, config=_config_with(github_token=""))
 
         result = runner.invoke(app, ["update-mirrors"])
 
         assert "⚠️  No GitHub token found in configuration" in result.stdout
         assert "Run 'cli-git init' to add a GitHub token" in result.stdout
 
-    @patch("cli_git.commands.update_mirrors.check_gh_auth")
-    @patch("cli_git.commands.update_mirrors.ConfigManager")
-    @patch("cli_git.commands.update_mirrors.get_current_username")
-    def test_update_mirrors_no_mirrors_in_cache(
-        self, mock_get_username, mock_config_manager, mock_check_auth, runner
-    ):
+    def test_update_mirrors_no_mirrors_in_cache(self, monkeypatch, runner):
         """Test when no mirrors are found in cache."""
-        mock_check_auth.return_value = True
-        mock_get_username.return_value = "testuser"
-
-        # Mock ConfigManager
-        mock_manager = MagicMock()
-        mock_config_manager.return_value = mock_manager
-        mock_manager.get_config.return_value = {
-            "github": {"username": "testuser", "github_token": "test_token"},
-            "preferences": {},
-        }
-        mock_manager.get_recent_mirrors.return_value = []
-        mock_manager.get_scanned_mirrors.return_value = []  # Mock empty scan cache
+        _stub_prerequisites(monkeypatch)
 
-        result = runner.invoke(app, ["update-mirrors"])
+        result = runner.invoke(app, ["update-mirrors", "--json"])
 
         assert result.exit_code == 0
-        # When cached mirrors is empty and scanned cache is also empty, it shows no mirrors found
-        assert "No mirror repositories found" in result.stdout
-
-    @patch("cli_git.commands.update_mirrors.check_gh_auth")
-    @patch("cli_git.commands.update_mirrors.ConfigManager")
-    @patch("cli_git.commands.update_mirrors.get_current_username")
-    @patch("cli_git.commands.update_mirrors.get_upstream_default_branch")
-    @patch("cli_git.commands.update_mirrors.add_repo_secret")
-    @patch("cli_git.commands.update_mirrors.update_workflow_file")
-    @patch("cli_git.commands.update_mirrors.subprocess.run")
-    @patch("cli_git.commands.update_mirrors.typer.prompt")
+        assert json.loads(result.stdout)["status"] == "no_mirrors"
+
     def test_update_specific_mirror(
         self,
-        mock_prompt,
-        mock_subprocess,
-        mock_update_workflow,
-        mock_add_secret,
-        mock_get_branch,
-        mock_get_username,
-        mock_config_manager,
-        mock_check_auth,
+        monkeypatch,
+        update_mirrors_env,
+        mirror_update_ops,
         runner,
     ):
         """Test updating a specific mirror repository."""
-        mock_check_auth.return_value = True
-        mock_get_username.return_value = "testuser"
-        mock_get_branch.return_value = "main"
-        mock_prompt.return_value = "https://github.com/upstream/repo"  # Provide upstream URL
-
-        # Mock ConfigManager
-        mock_manager = MagicMock()
-        mock_config_manager.return_value = mock_manager
-        mock_manager.get_config.return_value = {
-            "github": {
-                "username": "testuser",
-                "github_token": "test_token",
-                "slack_webhook_url": "https://hooks.slack.com/test",
-            },
-            "preferences": {},
-        }
-
-        # Mock subprocess for workflow check (returns 0 = workflow exists)
-        mock_subprocess.return_value.returncode = 0
+        mock_add_secrets = mirror_update_ops.add_repo_secrets
+        mock_update_workflow = mirror_update_ops.update_workflow_file
+        monkeypatch.setattr(
+            update_mirrors.typer,
+            "prompt",
+            lambda *args, **kwargs: "https://github.com/upstream/repo",
+        )
+
+        mock_manager = update_mirrors_env.manager
+        mock_manager.get_config.return_value = _config_with(
+            slack_webhook_url="https://hooks.slack.com/test"
+        )
 
         result = runner.invoke(app, ["update-mirrors", "--repo", "testuser/mirror-repo"])
 
@@ -128,45 +188,25 @@ class TestUpdateMirrorsCommand:
         assert "🔄 Updating testuser/mirror-repo..." in result.stdout
 
         # Verify secrets were updated (only GH_TOKEN and SLACK_WEBHOOK_URL since no upstream URL)
-        assert mock_add_secret.call_count == 2
+        mock_add_secrets.assert_called_once()
+        assert set(mock_add_secrets.call_args.args[1]) == {"GH_TOKEN", "SLACK_WEBHOOK_URL"}
 
         # Verify workflow was updated
         mock_update_workflow.assert_called_once()
 
-    @patch("cli_git.commands.update_mirrors.check_gh_auth")
-    @patch("cli_git.commands.update_mirrors.ConfigManager")
-    @patch("cli_git.commands.update_mirrors.get_current_username")
-    @patch("cli_git.commands.update_mirrors.add_repo_secret")
-    @patch("cli_git.commands.update_mirrors.update_workflow_file")
-    @patch("cli_git.commands.update_mirrors.subprocess.run")
     def test_update_specific_mirror_without_upstream(
         self,
-        mock_subprocess,
-        mock_update_workflow,
-        mock_add_secret,
-        mock_get_username,
-        mock_config_manager,
-        mock_check_auth,
+        update_mirrors_env,
+        mirror_update_ops,
         runner,
     ):
         """Test updating a specific mirror repository without upstream URL in cache."""
-        mock_check_auth.return_value = True
-        mock_get_username.return_value = "testuser"
-
-        # Mock ConfigManager
-        mock_manager = MagicMock()
-        mock_config_manager.return_value = mock_manager
-        mock_manager.get_config.return_value = {
-            "github": {
-                "username": "testuser",
-                "github_token": "test_token",
-                "slack_webhook_url": "https://hooks.slack.com/test",
-            },
-            "preferences": {},
-        }
-
-        # Mock subprocess for workflow check (returns 0 = workflow exists)
-        mock_subprocess.return_value.returncode = 0
+        mock_add_secrets = mirror_update_ops.add_repo_secrets
+        mock_update_workflow = mirror_update_ops.update_workflow_file
+        mock_manager = update_mirrors_env.manager
+        mock_manager.get_config.return_value = _config_with(
+            slack_webhook_url="https://hooks.slack.com/test"
+        )
 
         result = runner.invoke(app, ["update-mirrors", "--repo", "testuser/mirror-repo"])
 
@@ -177,41 +217,39 @@ class TestUpdateMirrorsCommand:
         assert "Preserving current upstream configuration" in result.stdout
 
         # Verify only GH_TOKEN and SLACK_WEBHOOK_URL were updated
-        assert mock_add_secret.call_count == 2
+        mock_add_secrets.assert_called_once()
+        assert set(mock_add_secrets.call_args.args[1]) == {"GH_TOKEN", "SLACK_WEBHOOK_URL"}
 
         # Verify workflow was updated
         mock_update_workflow.assert_called_once()
 
-    @patch("cli_git.commands.update_mirrors.check_gh_auth")
-    @patch("cli_git.commands.update_mirrors.ConfigManager")
-    @patch("cli_git.commands.update_mirrors.get_current_username")
-    @patch("cli_git.commands.update_mirrors.get_upstream_default_branch")
-    @patch("cli_git.commands.update_mirrors.add_repo_secret")
-    @patch("cli_git.commands.update_mirrors.update_workflow_file")
-    @patch("cli_git.commands.update_mirrors.subprocess.run")
+    def test_update_specific_mirror_json_summary(
+        self, update_mirrors_env, mirror_update_ops, runner
+    ):
+        """Test that --json prints only the summary on stdout."""
+        update_mirrors_env.manager.get_config.return_value = _BASE_CONFIG
+
+        result = runner.invoke(app, ["update-mirrors", "--repo", "testuser/mirror-repo", "-j"])
+
+        assert result.exit_code == 0
+        assert json.loads(result.stdout) == {
+            "status": "completed",
+            "updated": ["testuser/mirror-repo"],
+            "skipped": [],
+            "failed": [],
+        }
+        assert "🔄 Updating testuser/mirror-repo..." in result.stderr
+
     def test_update_all_mirrors_from_cache(
         self,
-        mock_subprocess,
-        mock_update_workflow,
-        mock_add_secret,
-        mock_get_branch,
-        mock_get_username,
-        mock_config_manager,
-        mock_check_auth,
+        monkeypatch,
+        update_mirrors_env,
+        mirror_update_ops,
         runner,
     ):
         """Test updating all mirrors from cache."""
-        mock_check_auth.return_value = True
-        mock_get_username.return_value = "testuser"
-        mock_get_branch.return_value = "main"
-
-        # Mock ConfigManager
-        mock_manager = MagicMock()
-        mock_config_manager.return_value = mock_manager
-        mock_manager.get_config.return_value = {
-            "github": {"username": "testuser", "github_token": "test_token"},
-            "preferences": {},
-        }
+        mock_manager = update_mirrors_env.manager
+        mock_manager.get_config.return_value = _BASE_CONFIG
         # Return None for scanned mirrors so it falls back to recent mirrors
         mock_manager.get_scanned_mirrors.return_value = None
         mock_manager.get_recent_mirrors.return_value = [
@@ -225,248 +263,230 @@ class TestUpdateMirrorsCommand:
             },
         ]
 
-        # Mock subprocess for workflow check (returns 0 = workflow exists)
-        mock_subprocess.return_value.returncode = 0
-
         # Simulate selecting all mirrors in interactive mode
-        with patch("cli_git.commands.update_mirrors.typer.prompt", return_value="1,2"):
-            result = runner.invoke(app, ["update-mirrors"])
+        monkeypatch.setattr(update_mirrors.typer, "prompt", lambda *args, **kwargs: "1,2")
+        result = runner.invoke(app, ["update-mirrors"])
 
         assert result.exit_code == 0
         # First shows the interactive menu, then update results
         assert "📋 Found mirror repositories:" in result.stdout
         assert "📊 Update complete: 2/2 mirrors updated successfully" in result.stdout
+        update_mirrors_env.get_repos_with_file.assert_called_once_with(
+            ["testuser/mirror-repo1", "testuser/mirror-repo2"],
+            ".github/workflows/mirror-sync.yml",
+        )
 
-    @patch("cli_git.commands.update_mirrors.check_gh_auth")
-    @patch("cli_git.commands.update_mirrors.ConfigManager")
-    @patch("cli_git.commands.update_mirrors.get_current_username")
-    @patch("cli_git.commands.update_mirrors.scan_for_mirrors")
-    def test_scan_for_mirrors_no_results(
-        self, mock_scan, mock_get_username, mock_config_manager, mock_check_auth, runner
+    def test_update_mirrors_batch_lookup_failure_checks_each_mirror(
+        self,
+        monkeypatch,
+        update_mirrors_env,
+        mirror_update_ops,
+        runner,
     ):
-        """Test scanning GitHub for mirrors when none found."""
-        mock_check_auth.return_value = True
-        mock_get_username.return_value = "testuser"
-
-        # Mock ConfigManager
-        mock_manager = MagicMock()
-        mock_config_manager.return_value = mock_manager
-        mock_manager.get_config.return_value = {
-            "github": {
-                "username": "testuser",
-                "github_token": "test_token",
-                "default_org": "testorg",
+        """Test that a failed batch workflow lookup only fails the affected mirrors."""
+        mock_manager = update_mirrors_env.manager
+        mock_manager.get_config.return_value = _BASE_CONFIG
+        mock_manager.get_scanned_mirrors.return_value = None
+        mock_manager.get_recent_mirrors.return_value = [
+            {
+                "upstream": "https://github.com/owner1/repo1",
+                "mirror": "https://github.com/testuser/mirror-repo1",
             },
-            "preferences": {},
-        }
-
-        # Mock scan results - no mirrors found
-        mock_scan.return_value = []
-        mock_manager.get_scanned_mirrors.return_value = None  # No cache
+            {
+                "upstream": "https://github.com/owner2/repo2",
+                "mirror": "https://github.com/testuser/mirror-repo2",
+            },
+        ]
 
-        # Test without verbose - should exit with no output for empty results
-        result = runner.invoke(app, ["update-mirrors", "--scan"])
-        assert result.exit_code == 0
-        assert result.stdout.strip() == ""  # No output for empty results
+        def lookup(repos, path):
+            if len(repos) > 1:
+                raise GitHubError("API rate limit exceeded")
+            if repos == ["testuser/mirror-repo2"]:
+                raise GitHubError("Resource not accessible")
+            return set(repos)
 
-        # Verify scan was called
-        mock_scan.assert_called_with("testuser", "testorg")
-        # Verify cache was saved
-        mock_manager.save_scanned_mirrors.assert_called_with([])
+        update_mirrors_env.get_repos_with_file.side_effect = lookup
 
-        # Reset mocks for second invocation
-        mock_scan.reset_mock()
-        mock_manager.save_scanned_mirrors.reset_mock()
+        monkeypatch.setattr(update_mirrors.typer, "prompt", lambda *args, **kwargs: "1,2")
+        result = runner.invoke(app, ["update-mirrors"])
 
-        # Test with verbose
-        result = runner.invoke(app, ["update-mirrors", "--scan", "--verbose"])
         assert result.exit_code == 0
-        assert "Scanning GitHub for mirror repositories" in result.stdout
-        # Since scan returns empty list, it should show "No mirror repositories found"
-        assert "No mirror repositories found" in result.stdout
-        assert "Make sure you have mirror repositories" in result.stdout
-
-        # Verify scan was called again
-        mock_scan.assert_called_once_with("testuser", "testorg")
-        # Verify cache was saved again
-        mock_manager.save_scanned_mirrors.assert_called_once_with([])
-
-    @patch("cli_git.commands.update_mirrors.check_gh_auth")
-    @patch("cli_git.commands.update_mirrors.ConfigManager")
-    @patch("cli_git.commands.update_mirrors.get_current_username")
-    @patch("cli_git.commands.update_mirrors.scan_for_mirrors")
-    def test_scan_for_mirrors_with_results(
-        self, mock_scan, mock_get_username, mock_config_manager, mock_check_auth, runner
+        assert "Could not check mirror workflows together" in result.stdout
+        assert "❌ Failed to update testuser/mirror-repo2" in result.stdout
+        assert "📊 Update complete: 1/2 mirrors updated successfully" in result.stdout
+
+    def test_update_mirror_sets_secrets_in_one_call(
+        self,
+        monkeypatch,
+        update_mirrors_env,
+        mirror_update_ops,
+        runner,
     ):
-        """Test scanning GitHub for mirrors when some are found."""
-        mock_check_auth.return_value = True
-        mock_get_username.return_value = "testuser"
-
-        # Mock ConfigManager
-        mock_manager = MagicMock()
-        mock_config_manager.return_value = mock_manager
-        mock_manager.get_config.return_value = {
-            "github": {
-                "username": "testuser",
-                "github_token": "test_token",
-                "default_org": "",
-            },
-            "preferences": {},
-        }
+        """Test that a mirror's secrets are set with a single batched call."""
+        mock_add_secrets = mirror_update_ops.add_repo_secrets
 
-        # Mock scan results - found some mirrors
-        mirrors = [
-            {
-                "name": "testuser/mirror-project1",
-                "mirror": "https://github.com/testuser/mirror-project1",
-                "upstream": "https://github.com/upstream/project1",
-                "description": "Mirror of project1",
-                "is_private": False,
-                "updated_at": "2025-01-01T12:00:00Z",
-            },
+        mock_manager = update_mirrors_env.manager
+        mock_manager.get_config.return_value = _BASE_CONFIG
+        mock_manager.get_scanned_mirrors.return_value = None
+        mock_manager.get_recent_mirrors.return_value = [
             {
-                "name": "testuser/mirror-project2",
-                "mirror": "https://github.com/testuser/mirror-project2",
-                "upstream": "",
-                "description": "",
-                "is_private": True,
-                "updated_at": "2025-01-02T12:00:00Z",
+                "upstream": "https://github.com/owner1/repo1",
+                "mirror": "https://github.com/testuser/mirror-repo1",
             },
         ]
-        mock_scan.return_value = mirrors
-        mock_manager.get_scanned_mirrors.return_value = None  # No cache
-
-        # Test without verbose - should output just repo names
-        result = runner.invoke(app, ["update-mirrors", "--scan"])
-        assert result.exit_code == 0
-        lines = result.stdout.strip().split("\n")
-        assert len(lines) == 2
-        assert lines[0] == "testuser/mirror-project1"
-        assert lines[1] == "testuser/mirror-project2"
 
-        # Reset mocks
-        mock_scan.reset_mock()
-        mock_manager.save_scanned_mirrors.reset_mock()
+        monkeypatch.setattr(update_mirrors.typer, "prompt", lambda *args, **kwargs: "1")
+        result = runner.invoke(app, ["update-mirrors"])
 
-        # Test with verbose
-        result = runner.invoke(app, ["update-mirrors", "--scan", "--verbose"])
         assert result.exit_code == 0
-        assert "Found 2 mirror repositories" in result.stdout
-        assert "testuser/mirror-project1" in result.stdout
-        assert "testuser/mirror-project2" in result.stdout
-        assert "Mirror of project1" in result.stdout
-        assert "🔒" in result.stdout  # Private repo indicator
-        assert "🌐" in result.stdout  # Public repo indicator
-        assert "To update these mirrors:" in result.stdout
-        assert "cli-git update-mirrors --scan | xargs" in result.stdout
-        assert "cli-git update-mirrors --repo" in result.stdout
-
-        # Verify scan was called
-        mock_scan.assert_called_once_with("testuser", "")
-        # Verify mirrors were saved to cache
-        mock_manager.save_scanned_mirrors.assert_called_once_with(mirrors)
-
-    @patch("cli_git.commands.update_mirrors.check_gh_auth")
-    @patch("cli_git.commands.update_mirrors.ConfigManager")
-    @patch("cli_git.commands.update_mirrors.get_current_username")
-    @patch("cli_git.commands.update_mirrors.scan_for_mirrors")
-    def test_scan_pipe_friendly_output(
-        self, mock_scan, mock_get_username, mock_config_manager, mock_check_auth, runner
+        assert "📊 Update complete: 1/1 mirrors updated successfully" in result.stdout
+        mock_add_secrets.assert_called_once()
+        repo_name, secrets = mock_add_secrets.call_args.args
+        assert repo_name == "testuser/mirror-repo1"
+        assert set(secrets) == {"UPSTREAM_URL", "UPSTREAM_DEFAULT_BRANCH", "GH_TOKEN"}
+
+    @pytest.mark.parametrize(
+        "cached, scanned, verbose, expected",
+        [
+            pytest.param(
+                _SCANNED_MIRRORS,
+                None,
+                True,
+                ["Using cached scan results", "Found 2 mirror repositories"],
+                id="cache_verbose",
+            ),
+            pytest.param(
+                None,
+                _SCANNED_MIRRORS,
+                True,
+                [
+                    "Scanning GitHub for mirror repositories",
+                    "Found 2 mirror repositories",
+                    "testuser/mirror-project1",
+                    "testuser/mirror-project2",
+                    "Mirror of project1",
+                    "🔒",
+                    "🌐",
+                    "To update these mirrors:",
+                    "cli-git update-mirrors --scan | xargs",
+                    "cli-git update-mirrors --repo",
+                ],
+                id="no_cache_verbose",
+            ),
+            pytest.param(
+                None,
+                [],
+                True,
+                ["No mirror repositories found", "Make sure you have mirror repositories"],
+                id="no_mirrors_verbose",
+            ),
+            pytest.param(
+                None,
+                _SCANNED_MIRRORS,
+                False,
+                ["testuser/mirror-project1", "testuser/mirror-project2"],
+                id="pipe_friendly",
+            ),
+            pytest.param(None, [], False, [], id="no_mirrors_pipe_friendly"),
+        ],
+    )
+    def test_scan_option(
+        self,
+        monkeypatch,
+        update_mirrors_env,
+        runner,
+        cached,
+        scanned,
+        verbose,
+        expected,
     ):
-        """Test scanning GitHub for mirrors with pipe-friendly output."""
-        mock_check_auth.return_value = True
-        mock_get_username.return_value = "testuser"
-
-        # Mock ConfigManager
-        mock_manager = MagicMock()
-        mock_config_manager.return_value = mock_manager
-        mock_manager.get_config.return_value = {
-            "github": {
-                "username": "testuser",
-                "github_token": "test_token",
-                "default_org": "",
-            },
-            "preferences": {},
-        }
+        """Test --scan output for cached, fresh and empty scan results."""
+        mock_scan = Mock(return_value=scanned)
+        monkeypatch.setattr(update_mirrors, "scan_for_mirrors", mock_scan)
+        monkeypatch.setattr(update_mirrors, "get_repo_list_etag", lambda: 'W/"abc123"')
 
-        # Mock scan results - found some mirrors
-        mirrors = [
-            {
-                "name": "testuser/mirror-project1",
-                "mirror": "https://github.com/testuser/mirror-project1",
-                "upstream": "https://github.com/upstream/project1",
-                "description": "Mirror of project1",
-                "is_private": False,
-                "updated_at": "2025-01-01T12:00:00Z",
-            },
-            {
-                "name": "testuser/mirror-project2",
-                "mirror": "https://github.com/testuser/mirror-project2",
-                "upstream": "",
-                "description": "",
-                "is_private": True,
-                "updated_at": "2025-01-02T12:00:00Z",
-            },
-        ]
-        mock_scan.return_value = mirrors
-        mock_manager.get_scanned_mirrors.return_value = None  # No cache
+        mock_manager = update_mirrors_env.manager
+        mock_manager.get_config.return_value = _config_with(default_org="testorg")
+        mock_manager.get_scanned_mirrors.return_value = cached
 
-        # Test without --verbose (pipe-friendly)
-        result = runner.invoke(app, ["update-mirrors", "--scan"])
+        result = runner.invoke(
+            app, ["update-mirrors", "--scan", *(["--verbose"] if verbose else [])]
+        )
 
         assert result.exit_code == 0
-        # Should output just the repo names, one per line
-        lines = result.stdout.strip().split("\n")
-        assert len(lines) == 2
-        assert lines[0] == "testuser/mirror-project1"
-        assert lines[1] == "testuser/mirror-project2"
-        # Should not contain descriptive text
-        assert "Found" not in result.stdout
-        assert "Scanning" not in result.stdout
-
-        # Test with --verbose
-        result = runner.invoke(app, ["update-mirrors", "--scan", "--verbose"])
+        if verbose:
+            for text in expected:
+                assert text in result.stdout
+        else:
+            # Pipe-friendly output is just the repo names, one per line
+            assert result.stdout.splitlines() == expected
+
+        if cached is None:
+            mock_scan.assert_called_once_with("testuser", "testorg")
+            mock_manager.save_scanned_mirrors.assert_called_once_with(scanned, etag='W/"abc123"')
+        else:
+            mock_scan.assert_not_called()
+            mock_manager.save_scanned_mirrors.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "mirror, expected, unexpected",
+        [
+            pytest.param(
+                {
+                    "name": "testuser/mirror-full",
+                    "is_private": True,
+                    "description": "Mirror of project",
+                    "upstream": "https://github.com/upstream/project",
+                    "updated_at": "2025-01-01T12:00:00Z",
+                },
+                [
+                    "🔒 testuser/mirror-full",
+                    "📝 Mirror of project",
+                    "🔗 Upstream: https://github.com/upstream/project",
+                    "🕐 Updated: 2025-01-01 12:00",
+                ],
+                [],
+                id="full",
+            ),
+            pytest.param(
+                {"name": "testuser/mirror-minimal", "is_private": False},
+                ["🌐 testuser/mirror-minimal", "🔗 Upstream: (configured via secrets)"],
+                ["📝", "🕐"],
+                id="minimal",
+            ),
+            pytest.param(
+                {"name": "testuser/mirror-bad-date", "updated_at": "invalid-date"},
+                ["🌐 testuser/mirror-bad-date"],
+                ["🕐"],
+                id="invalid_date",
+            ),
+        ],
+    )
+    def test_display_scan_results(self, capsys, mirror, expected, unexpected):
+        """Test the verbose scan listing for each combination of mirror fields."""
+        with pytest.raises(typer.Exit) as exc_info:
+            update_mirrors._display_scan_results([mirror])
+
+        assert exc_info.value.exit_code == 0
+        output = capsys.readouterr().out
+        assert "Found 1 mirror repositories" in output
+        for text in expected:
+            assert text in output
+        for text in unexpected:
+            assert text not in output
 
-        assert result.exit_code == 0
-        # Should contain descriptive output
-        assert "Found 2 mirror repositories" in result.stdout
-        assert "testuser/mirror-project1" in result.stdout
-        assert "Mirror of project1" in result.stdout
-        assert "To update these mirrors:" in result.stdout
-
-    @patch("cli_git.commands.update_mirrors.check_gh_auth")
-    @patch("cli_git.commands.update_mirrors.ConfigManager")
-    @patch("cli_git.commands.update_mirrors.get_current_username")
-    @patch("cli_git.commands.update_mirrors.get_upstream_default_branch")
-    @patch("cli_git.commands.update_mirrors.add_repo_secret")
-    @patch("cli_git.commands.update_mirrors.update_workflow_file")
-    @patch("cli_git.commands.update_mirrors.subprocess.run")
-    @patch("cli_git.commands.update_mirrors.typer.prompt")
     def test_interactive_mirror_selection(
         self,
-        mock_prompt,
-        mock_subprocess,
-        mock_update_workflow,
-        mock_add_secret,
-        mock_get_branch,
-        mock_get_username,
-        mock_config_manager,
-        mock_check_auth,
+        monkeypatch,
+        update_mirrors_env,
+        mirror_update_ops,
         runner,
     ):
         """Test interactive mirror selection."""
-        mock_check_auth.return_value = True
-        mock_get_username.return_value = "testuser"
-        mock_get_branch.return_value = "main"
-        mock_prompt.return_value = "1,2"  # Select first two mirrors
-
-        # Mock ConfigManager
-        mock_manager = MagicMock()
-        mock_config_manager.return_value = mock_manager
-        mock_manager.get_config.return_value = {
-            "github": {"username": "testuser", "github_token": "test_token"},
-            "preferences": {},
-        }
+        monkeypatch.setattr(update_mirrors.typer, "prompt", lambda *args, **kwargs: "1,2")
+
+        mock_manager = update_mirrors_env.manager
+        mock_manager.get_config.return_value = _BASE_CONFIG
         mock_manager.get_scanned_mirrors.return_value = None  # No scanned cache
         mock_manager.get_recent_mirrors.return_value = [
             {
@@ -483,45 +503,25 @@ class TestUpdateMirrorsCommand:
             },
         ]
 
-        # Mock subprocess for workflow check (returns 0 = workflow exists)
-        mock_subprocess.return_value.returncode = 0
-
         result = runner.invoke(app, ["update-mirrors"])
 
         assert result.exit_code == 0
         assert "📋 Found mirror repositories:" in result.stdout
         assert "📊 Update complete: 2/2 mirrors updated successfully" in result.stdout
 
-    @patch("cli_git.commands.update_mirrors.check_gh_auth")
-    @patch("cli_git.commands.update_mirrors.ConfigManager")
-    @patch("cli_git.commands.update_mirrors.get_current_username")
-    @patch("cli_git.commands.update_mirrors.get_upstream_default_branch")
-    @patch("cli_git.commands.update_mirrors.add_repo_secret")
-    @patch("cli_git.commands.update_mirrors.update_workflow_file")
-    @patch("cli_git.commands.update_mirrors.subprocess.run")
     def test_update_mirror_with_error(
         self,
-        mock_subprocess,
-        mock_update_workflow,
-        mock_add_secret,
-        mock_get_branch,
-        mock_get_username,
-        mock_config_manager,
-        mock_check_auth,
+        monkeypatch,
+        update_mirrors_env,
+        mirror_update_ops,
         runner,
     ):
         """Test handling errors during mirror update."""
-        mock_check_auth.return_value = True
-        mock_get_username.return_value = "testuser"
+        mock_get_branch = mirror_update_ops.get_upstream_default_branch
         mock_get_branch.side_effect = Exception("API error")
 
-        # Mock ConfigManager
-        mock_manager = MagicMock()
-        mock_config_manager.return_value = mock_manager
-        mock_manager.get_config.return_value = {
-            "github": {"username": "testuser", "github_token": "test_token"},
-            "preferences": {},
-        }
+        mock_manager = update_mirrors_env.manager
+        mock_manager.get_config.return_value = _BASE_CONFIG
         mock_manager.get_scanned_mirrors.return_value = None  # No scanned cache
         mock_manager.get_recent_mirrors.return_value = [
             {
@@ -530,12 +530,9 @@ class TestUpdateMirrorsCommand:
             }
         ]
 
-        # Mock subprocess for workflow check (returns 0 = workflow exists)
-        mock_subprocess.return_value.returncode = 0
-
         # Simulate selecting all mirrors in interactive mode
-        with patch("cli_git.commands.update_mirrors.typer.prompt", return_value="1"):
-            result = runner.invoke(app, ["update-mirrors"])
+        monkeypatch.setattr(update_mirrors.typer, "prompt", lambda *args, **kwargs: "1")
+        result = runner.invoke(app, ["update-mirrors"])
 
         assert result.exit_code == 0
         # First shows the interactive menu, then error
@@ -543,204 +540,152 @@ class TestUpdateMirrorsCommand:
         assert "❌ Unexpected error updating" in result.stdout
         assert "💡 For failed updates, you may need to:" in result.stdout
 
-    def test_update_workflow_file(self):
-        """Test the update_workflow_file function."""
-        from cli_git.commands.modules.workflow_updater import update_workflow_file
+    def test_update_workflow_file(self, mock_run):
+        """Test that a changed workflow is replaced with one contents API commit."""
+        current = {"content": base64.b64encode(b"old content").decode(), "sha": "abc123"}
+
+        mock_run.side_effect = [_cp(0, stdout=json.dumps(current)), _cp(0, stdout="{}")]
+
+        assert update_workflow_file("owner/repo", "workflow content") is True
+
+        # One GET for the current file, one PUT with the new content
+        assert mock_run.call_count == 2
+        put_args = mock_run.call_args_list[1]
+        assert put_args.args[0] == [
+            "gh",
+            "api",
+            "-X",
+            "PUT",
+            "repos/owner/repo/contents/.github/workflows/mirror-sync.yml",
+            "--input",
+            "-",
+        ]
+        assert all(c.kwargs["timeout"] == GH_TIMEOUT for c in mock_run.call_args_list)
+        body = json.loads(put_args.kwargs["input"])
+        assert base64.b64decode(body["content"]).decode() == "workflow content"
+        assert body["sha"] == "abc123"
 
-        with patch("subprocess.run") as mock_run:
-            # Mock getting current file (exists)
-            mock_run.return_value.returncode = 0
-            mock_run.return_value.stdout = json.dumps({"sha": "abc123"})
+    def test_scan_for_mirrors_function(self, monkeypatch, mock_run):
+        """Test the scan_for_mirrors function."""
+        monkeypatch.setattr(scan.typer, "echo", lambda *args, **kwargs: None)
+        # First call returns repo list with extended fields
+        repo_list = [
+            {
+                "nameWithOwner": "testuser/mirror-repo",
+                "url": "https://github.com/testuser/mirror-repo",
+                "description": "A mirror repository",
+                "isPrivate": False,
+                "updatedAt": "2025-01-01T12:00:00Z",
+                "object": {"text": "# UPSTREAM_URL: https://github.com/upstream/repo\n"},
+            },
+            {
+                "nameWithOwner": "testuser/regular-repo",
+                "url": "https://github.com/testuser/regular-repo",
+                "description": "A regular repository",
+                "isPrivate": True,
+                "updatedAt": "2025-01-02T12:00:00Z",
+                "object": None,  # regular-repo doesn't have workflow
+            },
+        ]
 
-            with patch("tempfile.TemporaryDirectory") as mock_tempdir:
-                with patch("os.chdir"):
-                    with patch("os.makedirs"):
-                        with patch("builtins.open", mock_open()) as mock_file:
-                            # Mock successful clone and push
-                            mock_run.return_value.returncode = 0
-                            mock_tempdir.return_value.__enter__.return_value = "/tmp/test"
+        mock_run.return_value = _cp(0, stdout=_jsonl(repo_list))
 
-                            # Test updating workflow
-                            update_workflow_file("owner/repo", "workflow content")
+        mirrors = scan.scan_for_mirrors("testuser")
 
-                            # Verify file was written
-                            mock_file.assert_called_once()
-                            mock_file().write.assert_called_once_with("workflow content")
+        assert len(mirrors) == 1
+        assert mirrors[0]["name"] == "testuser/mirror-repo"
+        assert mirrors[0]["description"] == "A mirror repository"
+        assert mirrors[0]["is_private"] is False
+        assert mirrors[0]["updated_at"] == "2025-01-01T12:00:00Z"
+        assert mirrors[0]["upstream"] == "https://github.com/upstream/repo"
+        # Listing and workflow lookup share a single request
+        assert mock_run.call_count == 1
 
-    def test_scan_for_mirrors_function(self):
-        """Test the scan_for_mirrors function."""
-        from cli_git.commands.modules.scan import scan_for_mirrors
-
-        with patch("subprocess.run") as mock_run:
-            with patch("cli_git.commands.modules.scan.typer.echo"):  # Mock echo to suppress output
-                # First call returns repo list with extended fields
-                repo_list = [
-                    {
-                        "nameWithOwner": "testuser/mirror-repo",
-                        "url": "https://github.com/testuser/mirror-repo",
-                        "description": "A mirror repository",
-                        "isPrivate": False,
-                        "updatedAt": "2025-01-01T12:00:00Z",
-                    },
-                    {
-                        "nameWithOwner": "testuser/regular-repo",
-                        "url": "https://github.com/testuser/regular-repo",
-                        "description": "A regular repository",
-                        "isPrivate": True,
-                        "updatedAt": "2025-01-02T12:00:00Z",
-                    },
-                ]
-
-                mock_run.side_effect = [
-                    MagicMock(returncode=0, stdout=json.dumps(repo_list)),  # repo list
-                    MagicMock(returncode=0),  # mirror-repo has workflow
-                    MagicMock(returncode=0, stdout=""),  # workflow content (empty for test)
-                    MagicMock(returncode=1),  # regular-repo doesn't have workflow
-                ]
-
-                mirrors = scan_for_mirrors("testuser")
-
-                assert len(mirrors) == 1
-                assert mirrors[0]["name"] == "testuser/mirror-repo"
-                assert mirrors[0]["description"] == "A mirror repository"
-                assert mirrors[0]["is_private"] is False
-                assert mirrors[0]["updated_at"] == "2025-01-01T12:00:00Z"
-
-    def test_scan_for_mirrors_function_with_org(self):
+    def test_scan_for_mirrors_function_with_org(self, monkeypatch, mock_run):
         """Test the scan_for_mirrors function with organization."""
-        from cli_git.commands.modules.scan import scan_for_mirrors
-
-        with patch("subprocess.run") as mock_run:
-            with patch("cli_git.commands.modules.scan.typer.echo"):  # Mock echo
-                # Mock for user repos
-                user_repos = [
-                    {
-                        "nameWithOwner": "testuser/mirror-personal",
-                        "url": "https://github.com/testuser/mirror-personal",
-                        "description": "Personal mirror",
-                        "isPrivate": False,
-                        "updatedAt": "2025-01-01T12:00:00Z",
-                    },
-                ]
-
-                # Mock for org repos
-                org_repos = [
-                    {
-                        "nameWithOwner": "testorg/mirror-shared",
-                        "url": "https://github.com/testorg/mirror-shared",
-                        "description": "Shared mirror",
-                        "isPrivate": True,
-                        "updatedAt": "2025-01-02T12:00:00Z",
-                    },
-                ]
-
-                mock_run.side_effect = [
-                    # User repos
-                    MagicMock(returncode=0, stdout=json.dumps(user_repos)),
-                    MagicMock(returncode=0),  # mirror-personal has workflow
-                    MagicMock(returncode=0, stdout=""),  # workflow content
-                    # Org repos
-                    MagicMock(returncode=0, stdout=json.dumps(org_repos)),
-                    MagicMock(returncode=0),  # mirror-shared has workflow
-                    MagicMock(returncode=0, stdout=""),  # workflow content
-                ]
-
-                mirrors = scan_for_mirrors("testuser", "testorg")
-
-                assert len(mirrors) == 2
-                assert any(m["name"] == "testuser/mirror-personal" for m in mirrors)
-                assert any(m["name"] == "testorg/mirror-shared" for m in mirrors)
-
-    def test_update_workflow_file_no_changes(self):
+        monkeypatch.setattr(scan.typer, "echo", lambda *args, **kwargs: None)
+        # Mock for user repos
+        user_repos = [
+            {
+                "nameWithOwner": "testuser/mirror-personal",
+                "url": "https://github.com/testuser/mirror-personal",
+                "description": "Personal mirror",
+                "isPrivate": False,
+                "updatedAt": "2025-01-01T12:00:00Z",
+                "object": {"text": ""},
+            },
+        ]
+
+        # Mock for org repos
+        org_repos = [
+            {
+                "nameWithOwner": "testorg/mirror-shared",
+                "url": "https://github.com/testorg/mirror-shared",
+                "description": "Shared mirror",
+                "isPrivate": True,
+                "updatedAt": "2025-01-02T12:00:00Z",
+                "object": {"text": ""},
+            },
+        ]
+
+        mock_run.side_effect = [
+            _cp(0, stdout=_jsonl(user_repos)),
+            _cp(0, stdout=_jsonl(org_repos)),
+        ]
+
+        mirrors = scan.scan_for_mirrors("testuser", "testorg")
+
+        assert len(mirrors) == 2
+        assert any(m["name"] == "testuser/mirror-personal" for m in mirrors)
+        assert any(m["name"] == "testorg/mirror-shared" for m in mirrors)
+
+    def test_update_workflow_file_no_changes(self, mock_run):
         """Test update_workflow_file when content hasn't changed."""
-        from cli_git.commands.modules.workflow_updater import update_workflow_file
-
-        with patch("subprocess.run") as mock_run:
-            with patch("tempfile.TemporaryDirectory") as mock_tempdir:
-                with patch("os.chdir"):
-                    with patch("os.makedirs"):
-                        with patch("os.path.exists", return_value=True):
-                            with patch(
-                                "builtins.open", mock_open(read_data="existing content")
-                            ) as mock_file:
-                                # Mock successful clone
-                                mock_run.return_value.returncode = 0
-                                mock_tempdir.return_value.__enter__.return_value = "/tmp/test"
-
-                                # Test updating workflow with same content
-                                result = update_workflow_file("owner/repo", "existing content")
-
-                                # Should return False (no changes)
-                                assert result is False
-
-                                # Verify file was read to compare
-                                mock_file.assert_called()
-
-                                # Verify no git commands were run after clone
-                                # Only clone command should have been called
-                                assert mock_run.call_count == 1
-
-    def test_update_workflow_file_with_changes(self):
-        """Test update_workflow_file when content has changed."""
-        from cli_git.commands.modules.workflow_updater import update_workflow_file
-
-        with patch("subprocess.run") as mock_run:
-            with patch("tempfile.TemporaryDirectory") as mock_tempdir:
-                with patch("os.chdir"):
-                    with patch("os.makedirs"):
-                        with patch("os.path.exists", return_value=True):
-                            with patch(
-                                "builtins.open", mock_open(read_data="old content")
-                            ) as mock_file:
-                                # Mock all git commands to succeed
-                                mock_run.return_value.returncode = 0
-                                mock_tempdir.return_value.__enter__.return_value = "/tmp/test"
-
-                                # Test updating workflow with new content
-                                result = update_workflow_file("owner/repo", "new content")
-
-                                # Should return True (changes made)
-                                assert result is True
-
-                                # Verify git commands were called
-                                # Should have: clone, add, commit, push
-                                assert mock_run.call_count >= 4
-
-                                # Verify file was written
-                                handle = mock_file()
-                                handle.write.assert_called_with("new content")
-
-    def test_update_workflow_file_clone_failure(self):
-        """Test update_workflow_file when clone fails."""
-        from cli_git.commands.modules.workflow_updater import update_workflow_file
-        from cli_git.utils.gh import GitHubError
-
-        with patch("subprocess.run") as mock_run:
-            with patch("tempfile.TemporaryDirectory") as mock_tempdir:
-                # Mock clone failure
-                mock_run.side_effect = [
-                    MagicMock(returncode=1, stderr="Clone failed"),  # First clone attempt
-                    MagicMock(returncode=1, stderr="Clone failed"),  # Second clone attempt with gh
-                ]
-                mock_tempdir.return_value.__enter__.return_value = "/tmp/test"
-
-                # Test updating workflow
-                with pytest.raises(GitHubError) as exc_info:
-                    update_workflow_file("owner/repo", "new content")
-
-                assert "Failed to clone repository" in str(exc_info.value)
-
-    def test_get_repo_secret_value(self):
-        """Test get_repo_secret_value function."""
-        from cli_git.commands.modules.workflow_updater import get_repo_secret_value
+        current = {"content": base64.b64encode(b"existing content").decode(), "sha": "abc123"}
+
+        mock_run.return_value = _cp(0, stdout=json.dumps(current))
+
+        # Should return False (no changes) without writing
+        assert update_workflow_file("owner/repo", "existing content") is False
+        assert mock_run.call_count == 1
+
+    def test_update_workflow_file_missing(self, mock_run):
+        """Test that a missing workflow file is created without a SHA."""
+        mock_run.side_effect = [
+            _cp(1, stderr="gh: Not Found (HTTP 404)"),
+            _cp(0, stdout="{}"),
+        ]
+
+        assert update_workflow_file("owner/repo", "new content") is True
+
+        body = json.loads(mock_run.call_args_list[1].kwargs["input"])
+        assert "sha" not in body
 
-        with patch("subprocess.run") as mock_run:
-            # Test non-UPSTREAM_URL secret
-            result = get_repo_secret_value("owner/repo", "GH_TOKEN")
-            assert result is None
+    def test_update_workflow_file_read_failure(self, mock_run):
+        """Test update_workflow_file when the current file cannot be read."""
+        mock_run.return_value = _cp(1, stderr="gh: Forbidden (HTTP 403)")
 
-            # Test UPSTREAM_URL with workflow content
-            workflow_content = """
+        with pytest.raises(GitHubError, match="Failed to read"):
+            update_workflow_file("owner/repo", "new content")
+
+    def test_create_mirrorkeep_if_missing(self, mock_run):
+        """Test that a missing .mirrorkeep is created through the contents API."""
+        mock_run.side_effect = [_cp(1, stderr="gh: Not Found (HTTP 404)"), _cp(0)]
+
+        assert create_mirrorkeep_if_missing("owner/repo") is True
+
+        put_args = mock_run.call_args_list[1]
+        assert "repos/owner/repo/contents/.mirrorkeep" in put_args.args[0]
+        assert "content" in json.loads(put_args.kwargs["input"])
+
+    def test_get_repo_secret_value(self, mock_run):
+        """Test get_repo_secret_value function."""
+        # Test non-UPSTREAM_URL secret
+        result = get_repo_secret_value("owner/repo", "GH_TOKEN")
+        assert result is None
+
+        # Test UPSTREAM_URL with workflow content
+        workflow_content = """
 name: Mirror Sync
 on:
   schedule:
@@ -748,134 +693,73 @@ on:
 env:
   UPSTREAM_URL: ${{ secrets.UPSTREAM_URL }}  # UPSTREAM_URL: https://github.com/upstream/repo
 """
-            import base64
+        encoded_content = base64.b64encode(workflow_content.encode()).decode()
 
-            encoded_content = base64.b64encode(workflow_content.encode()).decode()
+        mock_run.return_value = _cp(0, stdout=encoded_content + "\n")
 
-            mock_run.return_value = MagicMock(returncode=0, stdout=encoded_content + "\n")
+        result = get_repo_secret_value("owner/repo", "UPSTREAM_URL")
+        assert result == "https://github.com/upstream/repo"
 
-            result = get_repo_secret_value("owner/repo", "UPSTREAM_URL")
-            assert result == "https://github.com/upstream/repo"
-
-            # Test UPSTREAM_URL when secret is used but no comment
-            workflow_content2 = """
+        # Test UPSTREAM_URL when secret is used but no comment
+        workflow_content2 = """
 name: Mirror Sync
 env:
   UPSTREAM_URL: ${{ secrets.UPSTREAM_URL }}
 """
-            encoded_content2 = base64.b64encode(workflow_content2.encode()).decode()
-            mock_run.return_value.stdout = encoded_content2 + "\n"
-
-            result = get_repo_secret_value("owner/repo", "UPSTREAM_URL")
-            assert result == ""  # Empty string indicates it's a mirror
-
-            # Test when API call fails
-            mock_run.side_effect = Exception("API error")
-            result = get_repo_secret_value("owner/repo", "UPSTREAM_URL")
-            assert result is None
-
-    @patch("cli_git.commands.update_mirrors.check_gh_auth")
-    @patch("cli_git.commands.update_mirrors.ConfigManager")
-    @patch("cli_git.commands.update_mirrors.get_current_username")
-    @patch("cli_git.commands.update_mirrors.get_upstream_default_branch")
-    @patch("cli_git.commands.update_mirrors.add_repo_secret")
-    @patch("cli_git.commands.update_mirrors.update_workflow_file")
-    @patch("cli_git.commands.update_mirrors.subprocess.run")
+        encoded_content2 = base64.b64encode(workflow_content2.encode()).decode()
+        mock_run.return_value.stdout = encoded_content2 + "\n"
+
+        result = get_repo_secret_value("owner/repo", "UPSTREAM_URL")
+        assert result == ""  # Empty string indicates it's a mirror
+
+        # Test when API call fails
+        mock_run.side_effect = Exception("API error")
+        result = get_repo_secret_value("owner/repo", "UPSTREAM_URL")
+        assert result is None
+
     def test_update_mirror_creates_mirrorkeep(
         self,
-        mock_subprocess,
-        mock_update_workflow,
-        mock_add_secret,
-        mock_get_branch,
-        mock_get_username,
-        mock_config_manager,
-        mock_check_auth,
+        update_mirrors_env,
+        mirror_update_ops,
         runner,
     ):
         """Test that update-mirrors creates .mirrorkeep file if missing."""
-        mock_check_auth.return_value = True
-        mock_get_username.return_value = "testuser"
-        mock_get_branch.return_value = "main"
-
-        # Mock ConfigManager
-        mock_manager = MagicMock()
-        mock_config_manager.return_value = mock_manager
-        mock_manager.get_config.return_value = {
-            "github": {
-                "username": "testuser",
-                "github_token": "test_token",
-                "slack_webhook_url": "",
-            },
-            "preferences": {},
-        }
+        mock_manager = update_mirrors_env.manager
+        mock_manager.get_config.return_value = _config_with(slack_webhook_url="")
 
-        # Mock subprocess for workflow check (returns 0 = workflow exists)
-        mock_subprocess.return_value.returncode = 0
+        # Simulate .mirrorkeep not existing initially
+        mock_create_mirrorkeep = mirror_update_ops.create_mirrorkeep_if_missing
+        mock_create_mirrorkeep.return_value = True  # File was created
 
-        # Mock to simulate .mirrorkeep doesn't exist initially
-        with patch(
-            "cli_git.commands.update_mirrors.create_mirrorkeep_if_missing"
-        ) as mock_create_mirrorkeep:
-            mock_create_mirrorkeep.return_value = True  # File was created
-
-            result = runner.invoke(app, ["update-mirrors", "--repo", "testuser/mirror-repo"])
+        result = runner.invoke(app, ["update-mirrors", "--repo", "testuser/mirror-repo"])
 
-            # Verify the command succeeded
-            assert result.exit_code == 0
-            assert "🔄 Updating testuser/mirror-repo..." in result.stdout
+        # Verify the command succeeded
+        assert result.exit_code == 0
+        assert "🔄 Updating testuser/mirror-repo..." in result.stdout
+        assert "✓ Created .mirrorkeep file" in result.stdout
 
-            # Verify mirrorkeep creation was attempted
-            mock_create_mirrorkeep.assert_called_once()
+        # Verify mirrorkeep creation was attempted
+        mock_create_mirrorkeep.assert_called_once()
 
-    @patch("cli_git.commands.update_mirrors.check_gh_auth")
-    @patch("cli_git.commands.update_mirrors.ConfigManager")
-    @patch("cli_git.commands.update_mirrors.get_current_username")
-    @patch("cli_git.commands.update_mirrors.get_upstream_default_branch")
-    @patch("cli_git.commands.update_mirrors.add_repo_secret")
-    @patch("cli_git.commands.update_mirrors.update_workflow_file")
-    @patch("cli_git.commands.update_mirrors.subprocess.run")
     def test_update_mirror_preserves_existing_mirrorkeep(
         self,
-        mock_subprocess,
-        mock_update_workflow,
-        mock_add_secret,
-        mock_get_branch,
-        mock_get_username,
-        mock_config_manager,
-        mock_check_auth,
+        update_mirrors_env,
+        mirror_update_ops,
         runner,
     ):
         """Test that update-mirrors preserves existing .mirrorkeep file."""
-        mock_check_auth.return_value = True
-        mock_get_username.return_value = "testuser"
-        mock_get_branch.return_value = "main"
-
-        # Mock ConfigManager
-        mock_manager = MagicMock()
-        mock_config_manager.return_value = mock_manager
-        mock_manager.get_config.return_value = {
-            "github": {
-                "username": "testuser",
-                "github_token": "test_token",
-                "slack_webhook_url": "",
-            },
-            "preferences": {},
-        }
-
-        # Mock subprocess for workflow check (returns 0 = workflow exists)
-        mock_subprocess.return_value.returncode = 0
+        mock_manager = update_mirrors_env.manager
+        mock_manager.get_config.return_value = _config_with(slack_webhook_url="")
 
-        # Mock to simulate .mirrorkeep already exists
-        with patch(
-            "cli_git.commands.update_mirrors.create_mirrorkeep_if_missing"
-        ) as mock_create_mirrorkeep:
-            mock_create_mirrorkeep.return_value = False  # File already exists
+        # .mirrorkeep already exists (fixture default)
+        mock_create_mirrorkeep = mirror_update_ops.create_mirrorkeep_if_missing
 
-            result = runner.invoke(app, ["update-mirrors", "--repo", "testuser/mirror-repo"])
+        result = runner.invoke(app, ["update-mirrors", "--repo", "testuser/mirror-repo"])
 
-            # Verify the command succeeded
-            assert result.exit_code == 0
-            assert "🔄 Updating testuser/mirror-repo..." in result.stdout
+        # Verify the command succeeded
+        assert result.exit_code == 0
+        assert "🔄 Updating testuser/mirror-repo..." in result.stdout
+        assert "✓ .mirrorkeep file already exists" in result.stdout
 
-            # Verify mirrorkeep creation was attempted but file already existed
-            mock_create_mirrorkeep.assert_called_once()
+        # Verify mirrorkeep creation was attempted but file already existed
+        mock_create_mirrorkeep.assert_called_once()
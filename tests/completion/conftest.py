@@ -0,0 +1,36 @@
+"""Shared fixtures for completion tests."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from cli_git.completion import completers
+from cli_git.utils.config import ConfigManager
+
+
+@pytest.fixture
+def config_manager(monkeypatch):
+    """Replace the completers' ConfigManager with an empty-cache instance mock.
+
+    Returns:
+        The ConfigManager instance mock, with no default org, no recent or
+        scanned mirrors and no repository completion cache
+    """
+    manager = MagicMock(spec_set=ConfigManager)
+    manager.get_config = lambda: {"github": {"default_org": ""}, "preferences": {}}
+    manager.get_recent_mirrors = lambda: []
+    manager.get_scanned_mirrors.return_value = None
+    manager.get_repo_completion_cache.return_value = None
+    monkeypatch.setattr(completers, "ConfigManager", lambda: manager)
+    return manager
+
+
+@pytest.fixture
+def github_user(monkeypatch):
+    """Report "testuser" as the authenticated GitHub user.
+
+    Returns:
+        The stubbed username
+    """
+    monkeypatch.setattr(completers, "get_current_username", lambda: "testuser")
+    return "testuser"
@@ -4,7 +4,7 @@ import pytest
 from typer.testing import CliRunner
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def runner():
     """Provide a CLI runner for testing."""
-    return CliRunner()
+    return CliRunner(mix_stderr=False)
@@ -3,7 +3,10 @@
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
+import pytest
+
 from cli_git.core.mirrorkeep import (
+    compile_patterns,
     create_default_mirrorkeep,
     get_files_to_preserve,
     match_pattern,
@@ -118,7 +121,8 @@ class TestPatternMatching:
 
     def test_match_with_exclusions(self):
         """Test matching with exclusion patterns."""
-        patterns = ["*.md", "!README.md", ".docs/", "!.docs/temp/"]
+        # Compiled once and reused for every check
+        patterns = compile_patterns(["*.md", "!README.md", ".docs/", "!.docs/temp/"])
 
         # Included files
         assert match_pattern("CLAUDE.md", patterns) is True
@@ -130,67 +134,80 @@ class TestPatternMatching:
 
     def test_match_priority(self):
         """Test that exclusions take priority over inclusions."""
-        patterns = ["*.log", "!error.log", "logs/", "!logs/debug/"]
+        # Compiled once and reused for every check
+        patterns = compile_patterns(["*.log", "!error.log", "logs/", "!logs/debug/"])
 
         assert match_pattern("app.log", patterns) is True
         assert match_pattern("error.log", patterns) is False
         assert match_pattern("logs/app.log", patterns) is True
         assert match_pattern("logs/debug/trace.log", patterns) is False
 
+    def test_compile_patterns(self):
+        """Test that patterns are compiled once into (is_exclusion, regex) pairs."""
+        compiled = compile_patterns(["docs/**/*.md", "!docs/*.tmp"])
+
+        assert [is_exclusion for is_exclusion, _ in compiled.patterns] == [False, True]
+        assert compiled.patterns[0][1].match("docs/api/reference.md")
+        assert not compiled.patterns[0][1].match("docs/api/reference.mdx")
+        assert compiled.patterns[1][1].match("docs/draft.tmp")
+        # Identical pattern lists share the compiled result, and identical
+        # patterns reuse the same regex
+        assert compile_patterns(["docs/**/*.md", "!docs/*.tmp"]) is compiled
+        assert compile_patterns(["docs/**/*.md"]).patterns[0][1] is compiled.patterns[0][1]
+
 
 class TestFilePreservation:
     """Test file preservation logic."""
 
-    def test_get_files_to_preserve(self):
+    @pytest.fixture(scope="class")
+    def tree(self, tmp_path_factory):
+        """Build one read-only sample tree shared by the preservation tests."""
+        root = tmp_path_factory.mktemp("preserve")
+        for relative in (
+            "CLAUDE.md",
+            "README.md",
+            ".docs/guide.md",
+            ".docs/temp/draft.md",
+            "src/main.py",
+            "docs/guide.md",
+            "test.py",
+        ):
+            path = root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"# {path.stem}")
+        return root
+
+    def test_get_files_to_preserve(self, tree):
         """Test getting list of files to preserve."""
-        with TemporaryDirectory() as tmpdir:
-            root = Path(tmpdir)
+        patterns = ["CLAUDE.md", ".docs/", "!.docs/temp/"]
+        files = get_files_to_preserve(tree, patterns)
 
-            # Create test files
-            (root / "CLAUDE.md").write_text("# Claude")
-            (root / "README.md").write_text("# Readme")
-            (root / ".docs").mkdir()
-            (root / ".docs" / "guide.md").write_text("# Guide")
-            (root / ".docs" / "temp").mkdir()
-            (root / ".docs" / "temp" / "draft.md").write_text("# Draft")
-            (root / "src").mkdir()
-            (root / "src" / "main.py").write_text("print('hello')")
+        # Convert to relative paths for easier testing
+        relative_files = {f.relative_to(tree) for f in files}
 
-            # Test with patterns
-            patterns = ["CLAUDE.md", ".docs/", "!.docs/temp/"]
-            files = get_files_to_preserve(root, patterns)
+        assert Path("CLAUDE.md") in relative_files
+        assert Path(".docs/guide.md") in relative_files
+        assert Path(".docs/temp/draft.md") not in relative_files
+        assert Path("README.md") not in relative_files
+        assert Path("src/main.py") not in relative_files
 
-            # Convert to relative paths for easier testing
-            relative_files = sorted([f.relative_to(root) for f in files])
-
-            assert Path("CLAUDE.md") in relative_files
-            assert Path(".docs/guide.md") in relative_files
-            assert Path(".docs/temp/draft.md") not in relative_files
-            assert Path("README.md") not in relative_files
-            assert Path("src/main.py") not in relative_files
-
-    def test_get_files_with_wildcards(self):
+    def test_get_files_with_wildcards(self, tree):
         """Test file preservation with wildcard patterns."""
-        with TemporaryDirectory() as tmpdir:
-            root = Path(tmpdir)
+        patterns = ["*.md", "!README.md"]
+        files = get_files_to_preserve(tree, patterns)
 
-            # Create test files
-            (root / "README.md").write_text("# Readme")
-            (root / "CLAUDE.md").write_text("# Claude")
-            (root / "docs").mkdir()
-            (root / "docs" / "guide.md").write_text("# Guide")
-            (root / "test.py").write_text("print('test')")
+        relative_files = {f.relative_to(tree) for f in files}
 
-            # Test with wildcard patterns
-            patterns = ["*.md", "!README.md"]
-            files = get_files_to_preserve(root, patterns)
+        assert Path("CLAUDE.md") in relative_files
+        assert Path("README.md") not in relative_files
+        assert Path("docs/guide.md") not in relative_files  # *.md doesn't match subdirs
+        assert Path("test.py") not in relative_files
 
-            relative_files = sorted([f.relative_to(root) for f in files])
+    def test_get_files_skips_excluded_directories(self, tree):
+        """Test that files under an excluded directory are not preserved."""
+        files = get_files_to_preserve(tree, ["CLAUDE.md", ".docs/", "!.docs/temp/"])
 
-            assert Path("CLAUDE.md") in relative_files
-            assert Path("README.md") not in relative_files
-            assert Path("docs/guide.md") not in relative_files  # *.md doesn't match subdirs
-            assert Path("test.py") not in relative_files
+        assert files == {tree / ".docs" / "guide.md", tree / "CLAUDE.md"}
 
 
 class TestDefaultMirrorkeep:
@@ -231,8 +248,8 @@ class TestEdgeCases:
             patterns = ["non-existent.txt", "missing-dir/", "*.xyz"]
             files = get_files_to_preserve(root, patterns)
 
-            # Should return empty list, not raise error
-            assert files == []
+            # Should return empty set, not raise error
+            assert files == set()
 
     def test_mixed_existing_nonexistent_patterns(self):
         """Test mix of existing and non-existing patterns."""
@@ -253,7 +270,7 @@ class TestEdgeCases:
             files = get_files_to_preserve(root, patterns)
 
             # Should only return existing files
-            relative_files = sorted([f.relative_to(root) for f in files])
+            relative_files = {f.relative_to(root) for f in files}
             assert Path("CLAUDE.md") in relative_files
             assert Path("README.md") in relative_files
             assert len(relative_files) == 2
@@ -274,14 +291,14 @@ class TestEdgeCases:
             # Test specific file in subdirectory
             patterns = [".github/workflows/mirror-sync.yml"]
             files = get_files_to_preserve(root, patterns)
-            relative_files = [f.relative_to(root) for f in files]
+            relative_files = {f.relative_to(root) for f in files}
             assert Path(".github/workflows/mirror-sync.yml") in relative_files
             assert len(relative_files) == 1
 
             # Test directory pattern
             patterns = [".github/"]
             files = get_files_to_preserve(root, patterns)
-            relative_files = [f.relative_to(root) for f in files]
+            relative_files = {f.relative_to(root) for f in files}
             assert Path(".github/workflows/mirror-sync.yml") in relative_files
             assert Path(".github/workflows/test.yml") in relative_files
             assert Path(".github/ISSUE_TEMPLATE/bug.md") in relative_files
@@ -314,7 +331,7 @@ class TestEdgeCases:
             files = get_files_to_preserve(root, patterns)
 
             # Empty directory should result in no files
-            assert files == []
+            assert files == set()
 
     def test_pattern_with_special_characters(self):
         """Test patterns with special characters in filenames."""
@@ -329,7 +346,7 @@ class TestEdgeCases:
             patterns = ["file-with-dash.txt", "file_with_underscore.txt", "file.with.dots.txt"]
             files = get_files_to_preserve(root, patterns)
 
-            relative_files = [f.relative_to(root) for f in files]
+            relative_files = {f.relative_to(root) for f in files}
             assert Path("file-with-dash.txt") in relative_files
             assert Path("file_with_underscore.txt") in relative_files
             assert Path("file.with.dots.txt") in relative_files
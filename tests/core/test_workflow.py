@@ -1,23 +1,89 @@
 """Tests for GitHub Actions workflow generation."""
 
+import re
+
+import pytest
 import yaml
 
 from cli_git.core.workflow import generate_sync_workflow
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_UPSTREAM_URL = "https://github.com/owner/repo"
+
+
+_REQUIRED_SYNC_COMMANDS = frozenset(
+    {
+        b"git config user.name",
+        b"git config user.email",
+        b"git remote add upstream $UPSTREAM_URL",
+        b"git fetch upstream",
+        b"git reset --hard upstream/$DEFAULT_BRANCH",
+        b"git push origin $CURRENT_BRANCH --force",
+        b"git push origin --tags",
+        b"GH_TOKEN",
+    }
+)
+
+_TAG_SYNC_GH_TOKEN = re.compile(
+    rb"- name: Sync tags[\s\S]*?GH_TOKEN: \$\{\{ secrets\.GH_TOKEN \}\}"
+)
+
+
+def _missing(required, text):
+    """Return the required substrings absent from text, found in a single regex pass."""
+    # Longest first so a substring never shadows a longer one at the same position
+    alternation = b"|".join(map(re.escape, sorted(required, key=len, reverse=True)))
+    return set(required) - set(re.findall(alternation, text))
+
+
+@pytest.fixture(scope="module")
+def workflow_text():
+    """Workflow YAML text for the common arguments, rendered once per module."""
+    return generate_sync_workflow(
+        upstream_url=_UPSTREAM_URL,
+        schedule="0 0 * * *",
+        upstream_default_branch="main",
+    )
+
+
+@pytest.fixture(scope="module")
+def workflow_parsed(workflow_text):
+    """Parsed workflow, only for tests that inspect its structure."""
+    return yaml.load(workflow_text, Loader=_Loader)
+
+
+@pytest.fixture(scope="module")
+def workflow_bytes(workflow_text):
+    """UTF-8 encoded workflow, so substring checks scan one byte per character.
+
+    The template contains non-ASCII text, which makes the str form wider.
+    """
+    return workflow_text.encode()
+
+
+@pytest.fixture(scope="module", params=["0 0 * * *", "0 */6 * * *"], ids=["daily", "every_6h"])
+def scheduled_workflow(request):
+    """Render and parse the workflow once per schedule.
+
+    Returns:
+        Tuple of (schedule, parsed workflow)
+    """
+    workflow_yaml = generate_sync_workflow(
+        upstream_url=_UPSTREAM_URL,
+        schedule=request.param,
+        upstream_default_branch="main",
+    )
+    return request.param, yaml.load(workflow_yaml, Loader=_Loader)
+
 
 class TestWorkflow:
     """Test cases for workflow generation."""
 
-    def test_generate_sync_workflow_basic(self):
+    def test_generate_sync_workflow_basic(self, workflow_parsed):
         """Test basic workflow generation."""
-        workflow_yaml = generate_sync_workflow(
-            upstream_url="https://github.com/owner/repo",
-            schedule="0 0 * * *",
-            upstream_default_branch="main",
-        )
-
-        # Parse YAML
-        workflow = yaml.safe_load(workflow_yaml)
+        workflow = workflow_parsed
 
         # Check basic structure
         assert workflow["name"] == "Mirror Sync"
@@ -53,156 +119,87 @@ class TestWorkflow:
             sync_step["env"]["UPSTREAM_DEFAULT_BRANCH"] == "${{ secrets.UPSTREAM_DEFAULT_BRANCH }}"
         )
 
-    def test_generate_sync_workflow_custom_schedule(self):
+    def test_generate_sync_workflow_custom_schedule(self, scheduled_workflow):
         """Test workflow generation with custom schedule."""
-        workflow_yaml = generate_sync_workflow(
-            upstream_url="https://github.com/owner/repo",
-            schedule="0 */6 * * *",  # Every 6 hours
-            upstream_default_branch="main",
-        )
-
-        workflow = yaml.safe_load(workflow_yaml)
-        assert workflow["on"]["schedule"][0]["cron"] == "0 */6 * * *"
+        schedule, workflow = scheduled_workflow
+        assert workflow["on"]["schedule"][0]["cron"] == schedule
 
-    def test_sync_script_content(self):
+    def test_sync_script_content(self, workflow_bytes):
         """Test that sync script contains correct commands."""
-        workflow_yaml = generate_sync_workflow(
-            upstream_url="https://github.com/owner/repo",
-            schedule="0 0 * * *",
-            upstream_default_branch="main",
-        )
-
         # Check for important commands in the script
-        assert "git config user.name" in workflow_yaml
-        assert "git config user.email" in workflow_yaml
-        assert "git remote add upstream $UPSTREAM_URL" in workflow_yaml
-        assert "git fetch upstream" in workflow_yaml
-        assert "git reset --hard upstream/$DEFAULT_BRANCH" in workflow_yaml
-        assert "git push origin $CURRENT_BRANCH --force" in workflow_yaml
-        assert "git push origin --tags" in workflow_yaml
-        assert "GH_TOKEN" in workflow_yaml
-
-    def test_no_conflict_with_reset(self):
-        """Test that reset approach doesn't have conflict handling."""
-        workflow_yaml = generate_sync_workflow(
-            upstream_url="https://github.com/owner/repo",
-            schedule="0 0 * * *",
-            upstream_default_branch="main",
-        )
+        assert _missing(_REQUIRED_SYNC_COMMANDS, workflow_bytes) == set()
 
+    def test_no_conflict_with_reset(self, workflow_bytes):
+        """Test that reset approach doesn't have conflict handling."""
         # Check that conflict handling is removed
-        assert "has_conflicts=true" not in workflow_yaml
-        assert "has_conflicts=false" in workflow_yaml  # Always false with reset
-        assert "gh pr create" not in workflow_yaml
-        assert "notify-slack-conflict" not in workflow_yaml
+        assert b"has_conflicts=true" not in workflow_bytes
+        assert b"has_conflicts=false" in workflow_bytes  # Always false with reset
+        assert b"gh pr create" not in workflow_bytes
+        assert b"notify-slack-conflict" not in workflow_bytes
         # But failure notification should still exist
-        assert "notify-slack-failure" in workflow_yaml
+        assert b"notify-slack-failure" in workflow_bytes
 
-    def test_gh_token_configuration(self):
+    def test_gh_token_configuration(self, workflow_bytes):
         """Test that GH_TOKEN is properly configured for tag syncing."""
-        workflow_yaml = generate_sync_workflow(
-            upstream_url="https://github.com/owner/repo",
-            schedule="0 0 * * *",
-            upstream_default_branch="main",
-        )
+        # GH_TOKEN must be set in the env of the Sync tags step
+        match = _TAG_SYNC_GH_TOKEN.search(workflow_bytes)
+        assert match is not None, "GH_TOKEN environment variable not found in tag sync"
+        assert b'if [ -n "$GH_TOKEN" ]; then' in workflow_bytes
+        assert b"x-access-token:${GH_TOKEN}@github.com" in workflow_bytes
 
-        # Check GH_TOKEN usage in tag sync
-        lines = workflow_yaml.split("\n")
-
-        # Find the Sync tags section
-        tag_sync_found = False
-        gh_token_env_found = False
-        for i, line in enumerate(lines):
-            if "- name: Sync tags" in line:
-                tag_sync_found = True
-            if tag_sync_found and "GH_TOKEN: ${{ secrets.GH_TOKEN }}" in line:
-                gh_token_env_found = True
-                break
-
-        assert tag_sync_found, "Sync tags section not found"
-        assert gh_token_env_found, "GH_TOKEN environment variable not found in tag sync"
-        assert 'if [ -n "$GH_TOKEN" ]; then' in workflow_yaml
-        assert "x-access-token:${GH_TOKEN}@github.com" in workflow_yaml
-
-    def test_sync_uses_reset_not_rebase(self):
+    def test_sync_uses_reset_not_rebase(self, workflow_bytes):
         """Test that sync uses reset --hard instead of rebase."""
-        workflow_yaml = generate_sync_workflow(
-            upstream_url="https://github.com/owner/repo",
-            schedule="0 0 * * *",
-            upstream_default_branch="main",
-        )
-
         # Should use reset --hard
-        assert "git reset --hard upstream/$DEFAULT_BRANCH" in workflow_yaml
+        assert b"git reset --hard upstream/$DEFAULT_BRANCH" in workflow_bytes
         # Should NOT use rebase
-        assert "git rebase upstream/$DEFAULT_BRANCH" not in workflow_yaml
+        assert b"git rebase upstream/$DEFAULT_BRANCH" not in workflow_bytes
 
-    def test_backup_uses_mirrorkeep(self):
+    def test_backup_uses_mirrorkeep(self, workflow_bytes):
         """Test that backup uses .mirrorkeep file."""
-        workflow_yaml = generate_sync_workflow(
-            upstream_url="https://github.com/owner/repo",
-            schedule="0 0 * * *",
-            upstream_default_branch="main",
-        )
-
         # Should check for .mirrorkeep file
-        assert "if [ -f .mirrorkeep ]; then" in workflow_yaml
+        assert b"if [ -f .mirrorkeep ]; then" in workflow_bytes
         # Should parse patterns from .mirrorkeep
-        assert "grep -v '^#' .mirrorkeep" in workflow_yaml
+        assert b"grep -v '^#' .mirrorkeep" in workflow_bytes
         # Should backup files
-        assert "Backed up:" in workflow_yaml
+        assert b"Backed up:" in workflow_bytes
 
-    def test_creates_default_mirrorkeep(self):
+    def test_creates_default_mirrorkeep(self, workflow_bytes):
         """Test that workflow creates default .mirrorkeep if missing."""
-        workflow_yaml = generate_sync_workflow(
-            upstream_url="https://github.com/owner/repo",
-            schedule="0 0 * * *",
-            upstream_default_branch="main",
-        )
-
         # Should create default .mirrorkeep if not found
-        assert "if [ ! -f .mirrorkeep ]; then" in workflow_yaml
-        assert "cat > .mirrorkeep << 'EOF'" in workflow_yaml
-        assert ".github/workflows/mirror-sync.yml" in workflow_yaml
-        assert ".mirrorkeep" in workflow_yaml
+        assert b"if [ ! -f .mirrorkeep ]; then" in workflow_bytes
+        assert b"cat > .mirrorkeep << 'EOF'" in workflow_bytes
+        assert b".github/workflows/mirror-sync.yml" in workflow_bytes
+        assert b".mirrorkeep" in workflow_bytes
 
-    def test_mirrorkeep_based_restore(self):
+    def test_mirrorkeep_based_restore(self, workflow_bytes):
         """Test that restore uses backed up files."""
-        workflow_yaml = generate_sync_workflow(
-            upstream_url="https://github.com/owner/repo",
-            schedule="0 0 * * *",
-            upstream_default_branch="main",
-        )
-
         # Should restore from backup directory
-        assert 'cd "$BACKUP_DIR"' in workflow_yaml
-        assert "find . -type f" in workflow_yaml
-        assert 'cp "$file" "$ORIGINAL_DIR/$file"' in workflow_yaml
+        assert b'cd "$BACKUP_DIR"' in workflow_bytes
+        assert b"find . -type f" in workflow_bytes
+        assert b'cp "$file" "$ORIGINAL_DIR/$file"' in workflow_bytes
 
-    def test_no_conflict_handling(self):
+    def test_no_conflict_handling(self, workflow_bytes):
         """Test that conflict handling is removed since reset doesn't create conflicts."""
-        workflow_yaml = generate_sync_workflow(
-            upstream_url="https://github.com/owner/repo",
-            schedule="0 0 * * *",
-            upstream_default_branch="main",
-        )
-
         # Should NOT have conflict PR creation
-        assert "Create PR if conflicts" not in workflow_yaml
+        assert b"Create PR if conflicts" not in workflow_bytes
         # Should NOT have slack notification for conflicts
-        assert "notify-slack-conflict" not in workflow_yaml
+        assert b"notify-slack-conflict" not in workflow_bytes
         # Should NOT set has_conflicts=true
-        assert "has_conflicts=true" not in workflow_yaml
+        assert b"has_conflicts=true" not in workflow_bytes
 
-    def test_force_push_after_reset(self):
+    def test_force_push_after_reset(self, workflow_bytes):
         """Test that force push is used after reset."""
-        workflow_yaml = generate_sync_workflow(
-            upstream_url="https://github.com/owner/repo",
-            schedule="0 0 * * *",
-            upstream_default_branch="main",
-        )
-
         # Should use force push (not force-with-lease)
-        assert "git push origin $CURRENT_BRANCH --force" in workflow_yaml
+        assert b"git push origin $CURRENT_BRANCH --force" in workflow_bytes
         # Should NOT use force-with-lease which can fail after reset
-        assert "--force-with-lease" not in workflow_yaml
+        assert b"--force-with-lease" not in workflow_bytes
+
+    def test_generate_sync_workflow_is_cached(self):
+        """Test that identical arguments reuse the rendered workflow."""
+        args = ("https://github.com/owner/cached", "0 3 * * *", "develop")
+
+        first = generate_sync_workflow(*args)
+        second = generate_sync_workflow(*args)
+
+        assert second is first
+        assert generate_sync_workflow(args[0], "0 4 * * *", args[2]) != first
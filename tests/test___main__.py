@@ -1,11 +1,28 @@
 """Tests for __main__ module."""
 
+import importlib.util
 import subprocess
 import sys
+from unittest.mock import patch
+
+import pytest
 
 
 def test_main_module_execution():
-    """Test that the package can be run as a module."""
+    """Test that running the module as __main__ invokes the CLI app."""
+    origin = importlib.util.find_spec("cli_git.__main__").origin
+    spec = importlib.util.spec_from_file_location("__main__", origin)
+    module = importlib.util.module_from_spec(spec)
+
+    with patch("cli_git.cli.app") as mock_app:
+        spec.loader.exec_module(module)
+
+    mock_app.assert_called_once_with()
+
+
+@pytest.mark.slow
+def test_main_module_subprocess():
+    """Test that `python -m cli_git` works from a fresh interpreter."""
     result = subprocess.run(
         [sys.executable, "-m", "cli_git", "--version"],
         capture_output=True,
@@ -1,5 +1,6 @@
 """Tests for ConfigManager."""
 
+import os
 from unittest.mock import patch
 
 from cli_git.utils.config import ConfigManager
@@ -26,6 +27,24 @@ class TestConfigManager:
         assert config["github"]["default_org"] == ""
         assert config["preferences"]["default_schedule"] == "0 0 * * *"
 
+    def test_default_config_is_valid_toml(self, tmp_path):
+        """Test that the default config template parses to the expected structure."""
+        import tomlkit
+
+        from cli_git.utils.config import DEFAULT_CONFIG_TEMPLATE
+
+        manager = ConfigManager(tmp_path / ".cli-git")
+
+        assert manager.config_file.read_text() == DEFAULT_CONFIG_TEMPLATE
+        config = tomlkit.loads(DEFAULT_CONFIG_TEMPLATE)
+        assert set(config["github"]) == {
+            "username",
+            "default_org",
+            "slack_webhook_url",
+            "github_token",
+        }
+        assert config["preferences"]["default_prefix"] == "mirror-"
+
     def test_update_config(self, tmp_path):
         """Test updating configuration."""
         manager = ConfigManager(tmp_path / ".cli-git")
@@ -49,6 +68,23 @@ class TestConfigManager:
         stat_info = config_file.stat()
         assert oct(stat_info.st_mode)[-3:] == "600"
 
+    def test_config_permissions_set_once(self, tmp_path):
+        """Test that chmod is skipped when permissions are already restricted."""
+        config_dir = tmp_path / ".cli-git"
+        config_dir.mkdir()
+        config_file = config_dir / "settings.toml"
+        config_file.write_text('[github]\nusername = ""\n')
+        config_file.chmod(0o644)
+
+        manager = ConfigManager(config_dir)
+
+        with patch("cli_git.utils.config.os.chmod", wraps=os.chmod) as mock_chmod:
+            manager.update_config({"github": {"username": "user1"}})
+            manager.update_config({"github": {"username": "user2"}})
+
+        mock_chmod.assert_called_once_with(config_file, 0o600)
+        assert oct(config_file.stat().st_mode)[-3:] == "600"
+
     def test_preserve_comments_on_update(self, tmp_path):
         """Test that comments are preserved when updating config."""
         manager = ConfigManager(tmp_path / ".cli-git")
@@ -81,6 +117,17 @@ class TestConfigManager:
         assert len(mirrors) == 1
         assert mirrors[0]["upstream"] == "https://github.com/owner/repo"
 
+    def test_get_recent_mirrors_missing_or_corrupt(self, tmp_path):
+        """Test that missing or corrupt caches return empty results."""
+        manager = ConfigManager(tmp_path / ".cli-git")
+
+        assert manager.get_recent_mirrors() == []
+        assert manager.get_scanned_mirrors() is None
+        assert manager.get_repo_completion_cache() is None
+
+        manager.mirrors_cache.write_text("{not json")
+        assert manager.get_recent_mirrors() == []
+
     def test_recent_mirrors_limit(self, tmp_path):
         """Test that recent mirrors are limited to 10."""
         manager = ConfigManager(tmp_path / ".cli-git")
@@ -227,3 +274,30 @@ class TestConfigManager:
             # After 1 hour - should be None
             cached = manager.get_scanned_mirrors()
             assert cached is None
+
+    def test_scanned_mirrors_etag_validation(self, tmp_path):
+        """Test that a stored ETag can invalidate the cache early but not extend it."""
+        import time
+
+        manager = ConfigManager(tmp_path / ".cli-git")
+        mirrors = [{"name": "testuser/mirror1"}]
+        manager.save_scanned_mirrors(mirrors, etag='W/"abc123"')
+
+        # Unchanged repository list keeps a fresh cache valid
+        checked = []
+        cached = manager.get_scanned_mirrors(is_unchanged=lambda etag: checked.append(etag) or True)
+        assert cached == mirrors
+        assert checked == ['W/"abc123"']
+
+        # Changed repository list invalidates the cache
+        assert manager.get_scanned_mirrors(is_unchanged=lambda etag: False) is None
+
+        # Past max_age the cache expires even if the ETag still matches
+        with patch("time.time", return_value=time.time() - 7200):
+            manager.save_scanned_mirrors(mirrors, etag='W/"abc123"')
+        checked.clear()
+        assert (
+            manager.get_scanned_mirrors(is_unchanged=lambda etag: checked.append(etag) or True)
+            is None
+        )
+        assert checked == []
@@ -5,66 +5,198 @@ from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
+from cli_git.utils import gh
 from cli_git.utils.gh import (
+    GH_TIMEOUT,
     GitHubError,
+    _default_branch_cache,
+    _token_validation_cache,
     add_repo_secret,
+    add_repo_secrets,
     check_gh_auth,
     create_private_repo,
+    get_auth_user,
     get_current_username,
+    get_repo_list_etag,
+    get_repos_with_file,
     get_user_organizations,
+    is_repo_list_unchanged,
     mask_token,
     run_gh_auth_login,
     validate_github_token,
 )
 
 
+@pytest.fixture
+def mock_gh_run():
+    """Patch gh.py's subprocess helper, leaving other subprocess calls untouched."""
+    with patch.object(gh, "_run") as mock:
+        yield mock
+
+
 class TestGhUtils:
     """Test cases for gh CLI utilities."""
 
-    @patch("subprocess.run")
-    def test_check_gh_auth_success(self, mock_run):
+    @pytest.fixture(autouse=True)
+    def clear_caches(self, monkeypatch, tmp_path):
+        """Clear the process-lifetime caches and isolate gh's config between tests."""
+        monkeypatch.setenv("GH_CONFIG_DIR", str(tmp_path))
+        monkeypatch.delenv("GH_TOKEN", raising=False)
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        _token_validation_cache.clear()
+        _default_branch_cache.clear()
+        check_gh_auth.cache_clear()
+        get_current_username.cache_clear()
+
+    def test_check_gh_auth_success(self, mock_gh_run):
         """Test successful gh authentication check."""
-        mock_run.return_value = MagicMock(returncode=0)
+        mock_gh_run.return_value = MagicMock(returncode=0)
 
         result = check_gh_auth()
         assert result is True
-        mock_run.assert_called_once_with(["gh", "auth", "status"], capture_output=True, text=True)
+        mock_gh_run.assert_called_once_with(
+            ["gh", "auth", "status"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=GH_TIMEOUT,
+        )
 
-    @patch("subprocess.run")
-    def test_check_gh_auth_failure(self, mock_run):
+    def test_check_gh_auth_failure(self, mock_gh_run):
         """Test failed gh authentication check."""
-        mock_run.return_value = MagicMock(
+        mock_gh_run.return_value = MagicMock(
             returncode=1, stderr="You are not logged into any GitHub hosts"
         )
 
         result = check_gh_auth()
         assert result is False
 
-    @patch("subprocess.run")
-    def test_get_current_username_success(self, mock_run):
+    @pytest.mark.parametrize(
+        "hosts, token, expected_calls",
+        [
+            ("github.com:\n    oauth_token: ghp_xxx\n    user: testuser\n", None, 0),
+            ("github.com:\n    user: testuser\n", None, 1),
+            ("ghe.example.com:\n    oauth_token: ghp_xxx\n", None, 1),
+            ("github.com:\n    users:\n        a:\n            oauth_token: ghp_xxx\n", None, 1),
+            ("github.com:\n    oauth_token: ghp_xxx\n", "ghp_env", 1),
+        ],
+        ids=["stored_token", "keyring_token", "other_host", "inactive_account", "env_token"],
+    )
+    def test_check_gh_auth_fast_path(
+        self, mock_gh_run, monkeypatch, tmp_path, hosts, token, expected_calls
+    ):
+        """Test that only a stored github.com token skips gh auth status."""
+        (tmp_path / "hosts.yml").write_text(hosts)
+        if token:
+            monkeypatch.setenv("GH_TOKEN", token)
+        mock_gh_run.return_value = MagicMock(returncode=0)
+
+        assert check_gh_auth() is True
+        assert mock_gh_run.call_count == expected_calls
+
+    def test_check_gh_auth_memoized(self, mock_gh_run):
+        """Test that gh auth status runs once per process."""
+        mock_gh_run.return_value = MagicMock(returncode=0)
+
+        assert [check_gh_auth() for _ in range(3)] == [True] * 3
+        assert mock_gh_run.call_count == 1
+
+    def test_run_gh_auth_login_clears_auth_cache(self, mock_gh_run):
+        """Test that a successful login forces a fresh authentication check."""
+        mock_gh_run.return_value = MagicMock(returncode=1)
+        assert check_gh_auth() is False
+
+        mock_gh_run.return_value = MagicMock(returncode=0)
+        assert run_gh_auth_login() is True
+        assert check_gh_auth() is True
+
+    def test_get_auth_user(self, mock_gh_run):
+        """Test getting the authenticated user with a single gh call."""
+        mock_gh_run.return_value = MagicMock(returncode=0, stdout="testuser\n")
+
+        assert get_auth_user() == "testuser"
+        assert get_current_username() == "testuser"
+        mock_gh_run.assert_called_once()
+
+    def test_get_auth_user_from_hosts_file(self, mock_gh_run, tmp_path):
+        """Test that the stored gh login answers without calling the API."""
+        (tmp_path / "hosts.yml").write_text("github.com:\n    user: hostuser\n")
+
+        assert get_auth_user() == "hostuser"
+        mock_gh_run.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "outcome",
+        [
+            pytest.param(subprocess.CalledProcessError(1, ["gh"], stderr="HTTP 401"), id="no_auth"),
+            pytest.param(MagicMock(returncode=0, stdout="\n", stderr=""), id="empty_login"),
+            pytest.param(FileNotFoundError(), id="gh_missing"),
+            pytest.param(subprocess.TimeoutExpired(["gh"], 30), id="timeout"),
+        ],
+    )
+    def test_get_auth_user_not_authenticated(self, mock_gh_run, outcome):
+        """Test that an unauthenticated, empty or missing gh yields None."""
+        mock_gh_run.side_effect = [outcome]
+        assert get_auth_user() is None
+
+    def test_get_current_username_success(self, mock_gh_run):
         """Test getting current GitHub username."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="testuser\n")
+        mock_gh_run.return_value = MagicMock(returncode=0, stdout="testuser\n")
 
         username = get_current_username()
         assert username == "testuser"
-        mock_run.assert_called_once_with(
-            ["gh", "api", "user", "-q", ".login"], capture_output=True, text=True, check=True
+        mock_gh_run.assert_called_once_with(
+            ["gh", "api", "user", "-q", ".login"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=GH_TIMEOUT,
         )
 
-    @patch("subprocess.run")
-    def test_get_current_username_failure(self, mock_run):
+    def test_get_current_username_cached(self, mock_gh_run):
+        """Test that the username is fetched from gh only once per process."""
+        mock_gh_run.return_value = MagicMock(returncode=0, stdout="testuser\n")
+
+        assert [get_current_username() for _ in range(3)] == ["testuser"] * 3
+        assert mock_gh_run.call_count == 1
+
+    @pytest.mark.parametrize(
+        "hosts, token, expected",
+        [
+            ("github.com:\n    user: hostuser\n    git_protocol: https\n", None, "hostuser"),
+            (
+                "github.com:\n    users:\n        user: nested\n    user: 'active'\n",
+                None,
+                "active",
+            ),
+            ("github.com:\n    user: hostuser\n", "ghp_token", "apiuser"),
+            ("ghe.example.com:\n    user: enterprise\n", None, "apiuser"),
+        ],
+        ids=["hosts_file", "multi_account", "token_override", "other_host"],
+    )
+    def test_get_current_username_from_hosts_file(
+        self, mock_gh_run, monkeypatch, tmp_path, hosts, token, expected
+    ):
+        """Test that the hosts file login is used unless a token overrides it."""
+        (tmp_path / "hosts.yml").write_text(hosts)
+        if token:
+            monkeypatch.setenv("GH_TOKEN", token)
+        mock_gh_run.return_value = MagicMock(returncode=0, stdout="apiuser\n")
+
+        assert get_current_username() == expected
+        assert mock_gh_run.called is (expected == "apiuser")
+
+    def test_get_current_username_failure(self, mock_gh_run):
         """Test handling error when getting username."""
-        mock_run.side_effect = subprocess.CalledProcessError(
+        mock_gh_run.side_effect = subprocess.CalledProcessError(
             1, ["gh", "api", "user"], stderr="Not authenticated"
         )
 
         with pytest.raises(GitHubError, match="Failed to get current user"):
             get_current_username()
 
-    @patch("subprocess.run")
-    def test_create_private_repo_success(self, mock_run):
+    def test_create_private_repo_success(self, mock_gh_run):
         """Test creating private repository."""
-        mock_run.return_value = MagicMock(
+        mock_gh_run.return_value = MagicMock(
             returncode=0, stdout="https://github.com/testuser/test-repo\n"
         )
 
@@ -80,12 +212,13 @@ class TestGhUtils:
             "--description",
             "Test description",
         ]
-        mock_run.assert_called_once_with(expected_cmd, capture_output=True, text=True, check=True)
+        mock_gh_run.assert_called_once_with(
+            expected_cmd, capture_output=True, text=True, check=True, timeout=GH_TIMEOUT
+        )
 
-    @patch("subprocess.run")
-    def test_create_private_repo_with_org(self, mock_run):
+    def test_create_private_repo_with_org(self, mock_gh_run):
         """Test creating private repository in organization."""
-        mock_run.return_value = MagicMock(
+        mock_gh_run.return_value = MagicMock(
             returncode=0, stdout="https://github.com/testorg/test-repo\n"
         )
 
@@ -93,138 +226,261 @@ class TestGhUtils:
         assert url == "https://github.com/testorg/test-repo"
 
         expected_cmd = ["gh", "repo", "create", "testorg/test-repo", "--private"]
-        mock_run.assert_called_once()
-        actual_cmd = mock_run.call_args[0][0]
+        mock_gh_run.assert_called_once()
+        actual_cmd = mock_gh_run.call_args[0][0]
         assert actual_cmd[:5] == expected_cmd[:5]
 
-    @patch("subprocess.run")
-    def test_create_private_repo_already_exists(self, mock_run):
+    @pytest.mark.parametrize(
+        "stderr",
+        [
+            "failed to create repository: HTTP 422: Validation Failed",
+            "GraphQL: Name already exists on this account (createRepository)",
+        ],
+        ids=["validation_failed", "name_taken"],
+    )
+    def test_create_private_repo_already_exists(self, mock_gh_run, stderr):
         """Test handling repository already exists error."""
-        mock_run.side_effect = subprocess.CalledProcessError(
-            1,
-            ["gh", "repo", "create"],
-            stderr="failed to create repository: HTTP 422: Validation Failed",
+        mock_gh_run.side_effect = subprocess.CalledProcessError(
+            1, ["gh", "repo", "create"], stderr=stderr
         )
 
         with pytest.raises(GitHubError, match="Repository .* already exists"):
             create_private_repo("test-repo")
 
-    @patch("subprocess.run")
-    def test_add_repo_secret_success(self, mock_run):
+    def test_add_repo_secret_success(self, mock_gh_run):
         """Test adding repository secret."""
-        mock_run.return_value = MagicMock(returncode=0)
+        mock_gh_run.return_value = MagicMock(returncode=0)
 
         add_repo_secret("testuser/test-repo", "MY_SECRET", "secret-value")
 
         expected_cmd = ["gh", "secret", "set", "MY_SECRET", "--repo", "testuser/test-repo"]
-        mock_run.assert_called_once()
-        actual_cmd = mock_run.call_args[0][0]
+        mock_gh_run.assert_called_once()
+        actual_cmd = mock_gh_run.call_args[0][0]
         assert actual_cmd == expected_cmd
 
         # Check stdin was used for secret value
-        assert mock_run.call_args.kwargs["input"] == "secret-value"
+        assert mock_gh_run.call_args.kwargs["input"] == "secret-value"
 
-    @patch("subprocess.run")
-    def test_add_repo_secret_failure(self, mock_run):
+    def test_add_repo_secret_failure(self, mock_gh_run):
         """Test handling error when adding secret."""
-        mock_run.side_effect = subprocess.CalledProcessError(
+        mock_gh_run.side_effect = subprocess.CalledProcessError(
             1, ["gh", "secret", "set"], stderr="failed to set secret"
         )
 
         with pytest.raises(GitHubError, match="Failed to set secret"):
             add_repo_secret("testuser/test-repo", "MY_SECRET", "value")
 
-    @patch("subprocess.run")
-    def test_run_gh_auth_login_success(self, mock_run):
+    def test_add_repo_secrets_batch(self, mock_gh_run):
+        """Test that several secrets are set with a single gh call."""
+        mock_gh_run.return_value = MagicMock(returncode=0)
+
+        add_repo_secrets(
+            "testuser/test-repo",
+            {"UPSTREAM_URL": "https://github.com/o/r", "BRANCH": "main", "TOKEN": "a b#c"},
+        )
+
+        assert mock_gh_run.call_count == 1
+        assert mock_gh_run.call_args.args[0] == [
+            "gh",
+            "secret",
+            "set",
+            "--env-file",
+            "-",
+            "--repo",
+            "testuser/test-repo",
+        ]
+        assert mock_gh_run.call_args.kwargs["input"] == (
+            "UPSTREAM_URL='https://github.com/o/r'\nBRANCH='main'\nTOKEN='a b#c'\n"
+        )
+
+    @pytest.mark.parametrize(
+        "value",
+        ["it's", "line1\nline2", "C:\\path\\"],
+        ids=["single_quote", "newline", "trailing_backslash"],
+    )
+    def test_add_repo_secrets_unquotable_value(self, mock_gh_run, value):
+        """Test that values that cannot be single-quoted are set on their own."""
+        mock_gh_run.return_value = MagicMock(returncode=0)
+
+        add_repo_secrets("testuser/test-repo", {"QUOTED": value, "PLAIN": "value"})
+
+        first, second = mock_gh_run.call_args_list
+        assert first.args[0] == ["gh", "secret", "set", "QUOTED", "--repo", "testuser/test-repo"]
+        assert first.kwargs["input"] == value
+        assert second.kwargs["input"] == "PLAIN='value'\n"
+
+    def test_add_repo_secrets_failure(self, mock_gh_run):
+        """Test handling error when setting secrets in a batch."""
+        mock_gh_run.side_effect = subprocess.CalledProcessError(
+            1, ["gh", "secret", "set"], stderr="failed to set secret"
+        )
+
+        with pytest.raises(GitHubError, match="Failed to set secrets A, B"):
+            add_repo_secrets("testuser/test-repo", {"A": "1", "B": "2"})
+
+    @pytest.mark.parametrize(
+        "call",
+        [
+            lambda: get_current_username(),
+            lambda: create_private_repo("test-repo"),
+            lambda: add_repo_secret("testuser/test-repo", "NAME", "value"),
+            lambda: add_repo_secrets("testuser/test-repo", {"NAME": "value"}),
+            lambda: get_user_organizations(),
+            lambda: gh.get_upstream_default_branch("https://github.com/owner/repo"),
+            lambda: get_repos_with_file(["owner/repo"], "README.md"),
+            lambda: gh.run_gh(["api", "user"]),
+        ],
+        ids=[
+            "username",
+            "create_repo",
+            "secret",
+            "secrets",
+            "organizations",
+            "default_branch",
+            "repos_with_file",
+            "run_gh",
+        ],
+    )
+    def test_gh_timeout_raises(self, mock_gh_run, call):
+        """Test that a stalled gh call surfaces as a GitHubError."""
+        mock_gh_run.side_effect = subprocess.TimeoutExpired(cmd=["gh"], timeout=GH_TIMEOUT)
+
+        with pytest.raises(GitHubError, match="timed out"):
+            call()
+
+    @pytest.mark.parametrize(
+        "call, expected",
+        [
+            (check_gh_auth, False),
+            (get_auth_user, None),
+            (get_repo_list_etag, None),
+            (lambda: is_repo_list_unchanged('"etag"'), False),
+            (lambda: validate_github_token("ghp_token"), False),
+        ],
+        ids=["auth", "auth_user", "etag", "unchanged", "validate_token"],
+    )
+    def test_gh_timeout_fails_closed(self, mock_gh_run, call, expected):
+        """Test that checks treat a stalled gh call like an unavailable gh."""
+        mock_gh_run.side_effect = subprocess.TimeoutExpired(cmd=["gh"], timeout=GH_TIMEOUT)
+
+        assert call() is expected
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [(None, None), ("5", 5.0), ("2.5", 2.5), ("30s", None), ("0", None), ("nan", None)],
+        ids=["unset", "integer", "fraction", "suffix", "zero", "nan"],
+    )
+    def test_parse_gh_timeout(self, value, expected):
+        """Test that only positive finite numbers are accepted as timeouts."""
+        assert gh._parse_gh_timeout(value) == expected
+
+    def test_invalid_gh_timeout_warns_once_on_first_call(self, monkeypatch, capsys):
+        """Test that an invalid CLI_GIT_GH_TIMEOUT is reported lazily and only once."""
+        monkeypatch.setattr(gh, "_GH_TIMEOUT_ENV", "30s")
+        monkeypatch.setattr(subprocess, "run", MagicMock(returncode=0))
+        gh._warn_invalid_gh_timeout.cache_clear()
+
+        assert capsys.readouterr().err == ""
+        gh._run(["gh", "--version"])
+        gh._run(["gh", "--version"])
+        gh._warn_invalid_gh_timeout.cache_clear()
+
+        assert capsys.readouterr().err.count("Ignoring invalid CLI_GIT_GH_TIMEOUT='30s'") == 1
+
+    def test_run_gh_auth_login_success(self, mock_gh_run):
         """Test successful gh auth login."""
-        mock_run.return_value = MagicMock(returncode=0)
+        mock_gh_run.return_value = MagicMock(returncode=0)
 
         result = run_gh_auth_login()
         assert result is True
-        mock_run.assert_called_once_with(["gh", "auth", "login"], check=False)
+        mock_gh_run.assert_called_once_with(["gh", "auth", "login"], check=False)
 
-    @patch("subprocess.run")
-    def test_run_gh_auth_login_failure(self, mock_run):
+    def test_run_gh_auth_login_failure(self, mock_gh_run):
         """Test failed gh auth login."""
-        mock_run.return_value = MagicMock(returncode=1)
+        mock_gh_run.return_value = MagicMock(returncode=1)
 
         result = run_gh_auth_login()
         assert result is False
 
-    @patch("subprocess.run")
-    def test_run_gh_auth_login_file_not_found(self, mock_run):
+    def test_run_gh_auth_login_file_not_found(self, mock_gh_run):
         """Test gh auth login when gh CLI is not installed."""
-        mock_run.side_effect = FileNotFoundError()
+        mock_gh_run.side_effect = FileNotFoundError()
 
         result = run_gh_auth_login()
         assert result is False
 
-    @patch("subprocess.run")
-    def test_get_user_organizations_success(self, mock_run):
+    def test_get_user_organizations_success(self, mock_gh_run):
         """Test getting user organizations."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="org1\norg2\n")
+        mock_gh_run.return_value = MagicMock(returncode=0, stdout="org1\norg2\n")
 
         orgs = get_user_organizations()
         assert orgs == ["org1", "org2"]
-        mock_run.assert_called_once_with(
+        mock_gh_run.assert_called_once_with(
             ["gh", "api", "user/orgs", "-q", ".[].login"],
             capture_output=True,
             text=True,
             check=True,
+            timeout=GH_TIMEOUT,
         )
 
-    @patch("subprocess.run")
-    def test_get_user_organizations_empty(self, mock_run):
+    def test_get_user_organizations_empty(self, mock_gh_run):
         """Test getting empty organizations list."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="")
+        mock_gh_run.return_value = MagicMock(returncode=0, stdout="")
 
         orgs = get_user_organizations()
         assert orgs == []
 
-    @patch("subprocess.run")
-    def test_get_user_organizations_failure(self, mock_run):
+    def test_get_user_organizations_failure(self, mock_gh_run):
         """Test handling error when getting organizations."""
-        mock_run.side_effect = subprocess.CalledProcessError(
+        mock_gh_run.side_effect = subprocess.CalledProcessError(
             1, ["gh", "api", "user/orgs"], stderr="Not authenticated"
         )
 
         with pytest.raises(GitHubError, match="Failed to get organizations"):
             get_user_organizations()
 
-    @patch("subprocess.run")
-    def test_get_upstream_default_branch_success(self, mock_run):
+    def test_get_upstream_default_branch_success(self, mock_gh_run):
         """Test successfully getting upstream default branch."""
         from cli_git.utils.gh import get_upstream_default_branch
 
-        mock_run.return_value = Mock(returncode=0, stdout="main\n", stderr="", check=True)
+        mock_gh_run.return_value = Mock(returncode=0, stdout="main\n", stderr="", check=True)
 
         branch = get_upstream_default_branch("https://github.com/owner/repo")
 
         assert branch == "main"
-        mock_run.assert_called_once_with(
+        mock_gh_run.assert_called_once_with(
             ["gh", "api", "repos/owner/repo", "-q", ".default_branch"],
             capture_output=True,
             text=True,
             check=True,
+            timeout=GH_TIMEOUT,
         )
 
-    @patch("subprocess.run")
-    def test_get_upstream_default_branch_master(self, mock_run):
+    def test_get_upstream_default_branch_master(self, mock_gh_run):
         """Test getting upstream default branch that is master."""
         from cli_git.utils.gh import get_upstream_default_branch
 
-        mock_run.return_value = Mock(returncode=0, stdout="master\n", stderr="", check=True)
+        mock_gh_run.return_value = Mock(returncode=0, stdout="master\n", stderr="", check=True)
 
         branch = get_upstream_default_branch("https://github.com/owner/repo")
 
         assert branch == "master"
 
-    @patch("subprocess.run")
-    def test_get_upstream_default_branch_failure(self, mock_run):
+    def test_get_upstream_default_branch_cached(self, mock_gh_run):
+        """Test that mirrors sharing an upstream reuse its default branch."""
+        from cli_git.utils.gh import get_upstream_default_branch
+
+        mock_gh_run.return_value = Mock(returncode=0, stdout="main\n", stderr="")
+
+        assert get_upstream_default_branch("https://github.com/owner/repo") == "main"
+        assert get_upstream_default_branch("https://github.com/Owner/repo.git") == "main"
+        assert mock_gh_run.call_count == 1
+
+    def test_get_upstream_default_branch_failure(self, mock_gh_run):
         """Test handling error when getting default branch."""
         from cli_git.utils.gh import get_upstream_default_branch
 
-        mock_run.side_effect = subprocess.CalledProcessError(
+        mock_gh_run.side_effect = subprocess.CalledProcessError(
             1, ["gh", "api"], stderr="Repository not found"
         )
 
@@ -238,36 +494,106 @@ class TestGhUtils:
         with pytest.raises(GitHubError, match="Invalid repository URL"):
             get_upstream_default_branch("not-a-valid-url")
 
-    @patch("subprocess.run")
-    def test_validate_github_token_valid(self, mock_run):
+    def test_get_repo_list_etag_success(self, mock_gh_run):
+        """Test reading the ETag header from the repository list response."""
+        mock_gh_run.return_value = MagicMock(
+            returncode=0,
+            stdout='HTTP/2.0 200 OK\nContent-Type: application/json\nEtag: W/"abc123"\n\n[]',
+        )
+
+        assert get_repo_list_etag() == 'W/"abc123"'
+        assert mock_gh_run.call_args[0][0][:3] == ["gh", "api", "--include"]
+
+    def test_get_repo_list_etag_failure(self, mock_gh_run):
+        """Test that a failed request yields no ETag."""
+        mock_gh_run.return_value = MagicMock(returncode=1, stdout="")
+        assert get_repo_list_etag() is None
+
+        mock_gh_run.side_effect = FileNotFoundError()
+        assert get_repo_list_etag() is None
+
+    def test_is_repo_list_unchanged(self, mock_gh_run):
+        """Test conditional request handling for 304 and 200 responses."""
+        mock_gh_run.return_value = MagicMock(returncode=1, stdout="HTTP/2.0 304 Not Modified\n\n")
+        assert is_repo_list_unchanged('W/"abc123"') is True
+        assert 'If-None-Match: W/"abc123"' in mock_gh_run.call_args[0][0]
+
+        mock_gh_run.return_value = MagicMock(returncode=0, stdout="HTTP/2.0 200 OK\n\n[]")
+        assert is_repo_list_unchanged('W/"abc123"') is False
+
+    def test_get_repos_with_file_single_query(self, mock_gh_run):
+        """Test that all repositories are checked with one GraphQL request."""
+        mock_gh_run.return_value = MagicMock(
+            returncode=1,
+            stdout='{"data": {"r0": {"object": {"id": "x"}}, "r1": {"object": null}, "r2": null}}',
+        )
+
+        repos = ["user/repo0", "user/repo1", "user/repo2"]
+        result = get_repos_with_file(repos, ".github/workflows/mirror-sync.yml")
+
+        assert result == {"user/repo0"}
+        mock_gh_run.assert_called_once()
+        query = mock_gh_run.call_args[0][0][-1]
+        assert query.count("repository(") == 3
+        assert '"HEAD:.github/workflows/mirror-sync.yml"' in query
+
+    def test_get_repos_with_file_invalid_response(self, mock_gh_run):
+        """Test error when the GraphQL response cannot be parsed."""
+        mock_gh_run.return_value = MagicMock(returncode=1, stdout="", stderr="HTTP 401")
+
+        with pytest.raises(GitHubError, match="Failed to query repositories"):
+            get_repos_with_file(["user/repo"], "README.md")
+
+    def test_get_repos_with_file_query_failure(self, mock_gh_run):
+        """Test that a failed query without data is an error, not an empty result."""
+        mock_gh_run.return_value = MagicMock(
+            returncode=1,
+            stdout='{"errors": [{"type": "RATE_LIMITED"}]}',
+            stderr="gh: API rate limit exceeded",
+        )
+
+        with pytest.raises(GitHubError, match="rate limit"):
+            get_repos_with_file(["user/repo"], "README.md")
+
+    def test_validate_github_token_valid(self, mock_gh_run):
         """Test validating a valid GitHub token."""
-        mock_run.return_value = MagicMock(returncode=0)
+        mock_gh_run.return_value = MagicMock(returncode=0)
 
         result = validate_github_token("ghp_test123token")
         assert result is True
-        mock_run.assert_called_once_with(
+        mock_gh_run.assert_called_once_with(
             ["gh", "api", "user", "-H", "Authorization: token ghp_test123token"],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=GH_TIMEOUT,
         )
 
-    @patch("subprocess.run")
-    def test_validate_github_token_invalid(self, mock_run):
+    def test_validate_github_token_invalid(self, mock_gh_run):
         """Test validating an invalid GitHub token."""
-        mock_run.return_value = MagicMock(returncode=1)
+        mock_gh_run.return_value = MagicMock(returncode=1)
 
         result = validate_github_token("invalid_token")
         assert result is False
 
+    def test_validate_github_token_cached(self, mock_gh_run):
+        """Test that repeated validation of the same token runs gh only once."""
+        mock_gh_run.return_value = MagicMock(returncode=0)
+
+        assert validate_github_token("ghp_cached") is True
+        assert validate_github_token("ghp_cached") is True
+        mock_gh_run.assert_called_once()
+
+        # Cache is keyed by digest, not the raw token
+        assert "ghp_cached" not in _token_validation_cache
+
     def test_validate_github_token_empty(self):
         """Test validating empty token."""
         result = validate_github_token("")
         assert result is False
 
-    @patch("subprocess.run")
-    def test_validate_github_token_exception(self, mock_run):
+    def test_validate_github_token_exception(self, mock_gh_run):
         """Test handling exception during token validation."""
-        mock_run.side_effect = Exception("Unexpected error")
+        mock_gh_run.side_effect = Exception("Unexpected error")
 
         result = validate_github_token("token")
         assert result is False
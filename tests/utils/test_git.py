@@ -1,25 +1,40 @@
 """Tests for git utilities."""
 
+import os
+import shlex
 import subprocess
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
 from cli_git.utils.git import (
     extract_repo_info,
-    get_default_branch,
+    extract_repo_name_from_url,
+    prune_repo_cache,
     run_git_command,
+    update_repo_cache,
 )
 
 
+@pytest.fixture
+def fake_result():
+    """Build lightweight stand-ins for subprocess.CompletedProcess."""
+
+    def make(returncode=0, stdout="", stderr=""):
+        return SimpleNamespace(returncode=returncode, stdout=stdout, stderr=stderr)
+
+    return make
+
+
 class TestGitUtils:
     """Test cases for git utilities."""
 
     @patch("subprocess.run")
-    def test_run_git_command_success(self, mock_run):
+    def test_run_git_command_success(self, mock_run, fake_result):
         """Test successful git command execution."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="Success output\n", stderr="")
+        mock_run.return_value = fake_result(stdout="Success output\n")
 
         result = run_git_command("status")
         assert result == "Success output"
@@ -28,9 +43,9 @@ class TestGitUtils:
         )
 
     @patch("subprocess.run")
-    def test_run_git_command_with_cwd(self, mock_run):
+    def test_run_git_command_with_cwd(self, mock_run, fake_result):
         """Test git command execution with custom working directory."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="Output\n", stderr="")
+        mock_run.return_value = fake_result(stdout="Output\n")
         test_path = Path("/test/path")
 
         result = run_git_command("status", cwd=test_path)
@@ -40,56 +55,61 @@ class TestGitUtils:
         )
 
     @patch("subprocess.run")
-    def test_run_git_command_failure(self, mock_run):
+    def test_run_git_command_failure(self, mock_run, fake_result):
         """Test git command execution failure."""
-        mock_run.return_value = MagicMock(returncode=1, stdout="", stderr="Error message")
+        mock_run.return_value = fake_result(returncode=1, stderr="Error message")
 
         with pytest.raises(subprocess.CalledProcessError) as exc_info:
             run_git_command("invalid-command")
         assert exc_info.value.stderr == "Error message"
 
-    def test_extract_repo_info_https_url(self):
-        """Test extracting repo info from HTTPS URL."""
-        url = "https://github.com/owner/repo-name.git"
-        owner, repo = extract_repo_info(url)
-        assert owner == "owner"
-        assert repo == "repo-name"
-
-    def test_extract_repo_info_https_url_no_git(self):
-        """Test extracting repo info from HTTPS URL without .git."""
-        url = "https://github.com/owner/repo-name"
-        owner, repo = extract_repo_info(url)
-        assert owner == "owner"
-        assert repo == "repo-name"
-
-    def test_extract_repo_info_ssh_url(self):
-        """Test extracting repo info from SSH URL."""
-        url = "git@github.com:owner/repo-name.git"
-        owner, repo = extract_repo_info(url)
-        assert owner == "owner"
-        assert repo == "repo-name"
-
-    def test_extract_repo_info_with_subdomain(self):
-        """Test extracting repo info from URL with subdomain."""
-        url = "https://git.company.com/owner/repo-name.git"
-        owner, repo = extract_repo_info(url)
-        assert owner == "owner"
-        assert repo == "repo-name"
-
-    def test_extract_repo_info_invalid_url(self):
-        """Test extracting repo info from invalid URL."""
+    @patch("subprocess.run")
+    def test_run_git_command_failure_without_check(self, mock_run, fake_result):
+        """Test that a failed command returns None when check is False."""
+        mock_run.return_value = fake_result(returncode=1, stderr="fatal: not found")
+
+        assert run_git_command("show-ref --verify refs/heads/main", check=False) is None
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://github.com/owner/repo-name.git",
+            "https://github.com/owner/repo-name",
+            "git@github.com:owner/repo-name.git",
+            "https://git.company.com/owner/repo-name.git",
+        ],
+        ids=["https", "https_no_git", "ssh", "subdomain"],
+    )
+    def test_extract_repo_info(self, url):
+        """Test extracting repo info from HTTPS and SSH URLs."""
+        assert extract_repo_info(url) == ("owner", "repo-name")
+
+    @pytest.mark.parametrize(
+        "url",
+        ["not-a-valid-url", "https://github.com/repo-name"],
+        ids=["invalid_url", "no_owner"],
+    )
+    def test_extract_repo_info_invalid(self, url):
+        """Test that malformed URLs are rejected."""
         with pytest.raises(ValueError, match="Invalid repository URL"):
-            extract_repo_info("not-a-valid-url")
+            extract_repo_info(url)
 
-    def test_extract_repo_info_no_owner(self):
-        """Test extracting repo info from URL without owner."""
-        with pytest.raises(ValueError, match="Invalid repository URL"):
-            extract_repo_info("https://github.com/repo-name")
+    def test_extract_repo_name_from_url_github(self):
+        """Test extracting owner/repo display name from GitHub URLs."""
+        assert extract_repo_name_from_url("https://github.com/owner/repo") == "owner/repo"
+        assert extract_repo_name_from_url("https://github.com/owner/repo/") == "owner/repo"
+        assert extract_repo_name_from_url("https://github.com/owner/repo.git") == "owner/repo.git"
+
+    def test_extract_repo_name_from_url_non_github(self):
+        """Test that non-GitHub or incomplete URLs return None."""
+        assert extract_repo_name_from_url("https://gitlab.com/owner/repo") is None
+        assert extract_repo_name_from_url("https://github.com/owner") is None
+        assert extract_repo_name_from_url("") is None
 
     @patch("subprocess.run")
-    def test_run_git_command_with_quotes(self, mock_run):
+    def test_run_git_command_with_quotes(self, mock_run, fake_result):
         """Test git command with quoted arguments."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="[main abcd123] Test message\n")
+        mock_run.return_value = fake_result(stdout="[main abcd123] Test message\n")
 
         result = run_git_command('commit -m "This is a test message with spaces"')
 
@@ -99,9 +119,9 @@ class TestGitUtils:
         assert result == "[main abcd123] Test message"
 
     @patch("subprocess.run")
-    def test_run_git_command_with_complex_message(self, mock_run):
+    def test_run_git_command_with_complex_message(self, mock_run, fake_result):
         """Test git command with complex commit message."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="[main abcd123] Complex message\n")
+        mock_run.return_value = fake_result(stdout="[main abcd123] Complex message\n")
 
         # Test the exact message that was failing
         result = run_git_command('commit -m "Disable original workflows and add mirror sync"')
@@ -112,117 +132,99 @@ class TestGitUtils:
         assert result == "[main abcd123] Complex message"
 
     @patch("cli_git.utils.git.run_git_command")
-    def test_get_default_branch_from_upstream_head(self, mock_run_git):
-        """Test getting default branch from upstream HEAD."""
-        mock_run_git.return_value = "refs/remotes/upstream/main"
-
-        result = get_default_branch()
-
-        mock_run_git.assert_called_with("symbolic-ref refs/remotes/upstream/HEAD", cwd=None)
-        assert result == "main"
-
-    @patch("cli_git.utils.git.run_git_command")
-    def test_get_default_branch_from_upstream_head_master(self, mock_run_git):
-        """Test getting default branch from upstream HEAD (master)."""
-        mock_run_git.return_value = "refs/remotes/upstream/master"
+    def test_update_repo_cache_first_use_clones_bare(self, mock_run_git, tmp_path):
+        """Test that the first use creates a bare clone in the cache."""
+        cache_path = tmp_path / "github.com" / "owner" / "repo.git"
+        mock_run_git.side_effect = lambda cmd, cwd=None: cache_path.mkdir()
 
-        result = get_default_branch()
+        result = update_repo_cache("https://github.com/Owner/Repo.git", cache_dir=tmp_path)
 
-        assert result == "master"
+        assert result == cache_path
+        mock_run_git.assert_called_once_with(
+            f"clone --bare https://github.com/Owner/Repo.git {cache_path}"
+        )
 
     @patch("cli_git.utils.git.run_git_command")
-    def test_get_default_branch_fallback_to_remote_branches(self, mock_run_git):
-        """Test fallback to parsing remote branches."""
-        # First call fails (no upstream HEAD)
-        # Second call returns remote branches
-        mock_run_git.side_effect = [
-            subprocess.CalledProcessError(1, "git"),
-            "  upstream/master\n  upstream/develop\n  origin/main",
+    def test_update_repo_cache_quotes_cache_path(self, mock_run_git, tmp_path):
+        """Test that a cache directory containing spaces stays a single argument."""
+        cache_dir = tmp_path / "my cache"
+        cache_path = cache_dir / "github.com" / "owner" / "repo.git"
+        mock_run_git.side_effect = lambda cmd, cwd=None: cache_path.mkdir(parents=True)
+
+        update_repo_cache("https://github.com/owner/repo", cache_dir=cache_dir)
+
+        cmd = mock_run_git.call_args.args[0]
+        assert shlex.split(cmd) == [
+            "clone",
+            "--bare",
+            "https://github.com/owner/repo",
+            str(cache_path),
         ]
 
-        result = get_default_branch()
-
-        assert result == "master"
-
+    @pytest.mark.parametrize(
+        "url, expected",
+        [
+            ("https://gitlab.com/owner/repo", "gitlab.com/owner/repo.git"),
+            ("git@github.com:owner/repo.git", "github.com/owner/repo.git"),
+            ("https://token@GHE.example.com:8443/owner/repo", "ghe.example.com/owner/repo.git"),
+        ],
+        ids=["other_host", "ssh", "credentials_and_port"],
+    )
     @patch("cli_git.utils.git.run_git_command")
-    def test_get_default_branch_fallback_to_origin(self, mock_run_git):
-        """Test fallback to origin branches when no upstream."""
-        # First call fails (no upstream HEAD)
-        # Second call returns only origin branches
-        mock_run_git.side_effect = [
-            subprocess.CalledProcessError(1, "git"),
-            "  origin/main\n  origin/develop",
-        ]
+    def test_update_repo_cache_path_includes_host(self, mock_run_git, tmp_path, url, expected):
+        """Test that the same owner/repo on different hosts gets separate caches."""
+        mock_run_git.side_effect = lambda cmd, cwd=None: Path(cmd.split()[-1]).mkdir()
 
-        result = get_default_branch()
-
-        assert result == "main"
+        assert update_repo_cache(url, cache_dir=tmp_path) == tmp_path / expected
 
     @patch("cli_git.utils.git.run_git_command")
-    def test_get_default_branch_fallback_to_local_branches(self, mock_run_git):
-        """Test final fallback to local branches."""
-
-        # First call fails (no upstream HEAD)
-        # Second call fails (no remote branches)
-        # Third call succeeds for main branch check
-        def side_effect_func(cmd, cwd=None):
-            if "symbolic-ref" in cmd:
-                raise subprocess.CalledProcessError(1, "git")
-            elif "branch -r" in cmd:
-                raise subprocess.CalledProcessError(1, "git")
-            elif "show-ref" in cmd and "main" in cmd:
-                return ""  # show-ref for main succeeds
-            else:
-                raise subprocess.CalledProcessError(1, "git")
-
-        mock_run_git.side_effect = side_effect_func
-
-        result = get_default_branch()
-
-        assert result == "main"
+    def test_update_repo_cache_existing_fetches(self, mock_run_git, tmp_path):
+        """Test that an existing cache entry is refreshed with fetch."""
+        cache_path = tmp_path / "github.com" / "owner" / "repo.git"
+        cache_path.mkdir(parents=True)
+        (cache_path / "HEAD").write_text("ref: refs/heads/main\n")
+        mock_run_git.side_effect = ["https://github.com/owner/repo.git", ""]
+
+        result = update_repo_cache("https://github.com/owner/repo", cache_dir=tmp_path)
+
+        assert result == cache_path
+        mock_run_git.assert_called_with(
+            "fetch --prune --tags origin +refs/heads/*:refs/heads/*", cwd=cache_path
+        )
 
     @patch("cli_git.utils.git.run_git_command")
-    def test_get_default_branch_fallback_to_master(self, mock_run_git):
-        """Test fallback to master when main doesn't exist."""
-
-        # First call fails (no upstream HEAD)
-        # Second call fails (no remote branches)
-        # Third call fails (no main branch)
-        # Fourth call succeeds (master exists)
-        def side_effect_func(cmd, cwd=None):
-            if "symbolic-ref" in cmd:
-                raise subprocess.CalledProcessError(1, "git")
-            elif "branch -r" in cmd:
-                raise subprocess.CalledProcessError(1, "git")
-            elif "show-ref" in cmd and "main" in cmd:
-                raise subprocess.CalledProcessError(1, "git")  # main check fails
-            elif "show-ref" in cmd and "master" in cmd:
-                return ""  # show-ref for master succeeds
-            else:
-                raise subprocess.CalledProcessError(1, "git")
-
-        mock_run_git.side_effect = side_effect_func
-
-        result = get_default_branch()
-
-        assert result == "master"
+    def test_update_repo_cache_other_origin_reclones(self, mock_run_git, tmp_path):
+        """Test that a cache entry cloned from a different remote is replaced."""
+        cache_path = tmp_path / "github.com" / "owner" / "repo.git"
+        cache_path.mkdir(parents=True)
+        (cache_path / "HEAD").write_text("ref: refs/heads/main\n")
+        mock_run_git.return_value = "https://github.com/someone/else"
 
-    @patch("cli_git.utils.git.run_git_command")
-    def test_get_default_branch_all_methods_fail(self, mock_run_git):
-        """Test when all detection methods fail."""
-        # All calls fail
-        mock_run_git.side_effect = subprocess.CalledProcessError(1, "git")
+        update_repo_cache("https://github.com/owner/repo", cache_dir=tmp_path)
 
-        with pytest.raises(subprocess.CalledProcessError):
-            get_default_branch()
+        assert not (cache_path / "HEAD").exists()
+        mock_run_git.assert_called_with(f"clone --bare https://github.com/owner/repo {cache_path}")
 
     @patch("cli_git.utils.git.run_git_command")
-    def test_get_default_branch_with_cwd(self, mock_run_git):
-        """Test get_default_branch with custom working directory."""
-        mock_run_git.return_value = "refs/remotes/upstream/develop"
-        cwd = Path("/test/repo")
-
-        result = get_default_branch(cwd=cwd)
-
-        mock_run_git.assert_called_with("symbolic-ref refs/remotes/upstream/HEAD", cwd=cwd)
-        assert result == "develop"
+    def test_update_repo_cache_failure(self, mock_run_git, tmp_path):
+        """Test that a failed cache update falls back to no cache."""
+        mock_run_git.side_effect = subprocess.CalledProcessError(128, "git")
+
+        assert update_repo_cache("https://github.com/owner/repo", cache_dir=tmp_path) is None
+
+    def test_prune_repo_cache(self, tmp_path):
+        """Test that stale cache entries are removed and recent ones kept."""
+        stale = tmp_path / "github.com" / "owner" / "stale.git"
+        fresh = tmp_path / "github.com" / "owner" / "fresh.git"
+        legacy = tmp_path / "owner" / "legacy.git"
+        stale.mkdir(parents=True)
+        fresh.mkdir()
+        legacy.mkdir(parents=True)
+        os.utime(stale, (0, 0))
+        os.utime(legacy, (0, 0))
+
+        prune_repo_cache(tmp_path, max_age=60)
+
+        assert not stale.exists()
+        assert not legacy.exists()
+        assert fresh.exists()